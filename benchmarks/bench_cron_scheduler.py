@@ -0,0 +1,76 @@
+"""
+Benchmark: cron scheduler bookkeeping with a large job store.
+
+Compares the heap + journal CronService with the previous approach, which
+scanned every job to find the next wake-up and rewrote the whole store
+(JSON with indent=2) after each change.
+
+Run: python benchmarks/bench_cron_scheduler.py [jobs]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.cron.service import CronService, _job_to_dict
+from nanobot.cron.types import CronSchedule
+
+
+def _per_op(fn, number: int) -> float:
+    """Average seconds per call."""
+    start = time.perf_counter()
+    for i in range(number):
+        fn(i)
+    return (time.perf_counter() - start) / number
+
+
+def main(n: int = 100_000) -> None:
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = Path(tmp) / "jobs.json"
+        service = CronService(store_path)
+        
+        add = _per_op(
+            lambda i: service.add_job(f"reminder {i}", CronSchedule(kind="every", every_ms=60_000 + i), "ping"),
+            n,
+        )
+        jobs = list(service._store.jobs.values())
+        print(f"{n:,} jobs, add_job: {add * 1e6:.1f} us/job")
+        
+        # Next wake-up
+        def baseline_next_wake(_: int) -> int | None:
+            times = [j.state.next_run_at_ms for j in jobs if j.enabled and j.state.next_run_at_ms]
+            return min(times) if times else None
+        
+        assert baseline_next_wake(0) == service._get_next_wake_ms()
+        before = _per_op(baseline_next_wake, 20)
+        after = _per_op(lambda _: service._get_next_wake_ms(), 10_000)
+        print(f"next wake    before {before * 1e6:9.1f} us   after {after * 1e6:9.1f} us")
+        
+        # Persisting one change
+        def baseline_save(_: int) -> None:
+            data = {"version": 1, "jobs": [_job_to_dict(j) for j in jobs]}
+            (Path(tmp) / "baseline.json").write_text(json.dumps(data, indent=2))
+        
+        before = _per_op(baseline_save, 3)
+        ids = [j.id for j in jobs]
+        after = _per_op(lambda i: service.enable_job(ids[i], enabled=bool(i % 2)), 10_000)
+        print(f"enable_job   before {before * 1e6:9.1f} us   after {after * 1e6:9.1f} us (incl. periodic snapshots)")
+        
+        # Startup: snapshot plus journal replay
+        service._save_store()
+        for i in range(1000):
+            service.remove_job(ids[i])
+        service.stop()
+        start = time.perf_counter()
+        reloaded = CronService(store_path)
+        assert reloaded.status()["jobs"] == n - 1000
+        print(f"load (snapshot + 1,000 journal entries): {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
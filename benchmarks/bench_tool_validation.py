@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: per-call cost of tool parameter validation.
+
+Compares the compiled validator used by Tool.validate_params with the
+previous implementation, which re-read `parameters` and walked the schema
+recursively on every call.
+
+Run: python benchmarks/bench_tool_validation.py
+"""
+
+import timeit
+from typing import Any
+
+from nanobot.agent.tools.base import Tool, _TYPE_MAP
+from nanobot.agent.tools.filesystem import EditFileTool
+from nanobot.agent.tools.shell import ExecTool
+
+
+def _walk(val: Any, schema: dict[str, Any], path: str) -> list[str]:
+    """The previous recursive validator, kept here as the baseline."""
+    t, label = schema.get("type"), path or "parameter"
+    if t in _TYPE_MAP and not isinstance(val, _TYPE_MAP[t]):
+        return [f"{label} should be {t}"]
+    errors = []
+    if "enum" in schema and val not in schema["enum"]:
+        errors.append(f"{label} must be one of {schema['enum']}")
+    if t in ("integer", "number"):
+        if "minimum" in schema and val < schema["minimum"]:
+            errors.append(f"{label} must be >= {schema['minimum']}")
+        if "maximum" in schema and val > schema["maximum"]:
+            errors.append(f"{label} must be <= {schema['maximum']}")
+    if t == "string":
+        if "minLength" in schema and len(val) < schema["minLength"]:
+            errors.append(f"{label} must be at least {schema['minLength']} chars")
+        if "maxLength" in schema and len(val) > schema["maxLength"]:
+            errors.append(f"{label} must be at most {schema['maxLength']} chars")
+    if t == "object":
+        props = schema.get("properties", {})
+        for k in schema.get("required", []):
+            if k not in val:
+                errors.append(f"missing required {path + '.' + k if path else k}")
+        for k, v in val.items():
+            if k in props:
+                errors.extend(_walk(v, props[k], path + "." + k if path else k))
+    if t == "array" and "items" in schema:
+        for i, item in enumerate(val):
+            errors.extend(_walk(item, schema["items"], f"{path}[{i}]" if path else f"[{i}]"))
+    return errors
+
+
+def baseline(tool: Tool, params: dict[str, Any]) -> list[str]:
+    schema = tool.parameters or {}
+    return _walk(params, {**schema, "type": "object"}, "")
+
+
+CASES: list[tuple[Tool, dict[str, Any]]] = [
+    (ExecTool(), {"command": "ls -la", "working_dir": "/tmp"}),
+    (EditFileTool(), {"path": "a.txt", "old_text": "foo", "new_text": "bar"}),
+]
+
+
+def main(number: int = 100_000) -> None:
+    for tool, params in CASES:
+        assert baseline(tool, params) == tool.validate_params(params)
+        before = timeit.timeit(lambda: baseline(tool, params), number=number)
+        after = timeit.timeit(lambda: tool.validate_params(params), number=number)
+        print(
+            f"{tool.name:<10} before {before / number * 1e6:6.2f} us/call   "
+            f"after {after / number * 1e6:6.2f} us/call   ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
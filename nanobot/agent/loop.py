@@ -9,17 +9,18 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
 from nanobot.agent.context import ContextBuilder
+from nanobot.agent.router import ModelRouter
 from nanobot.agent.tools.registry import ToolRegistry
-from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
-from nanobot.agent.tools.shell import ExecTool
-from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.filesystem import EditFileTool
 from nanobot.agent.tools.message import MessageTool
-from nanobot.agent.tools.spawn import SpawnTool
+from nanobot.agent.tools.spawn import SpawnTool, SubagentsTool
 from nanobot.agent.tools.cron import CronTool
+from nanobot.agent.tools.memory import MemorySearchTool
+from nanobot.agent.tools.skills import FindSkillTool
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.session.manager import Session, SessionManager
 
 
 class AgentLoop:
@@ -45,9 +46,21 @@ class AgentLoop:
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
+        usage_tracker: "UsageTracker | None" = None,
+        routing_config: "ModelRoutingConfig | None" = None,
+        subagents_config: "SubagentsConfig | None" = None,
+        subagent_status_path: Path | None = None,
+        compaction_config: "CompactionConfig | None" = None,
+        tool_history_config: "ToolHistoryConfig | None" = None,
+        memory_config: "MemoryConfig | None" = None,
+        skills_config: "SkillsConfig | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import (
+            CompactionConfig, ExecToolConfig, MemoryConfig, ModelRoutingConfig, SkillsConfig,
+            SubagentsConfig, ToolHistoryConfig,
+        )
         from nanobot.cron.service import CronService
+        from nanobot.usage.tracker import UsageTracker
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
@@ -57,9 +70,16 @@ class AgentLoop:
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
-        
-        self.context = ContextBuilder(workspace)
-        self.sessions = SessionManager(workspace)
+        self.usage = usage_tracker
+        self.router = ModelRouter(self.model, routing_config)
+        
+        self.context = ContextBuilder(workspace, memory_config, skills_config)
+        self.sessions = SessionManager(
+            workspace,
+            compaction=compaction_config,
+            summarizer=self._summarize_history,
+            tool_history=tool_history_config,
+        )
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
             provider=provider,
@@ -69,30 +89,29 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            usage_tracker=usage_tracker,
+            router=self.router,
+            config=subagents_config,
+            status_path=subagent_status_path,
         )
         
         self._running = False
+        self._idle = True
+        self._run_task: asyncio.Task | None = None
+        # id(msg) -> (reply, turn timeout) for process_queued; a cancelled
+        # reply marks the message as abandoned by its caller
+        self._waiters: dict[int, tuple[asyncio.Future[str], float | None]] = {}
         self._register_default_tools()
     
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
-        # File tools (restrict to workspace if configured)
+        # File, shell and web tools, shared with subagents
+        for tool in self.subagents.tools:
+            self.tools.register(tool)
+        
+        # Edit tool (restrict to workspace if configured)
         allowed_dir = self.workspace if self.restrict_to_workspace else None
-        self.tools.register(ReadFileTool(allowed_dir=allowed_dir))
-        self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
-        self.tools.register(ListDirTool(allowed_dir=allowed_dir))
-        
-        # Shell tool
-        self.tools.register(ExecTool(
-            working_dir=str(self.workspace),
-            timeout=self.exec_config.timeout,
-            restrict_to_workspace=self.restrict_to_workspace,
-        ))
-        
-        # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -101,6 +120,12 @@ class AgentLoop:
         # Spawn tool (for subagents)
         spawn_tool = SpawnTool(manager=self.subagents)
         self.tools.register(spawn_tool)
+        self.tools.register(SubagentsTool(manager=self.subagents))
+        
+        # Memory search, and skill search when the skills summary is trimmed
+        self.tools.register(MemorySearchTool(self.context.memory))
+        if self.context.skills_config.summary_top_k > 0:
+            self.tools.register(FindSkillTool(self.context.skills))
         
         # Cron tool (for scheduling)
         if self.cron_service:
@@ -109,41 +134,80 @@ class AgentLoop:
     async def run(self) -> None:
         """Run the agent loop, processing messages from the bus."""
         self._running = True
+        self._run_task = asyncio.current_task()
         logger.info("Agent loop started")
         
-        while self._running:
-            try:
-                # Wait for next message
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+        try:
+            while self._running:
+                # Wait for next message (stop() cancels this wait when idle)
+                self._idle = True
+                try:
+                    msg = await self.bus.consume_inbound()
+                except asyncio.CancelledError:
+                    if self._running:
+                        raise
+                    break
+                self._idle = False
+                
+                # Queued direct calls (cron, heartbeat) get their reply back
+                waiter, timeout = self._waiters.pop(id(msg), (None, None))
+                if waiter and waiter.done():
+                    logger.debug(f"Dropping abandoned message for {msg.session_key}")
+                    continue
                 
                 # Process it
                 try:
-                    response = await self._process_message(msg)
-                    if response:
+                    if timeout:
+                        response = await asyncio.wait_for(self._process_message(msg), timeout)
+                    else:
+                        response = await self._process_message(msg)
+                    if waiter:
+                        if not waiter.done():
+                            waiter.set_result(response.content if response else "")
+                    elif response:
                         await self.bus.publish_outbound(response)
                 except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+                    if timeout and isinstance(e, asyncio.TimeoutError):
+                        logger.warning(f"Turn for {msg.session_key} timed out after {timeout:g}s")
+                    else:
+                        logger.error(f"Error processing message: {e}")
+                    if waiter:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                        continue
                     # Send error response
                     await self.bus.publish_outbound(OutboundMessage(
                         channel=msg.channel,
                         chat_id=msg.chat_id,
                         content=f"Sorry, I encountered an error: {str(e)}"
                     ))
-            except asyncio.TimeoutError:
-                continue
+        finally:
+            # Not in stop(): a draining turn may still hand work to the workers
+            self.subagents.shutdown()
+        
+        self._run_task = None
+        logger.info("Agent loop stopped")
     
-    def stop(self) -> None:
-        """Stop the agent loop."""
+    def stop(self, drain: bool = True) -> None:
+        """
+        Stop the agent loop.
+        
+        Args:
+            drain: If True, a turn that is in flight finishes (and its reply is
+                published) before run() returns. If False, it is cancelled.
+                Subagent workers are shut down when run() returns.
+        """
         self._running = False
+        if self._run_task and (self._idle or not drain):
+            self._run_task.cancel()
         logger.info("Agent loop stopping")
     
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
+        The message's bus lane doubles as its call class for model routing.
+        
         Args:
             msg: The inbound message to process.
         
@@ -157,8 +221,13 @@ class AgentLoop:
         
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
         
-        # Get or create session
-        session = self.sessions.get_or_create(msg.session_key)
+        # Get or create session; an ephemeral turn starts from a blank one
+        # that is never saved
+        session_key = msg.session_key
+        if msg.history_limit == 0:
+            session = Session(key=session_key)
+        else:
+            session = self.sessions.get_or_create(session_key)
         
         # Update tool contexts
         message_tool = self.tools.get("message")
@@ -169,32 +238,81 @@ class AgentLoop:
         if isinstance(spawn_tool, SpawnTool):
             spawn_tool.set_context(msg.channel, msg.chat_id)
         
+        subagents_tool = self.tools.get("subagents")
+        if isinstance(subagents_tool, SubagentsTool):
+            subagents_tool.set_context(msg.channel, msg.chat_id)
+        
         cron_tool = self.tools.get("cron")
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(msg.channel, msg.chat_id)
         
         # Build initial messages (use get_history for LLM-formatted messages)
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=self.sessions.get_history(session, msg.history_limit or 50),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
         )
+        turn_start = len(messages)
         
         # Agent loop
+        final_content = await self._run_agent_loop(
+            messages, session_key, msg.channel, msg.lane
+        )
+        
+        if final_content is None:
+            final_content = "I've completed processing but have no response to give."
+        
+        # Save to session (capped sessions are trimmed instead of compacted)
+        if msg.history_limit != 0:
+            self.sessions.add_turn(session, msg.content, messages[turn_start:], final_content)
+            if msg.history_limit:
+                session.trim(msg.history_limit)
+            self.sessions.save(session)
+            if not msg.history_limit:
+                self.sessions.maybe_compact(session)
+        
+        return OutboundMessage(
+            channel=msg.channel,
+            chat_id=msg.chat_id,
+            content=final_content
+        )
+    
+    async def _run_agent_loop(
+        self,
+        messages: list[dict[str, Any]],
+        session_key: str,
+        channel: str,
+        call_class: str,
+    ) -> str | None:
+        """
+        Run the LLM/tool loop until the model answers without tool calls.
+        
+        Args:
+            messages: Initial messages (system prompt, history, user message).
+            session_key: Session the turn belongs to (for usage accounting).
+            channel: Channel the turn belongs to (for usage accounting).
+            call_class: Call class used to route the first LLM call.
+        
+        Returns:
+            The final response content, or None if the iteration limit was hit.
+        """
         iteration = 0
-        final_content = None
+        escalated_model: str | None = None
         
         while iteration < self.max_iterations:
             iteration += 1
             
-            # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
+            # Call LLM (escalation sticks for the rest of the turn)
+            model = escalated_model or self.router.select(call_class, continuation=iteration > 1)
+            response = await self._chat(messages, model, session_key, channel)
+            
+            escalate_to = None if escalated_model else self.router.escalation_for(model, response)
+            if escalate_to:
+                logger.info(f"Escalating {call_class} turn from {model} to {escalate_to}")
+                escalated_model = escalate_to
+                response = await self._chat(messages, escalate_to, session_key, channel)
             
             # Handle tool calls
             if response.has_tool_calls:
@@ -224,22 +342,26 @@ class AgentLoop:
                     )
             else:
                 # No tool calls, we're done
-                final_content = response.content
-                break
-        
-        if final_content is None:
-            final_content = "I've completed processing but have no response to give."
-        
-        # Save to session
-        session.add_message("user", msg.content)
-        session.add_message("assistant", final_content)
-        self.sessions.save(session)
+                return response.content
         
-        return OutboundMessage(
-            channel=msg.channel,
-            chat_id=msg.chat_id,
-            content=final_content
+        return None
+    
+    async def _chat(
+        self,
+        messages: list[dict[str, Any]],
+        model: str,
+        session_key: str,
+        channel: str,
+    ) -> LLMResponse:
+        """Call the LLM with the current tools and record its usage."""
+        response = await self.provider.chat(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=model
         )
+        if self.usage:
+            self.usage.record(model, response, session=session_key, channel=channel)
+        return response
     
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
@@ -273,65 +395,50 @@ class AgentLoop:
         if isinstance(spawn_tool, SpawnTool):
             spawn_tool.set_context(origin_channel, origin_chat_id)
         
+        subagents_tool = self.tools.get("subagents")
+        if isinstance(subagents_tool, SubagentsTool):
+            subagents_tool.set_context(origin_channel, origin_chat_id)
+        
         cron_tool = self.tools.get("cron")
         if isinstance(cron_tool, CronTool):
             cron_tool.set_context(origin_channel, origin_chat_id)
         
+        # Direct delivery: the result goes to the chat as-is, no LLM call
+        if "deliver" in msg.metadata:
+            final_content = msg.metadata["deliver"]
+            session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
+            session.add_message("assistant", final_content)
+            self.sessions.save(session)
+            self.sessions.maybe_compact(session)
+            return OutboundMessage(
+                channel=origin_channel,
+                chat_id=origin_chat_id,
+                content=final_content
+            )
+        
         # Build messages with the announce content
         messages = self.context.build_messages(
-            history=session.get_history(),
+            history=self.sessions.get_history(session),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
         )
+        turn_start = len(messages)
         
         # Agent loop (limited for announce handling)
-        iteration = 0
-        final_content = None
-        
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
-            
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts
-                )
-                
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments)
-                    logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                final_content = response.content
-                break
+        final_content = await self._run_agent_loop(
+            messages, session_key, origin_channel, "system"
+        )
         
         if final_content is None:
             final_content = "Background task completed."
         
         # Save to session (mark as system message in history)
-        session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
-        session.add_message("assistant", final_content)
+        self.sessions.add_turn(
+            session, f"[System: {msg.sender_id}] {msg.content}", messages[turn_start:], final_content
+        )
         self.sessions.save(session)
+        self.sessions.maybe_compact(session)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -339,12 +446,41 @@ class AgentLoop:
             content=final_content
         )
     
+    async def _summarize_history(
+        self,
+        messages: list[dict[str, Any]],
+        previous: str | None,
+    ) -> str:
+        """Summarize older conversation turns for session compaction."""
+        transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        prompt = (
+            "Summarize the conversation below for your own future reference. Keep facts, "
+            "decisions, user preferences, names, file paths and open tasks; drop small talk. "
+            "Write at most 300 words.\n\n"
+        )
+        if previous:
+            prompt += f"Summary of the conversation before this part:\n{previous}\n\n"
+        prompt += f"Conversation:\n{transcript}"
+        
+        model = self.sessions.compaction.model or self.router.select("system")
+        response = await self.provider.chat(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+        )
+        if self.usage:
+            self.usage.record(model, response)
+        if response.finish_reason == "error" or not response.content:
+            raise RuntimeError(response.content or "empty summary")
+        return response.content.strip()
+    
     async def process_direct(
         self,
         content: str,
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        lane: str = "interactive",
+        history_limit: int | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
@@ -354,6 +490,9 @@ class AgentLoop:
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            lane: Call class used for model routing (e.g. "cron", "heartbeat").
+            history_limit: Keep at most this many session messages; 0 runs
+                the turn without history and does not save it.
         
         Returns:
             The agent's response.
@@ -362,8 +501,73 @@ class AgentLoop:
             channel=channel,
             sender_id="user",
             chat_id=chat_id,
-            content=content
+            content=content,
+            lane=lane,
+            session_key_override=session_key,
+            history_limit=history_limit,
         )
         
         response = await self._process_message(msg)
         return response.content if response else ""
+    
+    async def process_queued(
+        self,
+        content: str,
+        session_key: str,
+        channel: str = "cli",
+        chat_id: str = "direct",
+        lane: str = "cron",
+        history_limit: int | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Queue a message on the bus and wait for the agent's reply.
+        
+        Unlike process_direct, the turn runs inside the agent loop in its
+        priority lane, so scheduled work never preempts live chat turns.
+        Requires run() to be active. If the caller is cancelled before the
+        turn starts, the message is dropped unanswered.
+        
+        Args:
+            content: The message content.
+            session_key: Session identifier.
+            channel: Source channel (for context).
+            chat_id: Source chat ID (for context).
+            lane: Bus lane (e.g. "cron", "heartbeat").
+            history_limit: Keep at most this many session messages; 0 runs
+                the turn without history and does not save it.
+            timeout: Cancel the turn after this many seconds, counted from
+                when it starts rather than while it waits in the queue.
+        
+        Returns:
+            The agent's response.
+        
+        Raises:
+            asyncio.TimeoutError: If the turn ran longer than `timeout`.
+        """
+        msg = InboundMessage(
+            channel=channel,
+            sender_id="user",
+            chat_id=chat_id,
+            content=content,
+            lane=lane,
+            session_key_override=session_key,
+            history_limit=history_limit,
+        )
+        waiter: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._waiters[id(msg)] = (waiter, timeout)
+        try:
+            queued = await self.bus.publish_inbound(msg)
+        except BaseException:
+            self._waiters.pop(id(msg), None)
+            raise
+        if not queued:
+            self._waiters.pop(id(msg), None)
+            raise RuntimeError("Agent queue is full")
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            # The waiter stays registered, cancelled, so the loop drops the
+            # message instead of answering it
+            waiter.cancel()
+            raise
@@ -2,8 +2,13 @@
 
 from pathlib import Path
 from datetime import datetime
+from typing import Any, TYPE_CHECKING
 
-from nanobot.utils.helpers import ensure_dir, today_date
+from nanobot.agent.memory_index import MemoryIndex
+from nanobot.utils.helpers import ensure_dir, estimate_tokens, today_date
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import MemoryConfig
 
 
 class MemoryStore:
@@ -11,12 +16,19 @@ class MemoryStore:
     Memory system for the agent.
     
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
+    
+    When memory outgrows the configured token budget, only the sections of
+    MEMORY.md relevant to the current message (plus pinned sections) and the
+    tail of today's notes go into the prompt.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, config: "MemoryConfig | None" = None):
+        from nanobot.config.schema import MemoryConfig
         self.workspace = workspace
+        self.config = config or MemoryConfig()
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self.index = MemoryIndex(self.memory_dir)
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
@@ -87,23 +99,95 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
-    def get_memory_context(self) -> str:
+    def search(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+        """
+        Search long-term memory and daily notes.
+        
+        Args:
+            query: Free-text query.
+            limit: Maximum number of snippets.
+        
+        Returns:
+            Matching snippets (file, line, heading, text, score), best first.
+        """
+        return [
+            {
+                "file": chunk.path.name,
+                "line": chunk.line,
+                "heading": chunk.heading,
+                "text": chunk.text,
+                "score": score,
+            }
+            for score, chunk in self.index.search(query, limit)
+        ]
+    
+    def get_memory_context(self, query: str | None = None) -> str:
         """
         Get memory context for the agent.
         
+        Args:
+            query: The current user message, used to pick relevant sections
+                when memory exceeds the budget.
+        
         Returns:
             Formatted memory context including long-term and recent memories.
         """
         parts = []
+        long_term = self.read_long_term()
+        today = self.read_today()
+        
+        budget = self.config.budget_tokens
+        if budget and estimate_tokens(long_term) + estimate_tokens(today) > budget:
+            # Today's notes take at most half the budget, newest lines first
+            max_today_chars = budget * 4 // 2
+            if len(today) > max_today_chars:
+                today = "..." + today[-max_today_chars:]
+            long_term = self._select_long_term(query, budget - estimate_tokens(today))
         
         # Long-term memory
-        long_term = self.read_long_term()
         if long_term:
             parts.append("## Long-term Memory\n" + long_term)
         
         # Today's notes
-        today = self.read_today()
         if today:
             parts.append("## Today's Notes\n" + today)
         
         return "\n\n".join(parts) if parts else ""
+    
+    def _select_long_term(self, query: str | None, budget: int) -> str:
+        """
+        Pick sections of MEMORY.md that fit a token budget.
+        
+        Pinned sections (containing the pin marker) come first, then sections
+        ranked by BM25 relevance to the query. The selection keeps the order
+        of the file.
+        """
+        self.index.refresh()
+        chunks = self.index.chunks(self.memory_file)
+        marker = self.config.pin_marker
+        
+        candidates = [c for c in chunks if marker and marker in c.text]
+        if query:
+            candidates += [c for _, c in self.index.score(query, chunks)]
+        
+        selected = {}
+        used = 0
+        for chunk in candidates:
+            cost = estimate_tokens(chunk.text)
+            if id(chunk) in selected or used + cost > budget:
+                continue
+            selected[id(chunk)] = chunk
+            used += cost
+        
+        if not selected:
+            return ""
+        texts = [
+            c.text.replace(marker, "").strip() if marker else c.text
+            for c in sorted(selected.values(), key=lambda c: c.line)
+        ]
+        if len(selected) < len(chunks):
+            texts.append(
+                f"({len(chunks) - len(selected)} more sections not shown; "
+                "use memory_search to look them up.)"
+            )
+        return "\n\n".join(texts)
@@ -0,0 +1,191 @@
+"""Full-text BM25 index over memory files."""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+# Latin words/numbers, or single CJK characters (CJK text has no spaces)
+_TOKEN_RE = re.compile(r"[a-z0-9_]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+
+# Chunks longer than this are split at paragraph boundaries
+MAX_CHUNK_CHARS = 1200
+
+# BM25 parameters, shared by memory and skill search
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase index terms."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_idf(df: int, count: int) -> float:
+    """Inverse document frequency of a term found in `df` of `count` documents."""
+    return math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+
+def bm25_term(tf: int, length: int, avg_length: float, idf: float) -> float:
+    """BM25 contribution of one query term occurring `tf` times in a document."""
+    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+    return idf * tf * (BM25_K1 + 1) / norm
+
+
+@dataclass
+class MemoryChunk:
+    """A section of a memory file."""
+    path: Path
+    line: int  # 1-based line the chunk starts at
+    heading: str  # Closest heading above the chunk ("" if none)
+    text: str
+    terms: Counter[str]
+    length: int
+
+
+def chunk_markdown(path: Path, text: str) -> list[MemoryChunk]:
+    """
+    Split a markdown file into chunks at headings.
+
+    Sections longer than MAX_CHUNK_CHARS are further split at blank lines.
+    """
+    sections: list[tuple[int, str, list[str]]] = []
+    heading = ""
+    for i, line in enumerate(text.splitlines(), 1):
+        if _HEADING_RE.match(line) or not sections:
+            if _HEADING_RE.match(line):
+                heading = line.lstrip("#").strip()
+            sections.append((i, heading, []))
+        sections[-1][2].append(line)
+
+    chunks = []
+    for start, heading, lines in sections:
+        buf: list[str] = []
+        buf_start = start
+        size = 0
+        for offset, line in enumerate(lines):
+            if size > MAX_CHUNK_CHARS and not line.strip():
+                chunks.append(_make_chunk(path, buf_start, heading, buf))
+                buf, size, buf_start = [], 0, start + offset + 1
+                continue
+            buf.append(line)
+            size += len(line) + 1
+        chunks.append(_make_chunk(path, buf_start, heading, buf))
+    return [c for c in chunks if c.length]
+
+
+def _make_chunk(path: Path, line: int, heading: str, lines: list[str]) -> MemoryChunk:
+    text = "\n".join(lines).strip()
+    terms = Counter(tokenize(text))
+    return MemoryChunk(path, line, heading, text, terms, sum(terms.values()))
+
+
+class MemoryIndex:
+    """
+    BM25 index over MEMORY.md and the daily notes.
+
+    Files are chunked at markdown headings. Before each search the memory
+    directory is stat'ed and only files whose mtime or size changed are
+    re-read, so keeping the index current costs one stat per file.
+    """
+
+    def __init__(self, memory_dir: Path):
+        self.memory_dir = memory_dir
+        self._files: dict[Path, tuple[float, int]] = {}  # path -> (mtime, size)
+        self._chunks: dict[Path, list[MemoryChunk]] = {}
+        self._postings: dict[str, dict[int, MemoryChunk]] = {}  # term -> {id(chunk): chunk}
+        self._total_length = 0
+        self._count = 0
+
+    def refresh(self) -> None:
+        """Re-index files that were added, changed or removed."""
+        current: dict[Path, tuple[float, int]] = {}
+        if self.memory_dir.exists():
+            for path in self.memory_dir.glob("*.md"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                current[path] = (st.st_mtime, st.st_size)
+
+        for path in list(self._files):
+            if path not in current:
+                self._remove(path)
+                del self._files[path]
+        for path, sig in current.items():
+            if self._files.get(path) != sig:
+                self._remove(path)
+                self._add(path)
+                self._files[path] = sig
+
+    def _add(self, path: Path) -> None:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Failed to index {path}: {e}")
+            return
+        chunks = chunk_markdown(path, text)
+        self._chunks[path] = chunks
+        for chunk in chunks:
+            for term in chunk.terms:
+                self._postings.setdefault(term, {})[id(chunk)] = chunk
+            self._total_length += chunk.length
+            self._count += 1
+
+    def _remove(self, path: Path) -> None:
+        for chunk in self._chunks.pop(path, []):
+            for term in chunk.terms:
+                posting = self._postings.get(term)
+                if posting is not None:
+                    posting.pop(id(chunk), None)
+                    if not posting:
+                        del self._postings[term]
+            self._total_length -= chunk.length
+            self._count -= 1
+
+    def chunks(self, path: Path) -> list[MemoryChunk]:
+        """Get the indexed chunks of one file (call refresh() first)."""
+        return self._chunks.get(path, [])
+
+    def score(self, query: str, chunks: list[MemoryChunk] | None = None) -> list[tuple[float, MemoryChunk]]:
+        """
+        Score chunks against a query with BM25.
+
+        Args:
+            query: Free-text query.
+            chunks: Restrict scoring to these chunks (default: all matches).
+
+        Returns:
+            (score, chunk) pairs with a positive score, best first.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._count:
+            return []
+        avg_length = self._total_length / self._count
+        allowed = {id(c) for c in chunks} if chunks is not None else None
+
+        scores: dict[int, float] = {}
+        found: dict[int, MemoryChunk] = {}
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = bm25_idf(len(posting), self._count)
+            for key, chunk in posting.items():
+                if allowed is not None and key not in allowed:
+                    continue
+                score = bm25_term(chunk.terms[term], chunk.length, avg_length, idf)
+                scores[key] = scores.get(key, 0.0) + score
+                found[key] = chunk
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return [(score, found[key]) for key, score in ranked]
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[float, MemoryChunk]]:
+        """Refresh the index and get the top matching chunks."""
+        self.refresh()
+        return self.score(query)[:limit]
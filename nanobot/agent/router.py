@@ -0,0 +1,58 @@
+"""Model routing: pick a model per call class."""
+
+from typing import TYPE_CHECKING
+
+from nanobot.providers.base import LLMResponse
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ModelRoutingConfig
+
+# Call classes the router knows about
+CALL_CLASSES = ("interactive", "continuation", "system", "heartbeat", "cron", "subagent")
+
+
+class ModelRouter:
+    """
+    Routes LLM calls to a model based on what kind of call it is.
+
+    Lightweight turns (heartbeat checks, cron reminders, subagent announce
+    summaries) can use a cheap fast model while interactive turns keep the
+    default one. If a routed model answers with a tool-heavy plan, the call
+    can be escalated to a stronger model for the rest of the turn.
+    """
+
+    def __init__(self, default_model: str, config: "ModelRoutingConfig | None" = None):
+        from nanobot.config.schema import ModelRoutingConfig
+        self.default_model = default_model
+        self.config = config or ModelRoutingConfig()
+
+    def select(self, call_class: str, continuation: bool = False) -> str:
+        """
+        Select the model for a call.
+
+        Args:
+            call_class: One of CALL_CLASSES.
+            continuation: True for tool-loop iterations after the first.
+
+        Returns:
+            Model identifier.
+        """
+        if call_class not in CALL_CLASSES:
+            raise ValueError(f"Unknown call class: {call_class}")
+        if continuation and self.config.continuation:
+            return self.config.continuation
+        return getattr(self.config, call_class) or self.default_model
+
+    def escalation_for(self, model: str, response: LLMResponse) -> str | None:
+        """
+        Get the model to escalate to, if the response warrants it.
+
+        A response escalates when it plans at least `escalate_min_tool_calls`
+        tool calls and came from a model other than the escalation target.
+        """
+        target = self.config.escalate_model
+        if not target or target == model:
+            return None
+        if len(response.tool_calls) >= self.config.escalate_min_tool_calls:
+            return target
+        return None
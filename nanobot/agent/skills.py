@@ -4,11 +4,87 @@ import json
 import os
 import re
 import shutil
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any
+
+import yaml
+from loguru import logger
+
+from nanobot.agent.memory_index import bm25_idf, bm25_term, tokenize
+from nanobot.utils.helpers import estimate_tokens
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# Bump when SkillManifest changes shape
+MANIFEST_VERSION = 1
+
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n?", re.DOTALL)
+
+# How long a PATH lookup for a required binary is trusted
+WHICH_TTL_S = 60.0
+
+_which_cache: dict[str, tuple[bool, float]] = {}
+
+
+def _has_binary(name: str) -> bool:
+    """shutil.which(), cached for WHICH_TTL_S."""
+    now = time.monotonic()
+    cached = _which_cache.get(name)
+    if cached and cached[1] > now:
+        return cached[0]
+    found = shutil.which(name) is not None
+    _which_cache[name] = (found, now + WHICH_TTL_S)
+    return found
+
+
+@dataclass
+class SkillManifest:
+    """Compiled metadata of a SKILL.md, valid while its mtime and size are unchanged."""
+    name: str
+    path: str
+    source: str  # "workspace" or "builtin"
+    mtime_ns: int
+    size: int
+    description: str
+    always: bool
+    requires_bins: list[str] = field(default_factory=list)
+    requires_env: list[str] = field(default_factory=list)
+    tokens: int = 0  # Estimated tokens of the skill body
+    frontmatter: dict[str, Any] = field(default_factory=dict)
+    meta: dict[str, Any] = field(default_factory=dict)  # nanobot metadata
+
+
+def parse_frontmatter(content: str) -> tuple[dict[str, Any] | None, str]:
+    """
+    Split SKILL.md content into its YAML frontmatter and body.
+    
+    Frontmatter that is not valid YAML falls back to simple `key: value`
+    lines, so a skill with a sloppy header still gets its description.
+    
+    Returns:
+        (frontmatter or None, body).
+    """
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return None, content
+    raw, body = match.group(1), content[match.end():].strip()
+    try:
+        data = yaml.safe_load(raw)
+        if isinstance(data, dict):
+            return data, body
+    except yaml.YAMLError as e:
+        logger.debug(f"Invalid skill frontmatter, using simple parsing: {e}")
+    data = {}
+    for line in raw.split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            data[key.strip()] = value.strip().strip('"\'')
+    return data, body
+
 
 class SkillsLoader:
     """
@@ -16,23 +92,83 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+    
+    Each SKILL.md is compiled once into a SkillManifest, and the manifests
+    are kept in a small cache file under ~/.nanobot keyed by path, mtime and
+    size. Skill directories are only rescanned when their mtime changes, so
+    building the prompt reads one manifest file at startup and costs a few
+    stat calls per skill afterwards (each skill directory's mtime is part of
+    the rescan key, so adding or removing a SKILL.md is noticed too).
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        manifest_path: Path | None = None,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.manifest_path = manifest_path or Path.home() / ".nanobot" / "cache" / "skills.json"
+        self._scan_key: tuple[Any, ...] | None = None
+        self._skills: list[dict[str, str]] = []
+        self._paths: dict[str, tuple[Path, str]] = {}  # name -> (SKILL.md, source)
+        self._manifests: dict[str, SkillManifest] = self._load_manifests()  # path -> manifest
+        self._content: dict[str, tuple[int, str]] = {}  # name -> (mtime_ns, content)
+        self._manifests_dirty = False
+        self._terms: dict[str, tuple[int, Counter[str]]] = {}  # path -> (mtime_ns, name/description terms)
     
-    def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
-        """
-        List all available skills.
-        
-        Args:
-            filter_unavailable: If True, filter out skills with unmet requirements.
+    def _load_manifests(self) -> dict[str, SkillManifest]:
+        """Load compiled manifests from the cache file."""
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                return {}
+            return {path: SkillManifest(**m) for path, m in data["skills"].items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring skill manifest cache: {e}")
+            return {}
+    
+    def _save_manifests(self) -> None:
+        """Write compiled manifests to the cache file if any were recompiled."""
+        if not self._manifests_dirty:
+            return
+        self._manifests_dirty = False
+        data = {
+            "version": MANIFEST_VERSION,
+            "skills": {path: asdict(m) for path, m in self._manifests.items()},
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.manifest_path)
+        except Exception as e:
+            logger.warning(f"Failed to save skill manifest cache: {e}")
+    
+    @staticmethod
+    def _tree_key(path: Path | None) -> tuple[int, tuple[tuple[str, int], ...]]:
+        """Get the mtimes of a skills directory and of each skill directory in it."""
+        if not path:
+            return -1, ()
+        try:
+            with os.scandir(path) as entries:
+                dirs = tuple(sorted(
+                    (e.name, e.stat().st_mtime_ns) for e in entries if e.is_dir()
+                ))
+            return path.stat().st_mtime_ns, dirs
+        except OSError:
+            return -1, ()
+    
+    def _scan(self) -> list[dict[str, str]]:
+        """List skill directories, rescanning only when a skills directory changed."""
+        key = (self._tree_key(self.workspace_skills), self._tree_key(self.builtin_skills))
+        if key == self._scan_key:
+            return self._skills
         
-        Returns:
-            List of skill info dicts with 'name', 'path', 'source'.
-        """
         skills = []
         
         # Workspace skills (highest priority)
@@ -44,16 +180,96 @@ class SkillsLoader:
                         skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
         
         # Built-in skills
+        names = {s["name"] for s in skills}
         if self.builtin_skills and self.builtin_skills.exists():
             for skill_dir in self.builtin_skills.iterdir():
                 if skill_dir.is_dir():
                     skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
+                    if skill_file.exists() and skill_dir.name not in names:
                         skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
         
+        self._skills = skills
+        self._paths = {s["name"]: (Path(s["path"]), s["source"]) for s in skills}
+        self._scan_key = key
+        
+        # Forget manifests of skills removed from these directories
+        current = {s["path"] for s in skills}
+        roots = tuple(str(d) for d in (self.workspace_skills, self.builtin_skills) if d)
+        for path in [p for p in self._manifests if p.startswith(roots) and p not in current]:
+            del self._manifests[path]
+            self._manifests_dirty = True
+        return skills
+    
+    def get_manifest(self, name: str) -> SkillManifest | None:
+        """
+        Get the compiled manifest of a skill, recompiling it if SKILL.md changed.
+        
+        Args:
+            name: Skill name.
+        
+        Returns:
+            The manifest, or None if the skill does not exist.
+        """
+        self._scan()
+        if name not in self._paths:
+            return None
+        path, source = self._paths[name]
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        
+        manifest = self._manifests.get(str(path))
+        if manifest and manifest.mtime_ns == st.st_mtime_ns and manifest.size == st.st_size:
+            return manifest
+        
+        content = path.read_text(encoding="utf-8")
+        self._content[name] = (st.st_mtime_ns, content)
+        manifest = self._compile(name, path, source, st.st_mtime_ns, st.st_size, content)
+        self._manifests[str(path)] = manifest
+        self._manifests_dirty = True
+        return manifest
+    
+    def _compile(
+        self, name: str, path: Path, source: str, mtime_ns: int, size: int, content: str,
+    ) -> SkillManifest:
+        """Compile SKILL.md content into a manifest."""
+        frontmatter, body = parse_frontmatter(content)
+        frontmatter = frontmatter or {}
+        meta = self._parse_nanobot_metadata(frontmatter.get("metadata", ""))
+        requires = meta.get("requires", {})
+        return SkillManifest(
+            name=name,
+            path=str(path),
+            source=source,
+            mtime_ns=mtime_ns,
+            size=size,
+            description=str(frontmatter.get("description") or name),
+            always=bool(meta.get("always") or frontmatter.get("always")),
+            requires_bins=list(requires.get("bins", [])),
+            requires_env=list(requires.get("env", [])),
+            tokens=estimate_tokens(body),
+            # Round-trip through JSON so the cached and fresh forms match
+            frontmatter=json.loads(json.dumps(frontmatter, default=str)),
+            meta=meta,
+        )
+    
+    def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
+        """
+        List all available skills.
+        
+        Args:
+            filter_unavailable: If True, filter out skills with unmet requirements.
+        
+        Returns:
+            List of skill info dicts with 'name', 'path', 'source'.
+        """
+        skills = list(self._scan())
+        
         # Filter by requirements
         if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
+            skills = [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
+            self._save_manifests()
         return skills
     
     def load_skill(self, name: str) -> str | None:
@@ -66,18 +282,15 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        manifest = self.get_manifest(name)
+        if not manifest:
+            return None
+        cached = self._content.get(name)
+        if cached and cached[0] == manifest.mtime_ns:
+            return cached[1]
+        content = Path(manifest.path).read_text(encoding="utf-8")
+        self._content[name] = (manifest.mtime_ns, content)
+        return content
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -98,13 +311,19 @@ class SkillsLoader:
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
-    def build_skills_summary(self) -> str:
+    def build_skills_summary(self, query: str | None = None, top_k: int = 0) -> str:
         """
         Build a summary of all skills (name, description, path, availability).
         
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
         
+        Args:
+            query: The current user message, used to rank skills when the
+                summary is limited.
+            top_k: If set and more skills are installed, only list the top_k
+                skills most relevant to the query and point to find_skill.
+        
         Returns:
             XML-formatted skills summary.
         """
@@ -112,6 +331,17 @@ class SkillsLoader:
         if not all_skills:
             return ""
         
+        hidden = 0
+        if top_k and len(all_skills) > top_k:
+            shown = {s["name"] for s in self.search_skills(query or "", top_k)}
+            # Without relevant matches, keep the first skills so the list is never empty
+            for s in all_skills:
+                if len(shown) >= top_k:
+                    break
+                shown.add(s["name"])
+            hidden = len(all_skills) - len(shown)
+            all_skills = [s for s in all_skills if s["name"] in shown]
+        
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         
@@ -136,15 +366,68 @@ class SkillsLoader:
             
             lines.append(f"  </skill>")
         lines.append("</skills>")
+        if hidden:
+            lines.append(f"{hidden} more skills are installed; use the find_skill tool to search them.")
         
+        self._save_manifests()
         return "\n".join(lines)
     
+    def search_skills(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+        """
+        Rank skills by BM25 relevance of their name and description to a query.
+        
+        Args:
+            query: Free-text query.
+            limit: Maximum number of skills.
+        
+        Returns:
+            Skill info dicts ('name', 'path', 'source', 'description',
+            'available'), best first. Skills sharing no term are left out.
+        """
+        terms = set(tokenize(query))
+        skills = self.list_skills(filter_unavailable=False)
+        if not terms or not skills:
+            return []
+        
+        docs = []
+        for s in skills:
+            manifest = self.get_manifest(s["name"])
+            cached = self._terms.get(s["path"])
+            if not cached or not manifest or cached[0] != manifest.mtime_ns:
+                text = f"{s['name'].replace('-', ' ')} {manifest.description if manifest else ''}"
+                cached = (manifest.mtime_ns if manifest else 0, Counter(tokenize(text)))
+                self._terms[s["path"]] = cached
+            docs.append((s, manifest, cached[1]))
+        avg_length = sum(sum(d[2].values()) for d in docs) / len(docs) or 1.0
+        idf = {term: bm25_idf(sum(1 for d in docs if term in d[2]), len(docs)) for term in terms}
+        
+        scored = []
+        for s, manifest, counts in docs:
+            length = sum(counts.values())
+            score = sum(
+                bm25_term(counts[term], length, avg_length, idf[term])
+                for term in terms if counts.get(term)
+            )
+            if score > 0:
+                scored.append((score, s, manifest))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        
+        self._save_manifests()
+        return [
+            {
+                **s,
+                "description": manifest.description if manifest else s["name"],
+                "available": self._check_requirements(manifest.meta if manifest else {}),
+            }
+            for _, s, manifest in scored[:limit]
+        ]
+    
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not _has_binary(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -153,32 +436,28 @@ class SkillsLoader:
     
     def _get_skill_description(self, name: str) -> str:
         """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+        manifest = self.get_manifest(name)
+        return manifest.description if manifest else name
     
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
-        if content.startswith("---"):
-            match = re.match(r"^---\n.*?\n---\n", content, re.DOTALL)
-            if match:
-                return content[match.end():].strip()
-        return content
+        return parse_frontmatter(content)[1]
     
-    def _parse_nanobot_metadata(self, raw: str) -> dict:
-        """Parse nanobot metadata JSON from frontmatter."""
-        try:
-            data = json.loads(raw)
-            return data.get("nanobot", {}) if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
+    def _parse_nanobot_metadata(self, raw: Any) -> dict:
+        """Get nanobot metadata from the frontmatter `metadata` field (mapping or JSON string)."""
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                return {}
+        data = raw.get("nanobot", {}) if isinstance(raw, dict) else {}
+        return data if isinstance(data, dict) else {}
     
     def _check_requirements(self, skill_meta: dict) -> bool:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not _has_binary(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -187,17 +466,17 @@ class SkillsLoader:
     
     def _get_skill_meta(self, name: str) -> dict:
         """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
+        manifest = self.get_manifest(name)
+        return manifest.meta if manifest else {}
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
         result = []
         for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
+            manifest = self.get_manifest(s["name"])
+            if manifest and manifest.always:
                 result.append(s["name"])
+        self._save_manifests()
         return result
     
     def get_skill_metadata(self, name: str) -> dict | None:
@@ -210,19 +489,5 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        manifest = self.get_manifest(name)
+        return manifest.frontmatter if manifest and manifest.frontmatter else None
@@ -2,19 +2,63 @@
 
 import asyncio
 import json
+import multiprocessing
+import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.managers import SyncManager
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Literal, TYPE_CHECKING
 
 from loguru import logger
 
-from nanobot.bus.events import InboundMessage
+from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
-from nanobot.agent.tools.registry import ToolRegistry
-from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
-from nanobot.agent.tools.shell import ExecTool
-from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.agent.router import ModelRouter
+from nanobot.agent.tools.registry import ToolSet
+from nanobot.agent.tools.toolset import workspace_toolset
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import Config
+
+
+@dataclass
+class SubagentTask:
+    """A subagent task and its progress."""
+    id: str
+    label: str
+    task: str
+    origin: dict[str, str]
+    status: Literal["pending", "running", "ok", "error", "cancelled"] = "pending"
+    iteration: int = 0
+    tokens: int = 0
+    current_tool: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    last_progress_at: float = 0.0
+    unsent_progress: list[str] = field(default_factory=list)  # Tool outcomes held back by throttling
+    
+    @property
+    def origin_key(self) -> str:
+        return f"{self.origin['channel']}:{self.origin['chat_id']}"
+    
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "origin": self.origin_key,
+            "status": self.status,
+            "iteration": self.iteration,
+            "tokens": self.tokens,
+            "currentTool": self.current_tool,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
 
 
 class SubagentManager:
@@ -24,8 +68,20 @@ class SubagentManager:
     Subagents are lightweight agent instances that run in the background
     to handle specific tasks. They share the same LLM provider but have
     isolated context and a focused system prompt.
+    
+    Spawned tasks are scheduled with a global and a per-origin-chat
+    concurrency limit; tasks over the limit wait in a pending queue. Tasks
+    can be listed and cancelled, and report their progress (iteration,
+    tokens used, current tool). If `status_path` is set, a snapshot of all
+    tasks is written there for `nanobot subagents`: on every scheduling
+    change, and at most once per STATUS_INTERVAL_S while tasks progress.
     """
     
+    # Finished tasks kept for status queries
+    MAX_FINISHED = 50
+    # Minimum time between status snapshots written for progress
+    STATUS_INTERVAL_S = 1.0
+    
     def __init__(
         self,
         provider: LLMProvider,
@@ -35,8 +91,14 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        usage_tracker: "UsageTracker | None" = None,
+        router: ModelRouter | None = None,
+        config: "SubagentsConfig | None" = None,
+        status_path: Path | None = None,
+        provider_factory: "Callable[[Config], LLMProvider] | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, SubagentsConfig
+        from nanobot.usage.tracker import UsageTracker
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
@@ -44,7 +106,24 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.tools: ToolSet = workspace_toolset(
+            workspace, brave_api_key, self.exec_config.timeout, restrict_to_workspace,
+        )
+        self.usage = usage_tracker
+        self.router = router or ModelRouter(self.model)
+        self.config = config or SubagentsConfig()
+        self.status_path = status_path
+        # Builds the provider in worker processes; must be picklable
+        self.provider_factory = provider_factory or _litellm_provider
+        self._tasks: dict[str, SubagentTask] = {}
+        self._pending: deque[str] = deque()
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        self._sync: SyncManager | None = None  # Serves the cancel events of worker tasks
+        self._worker_cancels: dict[str, Any] = {}  # task_id -> cancel event of a task in a worker
+        self._collecting: set[asyncio.Task[None]] = set()
+        self._status_written_at = 0.0
+        self._status_timer: asyncio.TimerHandle | None = None
     
     async def spawn(
         self,
@@ -63,119 +142,368 @@ class SubagentManager:
             origin_chat_id: The chat ID to announce results to.
         
         Returns:
-            Status message indicating the subagent was started.
+            Status message indicating the subagent was started or queued.
         """
-        task_id = str(uuid.uuid4())[:8]
-        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
-        
         origin = {
             "channel": origin_channel,
             "chat_id": origin_chat_id,
         }
         
-        # Create background task
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
+        if len(self._pending) >= self.config.max_pending:
+            logger.warning(f"Subagent queue full, refusing task from {origin_channel}:{origin_chat_id}")
+            return (
+                f"Error: too many background tasks are waiting ({len(self._pending)}). "
+                "Wait for some to finish or cancel them first."
+            )
+        
+        task_id = str(uuid.uuid4())[:8]
+        display_label = label or task[:30] + ("..." if len(task) > 30 else "")
+        record = SubagentTask(id=task_id, label=display_label, task=task, origin=origin)
+        self._tasks[task_id] = record
+        self._pending.append(task_id)
+        self._schedule()
+        
+        if record.status == "running":
+            logger.info(f"Spawned subagent [{task_id}]: {display_label}")
+            return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+        
+        logger.info(f"Queued subagent [{task_id}]: {display_label}")
+        return (
+            f"Subagent [{display_label}] queued (id: {task_id}, position {len(self._pending)}). "
+            "It will start when a slot frees up."
         )
-        self._running_tasks[task_id] = bg_task
+    
+    def _schedule(self) -> None:
+        """Start pending tasks while the concurrency limits allow."""
+        per_origin: dict[str, int] = {}
+        for task_id in self._running_tasks:
+            key = self._tasks[task_id].origin_key
+            per_origin[key] = per_origin.get(key, 0) + 1
         
-        # Cleanup when done
-        bg_task.add_done_callback(lambda _: self._running_tasks.pop(task_id, None))
+        for task_id in list(self._pending):
+            if len(self._running_tasks) >= self.capacity:
+                break
+            record = self._tasks[task_id]
+            if per_origin.get(record.origin_key, 0) >= self.config.max_per_chat:
+                continue
+            
+            self._pending.remove(task_id)
+            per_origin[record.origin_key] = per_origin.get(record.origin_key, 0) + 1
+            record.status = "running"
+            record.started_at = time.time()
+            
+            bg_task = asyncio.create_task(self._run_subagent(record))
+            self._running_tasks[task_id] = bg_task
+            bg_task.add_done_callback(lambda t, tid=task_id: self._on_task_done(tid, t))
         
-        logger.info(f"Spawned subagent [{task_id}]: {display_label}")
-        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+        self._write_status()
     
-    async def _run_subagent(
-        self,
-        task_id: str,
-        task: str,
-        label: str,
-        origin: dict[str, str],
-    ) -> None:
+    @property
+    def capacity(self) -> int:
+        """
+        How many tasks may run at once.
+        
+        In "process" execution this is also capped by the worker count, so a
+        task only counts as running once a worker is free to pick it up.
+        """
+        if self.config.execution == "process":
+            return max(1, min(self.config.max_concurrent, self.config.process_workers))
+        return self.config.max_concurrent
+    
+    def _on_task_done(self, task_id: str, bg_task: asyncio.Task[None]) -> None:
+        """Release the task's slot and start whatever can run next."""
+        self._running_tasks.pop(task_id, None)
+        record = self._tasks[task_id]
+        if bg_task.cancelled() and record.status == "running":
+            # Cancelled before it got to run
+            record.status = "cancelled"
+        record.finished_at = time.time()
+        record.current_tool = None
+        self._prune_finished()
+        self._schedule()
+    
+    def _prune_finished(self) -> None:
+        """Forget the oldest finished tasks beyond MAX_FINISHED."""
+        finished = [t for t in self._tasks.values() if t.finished_at is not None]
+        finished.sort(key=lambda t: t.finished_at or 0)
+        for record in finished[:-self.MAX_FINISHED]:
+            del self._tasks[record.id]
+    
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a pending or running subagent.
+        
+        Returns:
+            True if the task was pending or running.
+        """
+        record = self._tasks.get(task_id)
+        if not record:
+            return False
+        
+        if task_id in self._pending:
+            self._pending.remove(task_id)
+            record.status = "cancelled"
+            record.finished_at = time.time()
+            self._write_status()
+        elif task_id in self._running_tasks:
+            # _run_subagent marks it cancelled; the done callback reschedules
+            self._running_tasks[task_id].cancel()
+        else:
+            return False
+        
+        logger.info(f"Cancelled subagent [{task_id}]")
+        return True
+    
+    def get_task(self, task_id: str) -> SubagentTask | None:
+        """Get a task by ID."""
+        return self._tasks.get(task_id)
+    
+    def list_tasks(self, origin_key: str | None = None, include_finished: bool = False) -> list[SubagentTask]:
+        """
+        List known tasks, oldest first.
+        
+        Args:
+            origin_key: Only tasks spawned from this "channel:chat_id".
+            include_finished: Include completed, failed and cancelled tasks.
+        """
+        return [
+            t for t in sorted(self._tasks.values(), key=lambda t: t.created_at)
+            if (origin_key is None or t.origin_key == origin_key)
+            and (include_finished or t.status in ("pending", "running"))
+        ]
+    
+    def _status_changed(self) -> None:
+        """Write a snapshot for task progress, at most once per STATUS_INTERVAL_S."""
+        if not self.status_path or self._status_timer:
+            return
+        delay = self._status_written_at + self.STATUS_INTERVAL_S - time.monotonic()
+        if delay <= 0:
+            self._write_status()
+        else:
+            # Trailing write, so the last change before a quiet spell is not lost
+            self._status_timer = asyncio.get_running_loop().call_later(delay, self._write_status)
+    
+    def _write_status(self) -> None:
+        """Write a snapshot of all tasks for out-of-process status queries."""
+        if not self.status_path:
+            return
+        if self._status_timer:
+            self._status_timer.cancel()
+            self._status_timer = None
+        self._status_written_at = time.monotonic()
+        try:
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {"tasks": [t.to_dict() for t in self.list_tasks(include_finished=True)]}
+            self.status_path.write_text(json.dumps(data))
+        except Exception as e:
+            logger.warning(f"Failed to write subagent status: {e}")
+    
+    async def _run_subagent(self, record: SubagentTask) -> None:
         """Execute the subagent task and announce the result."""
+        task_id, task, label, origin = record.id, record.task, record.label, record.origin
         logger.info(f"Subagent [{task_id}] starting task: {label}")
         
         try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            allowed_dir = self.workspace if self.restrict_to_workspace else None
-            tools.register(ReadFileTool(allowed_dir=allowed_dir))
-            tools.register(WriteFileTool(allowed_dir=allowed_dir))
-            tools.register(ListDirTool(allowed_dir=allowed_dir))
-            tools.register(ExecTool(
-                working_dir=str(self.workspace),
-                timeout=self.exec_config.timeout,
-                restrict_to_workspace=self.restrict_to_workspace,
-            ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
-            
-            # Build messages with subagent-specific prompt
-            system_prompt = self._build_subagent_prompt(task)
-            messages: list[dict[str, Any]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task},
-            ]
-            
-            # Run agent loop (limited iterations)
-            max_iterations = 15
-            iteration = 0
-            final_result: str | None = None
-            
-            while iteration < max_iterations:
-                iteration += 1
-                
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                )
-                
-                if response.has_tool_calls:
-                    # Add assistant message with tool calls
-                    tool_call_dicts = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments),
-                            },
-                        }
-                        for tc in response.tool_calls
-                    ]
-                    messages.append({
-                        "role": "assistant",
-                        "content": response.content or "",
-                        "tool_calls": tool_call_dicts,
-                    })
-                    
-                    # Execute tools
-                    for tool_call in response.tool_calls:
-                        args_str = json.dumps(tool_call.arguments)
-                        logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": tool_call.name,
-                            "content": result,
-                        })
-                else:
-                    final_result = response.content
-                    break
-            
-            if final_result is None:
-                final_result = "Task completed but no final response was generated."
+            if self.config.execution == "process":
+                final_result = await self._run_in_worker(record)
+            else:
+                final_result = await self._run_tool_loop(record)
             
             logger.info(f"Subagent [{task_id}] completed successfully")
+            record.status = "ok"
             await self._announce_result(task_id, label, task, final_result, origin, "ok")
             
+        except asyncio.CancelledError:
+            # Cancelled on request: nothing to announce
+            logger.info(f"Subagent [{task_id}] cancelled")
+            record.status = "cancelled"
         except Exception as e:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
+            record.status = "error"
             await self._announce_result(task_id, label, task, error_msg, origin, "error")
     
+    async def _run_tool_loop(self, record: SubagentTask) -> str:
+        """Run the subagent's tool loop and return its final response."""
+        task_id, task = record.id, record.task
+        
+        # Shared subagent tools (no message tool, no spawn tool)
+        tools = self.tools
+        
+        # Build messages with subagent-specific prompt
+        system_prompt = self._build_subagent_prompt(task)
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": task},
+        ]
+        
+        # Run agent loop (limited iterations)
+        max_iterations = self.config.max_iterations
+        iteration = 0
+        final_result: str | None = None
+        escalated_model: str | None = None
+        
+        while iteration < max_iterations:
+            iteration += 1
+            record.iteration = iteration
+            
+            model = escalated_model or self.router.select("subagent", continuation=iteration > 1)
+            response = await self._chat(record, tools, messages, model)
+            
+            escalate_to = None if escalated_model else self.router.escalation_for(model, response)
+            if escalate_to:
+                logger.info(f"Subagent [{task_id}] escalating from {model} to {escalate_to}")
+                escalated_model = escalate_to
+                response = await self._chat(record, tools, messages, escalate_to)
+            
+            if response.has_tool_calls:
+                # Add assistant message with tool calls
+                tool_call_dicts = [
+                    {
+                        "id": tc.id,
+                        "type": "function",
+                        "function": {
+                            "name": tc.name,
+                            "arguments": json.dumps(tc.arguments),
+                        },
+                    }
+                    for tc in response.tool_calls
+                ]
+                messages.append({
+                    "role": "assistant",
+                    "content": response.content or "",
+                    "tool_calls": tool_call_dicts,
+                })
+                
+                if response.content:
+                    await self._report_progress(record, response.content)
+                
+                # Execute tools
+                for tool_call in response.tool_calls:
+                    args_str = json.dumps(tool_call.arguments)
+                    logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
+                    record.current_tool = tool_call.name
+                    await self._report_progress(record, f"running {tool_call.name}")
+                    result = await tools.execute(tool_call.name, tool_call.arguments)
+                    record.current_tool = None
+                    outcome = "failed" if result.startswith("Error") else "done"
+                    await self._report_progress(record, f"{tool_call.name} {outcome}", final=True)
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "name": tool_call.name,
+                        "content": result,
+                    })
+            else:
+                final_result = response.content
+                break
+        
+        if final_result is None:
+            final_result = "Task completed but no final response was generated."
+        return final_result
+    
+    async def _run_in_worker(self, record: SubagentTask) -> str:
+        """
+        Run the subagent's tool loop in a worker process.
+        
+        The worker rebuilds the provider and tools from the config file, so
+        only the task crosses the process boundary. Its usage is replayed into
+        this process's tracker once it finishes. Cancelling the task signals
+        the worker, which stops the tool loop within WORKER_CANCEL_POLL_S.
+        """
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.capacity, mp_context=context)
+            self._sync = context.Manager()
+        
+        cancel = self._sync.Event()
+        self._worker_cancels[record.id] = cancel
+        future = self._pool.submit(
+            _run_in_worker,
+            record.id,
+            record.task,
+            record.label,
+            record.origin,
+            cancel,
+            self.provider_factory,
+        )
+        try:
+            outcome = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            if not future.cancelled():
+                # Still account for what the worker spent before it stopped
+                collect = asyncio.create_task(self._collect_cancelled(record, future))
+                self._collecting.add(collect)
+                collect.add_done_callback(self._collecting.discard)
+            raise
+        finally:
+            self._worker_cancels.pop(record.id, None)
+        
+        self._replay_usage(record, outcome)
+        if outcome["result"] is None:
+            # The worker was told to stop, e.g. on shutdown
+            raise asyncio.CancelledError()
+        return outcome["result"]
+    
+    async def _collect_cancelled(self, record: SubagentTask, future: Future) -> None:
+        """Record the usage of a worker task that was cancelled while running."""
+        try:
+            self._replay_usage(record, await asyncio.wrap_future(future))
+        except Exception as e:
+            logger.debug(f"Subagent [{record.id}] worker ended without usage: {e}")
+    
+    def _replay_usage(self, record: SubagentTask, outcome: dict[str, Any]) -> None:
+        """Copy a worker's progress and LLM calls into this process."""
+        record.iteration = outcome["iteration"]
+        record.tokens = outcome["tokens"]
+        if self.usage:
+            for model, usage, latency_ms, cost_usd in outcome["calls"]:
+                response = LLMResponse(content=None, usage=usage, latency_ms=latency_ms, cost_usd=cost_usd)
+                self.usage.record(
+                    model,
+                    response,
+                    session=record.origin_key,
+                    channel=record.origin["channel"],
+                    subagent=record.id,
+                )
+    
+    def shutdown(self) -> None:
+        """Stop tasks running in workers and shut down the worker pool, if one was started."""
+        for cancel in self._worker_cancels.values():
+            cancel.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._sync is not None:
+            self._sync.shutdown()
+            self._sync = None
+    
+    async def _chat(
+        self,
+        record: SubagentTask,
+        tools: ToolSet,
+        messages: list[dict[str, Any]],
+        model: str,
+    ) -> LLMResponse:
+        """Call the LLM for a subagent and record its usage."""
+        response = await self.provider.chat(
+            messages=messages,
+            tools=tools.get_definitions(),
+            model=model,
+        )
+        record.tokens += (response.usage or {}).get("total_tokens") or 0
+        self._status_changed()
+        if self.usage:
+            self.usage.record(
+                model,
+                response,
+                session=record.origin_key,
+                channel=record.origin["channel"],
+                subagent=record.id,
+            )
+        return response
+    
     async def _announce_result(
         self,
         task_id: str,
@@ -185,9 +513,29 @@ class SubagentManager:
         origin: dict[str, str],
         status: str,
     ) -> None:
-        """Announce the subagent result to the main agent via the message bus."""
+        """
+        Announce the subagent result via the message bus.
+        
+        In "summarize" delivery the main agent gets the result as a system
+        message and words the reply itself. In "direct" delivery the result is
+        sent to the chat as-is and only recorded in the session, saving that
+        extra LLM call.
+        """
         status_text = "completed successfully" if status == "ok" else "failed"
         
+        if self.config.delivery == "direct":
+            msg = InboundMessage(
+                channel="system",
+                sender_id="subagent",
+                chat_id=f"{origin['channel']}:{origin['chat_id']}",
+                content=f"[Subagent '{label}' {status_text}]\n\nTask: {task}",
+                metadata={"deliver": f"Background task '{label}' {status_text}:\n\n{result}"},
+                lane="system",
+            )
+            await self.bus.publish_inbound(msg)
+            logger.debug(f"Subagent [{task_id}] delivered result to {origin['channel']}:{origin['chat_id']}")
+            return
+        
         announce_content = f"""[Subagent '{label}' {status_text}]
 
 Task: {task}
@@ -203,11 +551,44 @@ Summarize this naturally for the user. Keep it brief (1-2 sentences). Do not men
             sender_id="subagent",
             chat_id=f"{origin['channel']}:{origin['chat_id']}",
             content=announce_content,
+            lane="system",
         )
         
         await self.bus.publish_inbound(msg)
         logger.debug(f"Subagent [{task_id}] announced result to {origin['channel']}:{origin['chat_id']}")
     
+    async def _report_progress(self, record: SubagentTask, text: str, final: bool = False) -> None:
+        """
+        Send a progress update to the originating chat.
+        
+        Updates are only sent when progress reporting is enabled, and at most
+        once per `progress_interval_s`. Updates in between are dropped, except
+        final ones (a tool's outcome), which are prepended to the next update
+        so every tool's end state reaches the chat. The status snapshot is
+        refreshed either way.
+        """
+        self._status_changed()
+        if not self.config.progress:
+            return
+        now = time.monotonic()
+        if record.last_progress_at and now - record.last_progress_at < self.config.progress_interval_s:
+            if final:
+                record.unsent_progress.append(text)
+            return
+        record.last_progress_at = now
+        
+        if record.unsent_progress:
+            text = "; ".join(record.unsent_progress + [text])
+            record.unsent_progress.clear()
+        if len(text) > 300:
+            text = text[:300] + "..."
+        await self.bus.publish_outbound(OutboundMessage(
+            channel=record.origin["channel"],
+            chat_id=record.origin["chat_id"],
+            content=f"[{record.label}] {text}",
+            metadata={"subagent": record.id, "progress": True},
+        ))
+    
     def _build_subagent_prompt(self, task: str) -> str:
         """Build a focused system prompt for the subagent."""
         return f"""# Subagent
@@ -242,3 +623,79 @@ When you have completed the task, provide a clear summary of your findings or ac
     def get_running_count(self) -> int:
         """Return the number of currently running subagents."""
         return len(self._running_tasks)
+
+
+class _UsageCollector:
+    """Stands in for UsageTracker in a worker process and keeps the raw calls."""
+    
+    def __init__(self):
+        self.calls: list[tuple[str, dict[str, int], float, float]] = []
+    
+    def record(self, model: str, response: LLMResponse, **dimensions: Any) -> None:
+        self.calls.append((model, response.usage, response.latency_ms, response.cost_usd))
+
+
+# How often a worker checks whether its task was cancelled
+WORKER_CANCEL_POLL_S = 0.5
+
+
+def _litellm_provider(config: "Config") -> LLMProvider:
+    """Build the default worker provider from the config file."""
+    from nanobot.providers.litellm_provider import LiteLLMProvider
+    return LiteLLMProvider(
+        api_key=config.get_api_key(),
+        api_base=config.get_api_base(),
+        default_model=config.agents.defaults.model,
+    )
+
+
+async def _until_cancelled(record: SubagentTask, run: Any, cancel: Any) -> str | None:
+    """Run a worker's tool loop, stopping it once `cancel` is set."""
+    task = asyncio.create_task(run)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=WORKER_CANCEL_POLL_S)
+        if done:
+            return task.result()
+        if cancel.is_set():
+            logger.info(f"Subagent [{record.id}] cancelled in worker")
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return None
+
+
+def _run_in_worker(
+    task_id: str,
+    task: str,
+    label: str,
+    origin: dict[str, str],
+    cancel: Any,
+    provider_factory: "Callable[[Config], LLMProvider]",
+) -> dict[str, Any]:
+    """Worker process entry point: run one subagent tool loop from config."""
+    from nanobot.config.loader import load_config
+    
+    config = load_config()
+    collector = _UsageCollector()
+    manager = SubagentManager(
+        provider=provider_factory(config),
+        workspace=config.workspace_path,
+        bus=MessageBus(),
+        model=config.agents.defaults.model,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        usage_tracker=collector,
+        router=ModelRouter(config.agents.defaults.model, config.agents.routing),
+        config=config.agents.subagents,
+    )
+    record = SubagentTask(id=task_id, label=label, task=task, origin=origin, status="running")
+    result = asyncio.run(_until_cancelled(record, manager._run_tool_loop(record), cancel))
+    return {
+        "result": result,
+        "iteration": record.iteration,
+        "tokens": record.tokens,
+        "calls": collector.calls,
+    }
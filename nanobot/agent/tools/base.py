@@ -1,7 +1,110 @@
 """Base class for agent tools."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from contextvars import ContextVar
+from typing import Any, Callable
+
+_TYPE_MAP = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+# A compiled check: (value, label) -> error message or None
+_Check = Callable[[Any, str], str | None]
+
+
+def _compile(schema: dict[str, Any]) -> Callable[[Any, str], list[str]]:
+    """
+    Compile a JSON schema node into a validator closure.
+    
+    The validator takes (value, path) and returns a list of errors. Only
+    the checks that the node actually declares end up in the closure.
+    """
+    t = schema.get("type")
+    expected = _TYPE_MAP.get(t)
+    checks: list[_Check] = []
+    
+    if "enum" in schema:
+        enum = schema["enum"]
+        checks.append(lambda v, label: None if v in enum else f"{label} must be one of {enum}")
+    if t in ("integer", "number"):
+        if "minimum" in schema:
+            lo = schema["minimum"]
+            checks.append(lambda v, label: f"{label} must be >= {lo}" if v < lo else None)
+        if "maximum" in schema:
+            hi = schema["maximum"]
+            checks.append(lambda v, label: f"{label} must be <= {hi}" if v > hi else None)
+    if t == "string":
+        if "minLength" in schema:
+            min_len = schema["minLength"]
+            checks.append(
+                lambda v, label: f"{label} must be at least {min_len} chars" if len(v) < min_len else None
+            )
+        if "maxLength" in schema:
+            max_len = schema["maxLength"]
+            checks.append(
+                lambda v, label: f"{label} must be at most {max_len} chars" if len(v) > max_len else None
+            )
+    
+    required: tuple[str, ...] = ()
+    props: dict[str, Callable[[Any, str], list[str]]] = {}
+    if t == "object":
+        required = tuple(schema.get("required", []))
+        props = {k: _compile(v) for k, v in schema.get("properties", {}).items()}
+    items = _compile(schema["items"]) if t == "array" and "items" in schema else None
+    
+    def validate(val: Any, path: str) -> list[str]:
+        label = path or "parameter"
+        if expected is not None and not isinstance(val, expected):
+            return [f"{label} should be {t}"]
+        
+        errors = []
+        for check in checks:
+            error = check(val, label)
+            if error:
+                errors.append(error)
+        if required or props:
+            prefix = path + "." if path else ""
+            for k in required:
+                if k not in val:
+                    errors.append(f"missing required {prefix}{k}")
+            for k, v in val.items():
+                sub = props.get(k)
+                if sub is not None:
+                    errors.extend(sub(v, prefix + k))
+        if items is not None:
+            for i, item in enumerate(val):
+                errors.extend(items(item, f"{path}[{i}]" if path else f"[{i}]"))
+        return errors
+    
+    return validate
+
+
+class TurnContext:
+    """
+    The chat (channel, chat_id) a tool call belongs to.
+    
+    Kept in a ContextVar, so turns running concurrently in separate asyncio
+    tasks (e.g. cron jobs) each see the context they set.
+    """
+    
+    def __init__(self, channel: str = "", chat_id: str = ""):
+        self._var: ContextVar[tuple[str, str]] = ContextVar("turn_context", default=(channel, chat_id))
+    
+    def set(self, channel: str, chat_id: str) -> None:
+        self._var.set((channel, chat_id))
+    
+    @property
+    def channel(self) -> str:
+        return self._var.get()[0]
+    
+    @property
+    def chat_id(self) -> str:
+        return self._var.get()[1]
 
 
 class Tool(ABC):
@@ -12,15 +115,6 @@ class Tool(ABC):
     the environment, such as reading files, executing commands, etc.
     """
     
-    _TYPE_MAP = {
-        "string": str,
-        "integer": int,
-        "number": (int, float),
-        "boolean": bool,
-        "array": list,
-        "object": dict,
-    }
-    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -54,41 +148,22 @@ class Tool(ABC):
 
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
+        validator = self.__dict__.get("_validator") or self.compile_validator()
+        return validator(params, "")
+
+    def compile_validator(self) -> Callable[[Any, str], list[str]]:
+        """
+        Freeze the parameter schema and compile it into a validator.
+        
+        The validator is cached on the tool, so `parameters` is read only
+        once; the registry compiles it when the tool is registered.
+        """
         schema = self.parameters or {}
         if schema.get("type", "object") != "object":
             raise ValueError(f"Schema must be object type, got {schema.get('type')!r}")
-        return self._validate(params, {**schema, "type": "object"}, "")
-
-    def _validate(self, val: Any, schema: dict[str, Any], path: str) -> list[str]:
-        t, label = schema.get("type"), path or "parameter"
-        if t in self._TYPE_MAP and not isinstance(val, self._TYPE_MAP[t]):
-            return [f"{label} should be {t}"]
-        
-        errors = []
-        if "enum" in schema and val not in schema["enum"]:
-            errors.append(f"{label} must be one of {schema['enum']}")
-        if t in ("integer", "number"):
-            if "minimum" in schema and val < schema["minimum"]:
-                errors.append(f"{label} must be >= {schema['minimum']}")
-            if "maximum" in schema and val > schema["maximum"]:
-                errors.append(f"{label} must be <= {schema['maximum']}")
-        if t == "string":
-            if "minLength" in schema and len(val) < schema["minLength"]:
-                errors.append(f"{label} must be at least {schema['minLength']} chars")
-            if "maxLength" in schema and len(val) > schema["maxLength"]:
-                errors.append(f"{label} must be at most {schema['maxLength']} chars")
-        if t == "object":
-            props = schema.get("properties", {})
-            for k in schema.get("required", []):
-                if k not in val:
-                    errors.append(f"missing required {path + '.' + k if path else k}")
-            for k, v in val.items():
-                if k in props:
-                    errors.extend(self._validate(v, props[k], path + '.' + k if path else k))
-        if t == "array" and "items" in schema:
-            for i, item in enumerate(val):
-                errors.extend(self._validate(item, schema["items"], f"{path}[{i}]" if path else f"[{i}]"))
-        return errors
+        validator = _compile({**schema, "type": "object"})
+        self.__dict__["_validator"] = validator
+        return validator
     
     def to_schema(self) -> dict[str, Any]:
         """Convert tool to OpenAI function schema format."""
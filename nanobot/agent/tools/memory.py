@@ -0,0 +1,62 @@
+"""Memory search tool."""
+
+from typing import Any, TYPE_CHECKING
+
+from nanobot.agent.tools.base import Tool
+
+if TYPE_CHECKING:
+    from nanobot.agent.memory import MemoryStore
+
+
+class MemorySearchTool(Tool):
+    """Tool to search long-term memory and daily notes."""
+    
+    # Snippets longer than this are cut
+    MAX_SNIPPET_CHARS = 600
+    
+    def __init__(self, memory: "MemoryStore"):
+        self._memory = memory
+    
+    @property
+    def name(self) -> str:
+        return "memory_search"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search long-term memory (MEMORY.md) and daily notes for relevant snippets. "
+            "Use this to recall facts, preferences or past events that are not in the prompt."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What to look for",
+                    "minLength": 1,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of snippets (default 5)",
+                    "minimum": 1,
+                    "maximum": 20,
+                },
+            },
+            "required": ["query"],
+        }
+    
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        results = self._memory.search(query, limit)
+        if not results:
+            return f"No memory matches for: {query}"
+        
+        parts = []
+        for r in results:
+            text = r["text"]
+            if len(text) > self.MAX_SNIPPET_CHARS:
+                text = text[:self.MAX_SNIPPET_CHARS] + "..."
+            parts.append(f"[memory/{r['file']}:{r['line']}]\n{text}")
+        return "\n\n".join(parts)
@@ -1,6 +1,6 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from nanobot.agent.tools.base import Tool
 
@@ -14,14 +14,18 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._definitions: list[dict[str, Any]] | None = None
     
     def register(self, tool: Tool) -> None:
-        """Register a tool."""
+        """Register a tool, compiling its parameter validator."""
+        tool.compile_validator()
         self._tools[tool.name] = tool
+        self._definitions = None
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._definitions = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,8 +36,19 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """
+        Get all tool definitions in OpenAI format.
+        
+        The list is cached until the registry changes and shared between
+        callers, so it must not be modified.
+        """
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions
+    
+    def snapshot(self) -> "ToolSet":
+        """Get an immutable snapshot of the registered tools."""
+        return ToolSet(self._tools.values())
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
@@ -71,3 +86,31 @@ class ToolRegistry:
     
     def __contains__(self, name: str) -> bool:
         return name in self._tools
+    
+    def __iter__(self) -> Iterator[Tool]:
+        return iter(self._tools.values())
+
+
+class ToolSet(ToolRegistry):
+    """
+    Immutable set of tools with precomputed definitions.
+    
+    Schemas are built once when the set is created, so a set can be shared
+    by any number of agent loops without per-iteration work.
+    """
+    
+    def __init__(self, tools: Iterable[Tool]):
+        super().__init__()
+        for tool in tools:
+            tool.compile_validator()
+            self._tools[tool.name] = tool
+        self._definitions = [tool.to_schema() for tool in self._tools.values()]
+    
+    def register(self, tool: Tool) -> None:
+        raise TypeError("ToolSet is immutable; register tools on a ToolRegistry")
+    
+    def unregister(self, name: str) -> None:
+        raise TypeError("ToolSet is immutable; unregister tools on a ToolRegistry")
+    
+    def snapshot(self) -> "ToolSet":
+        return self
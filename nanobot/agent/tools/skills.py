@@ -0,0 +1,57 @@
+"""Skill search tool."""
+
+from typing import Any, TYPE_CHECKING
+
+from nanobot.agent.tools.base import Tool
+
+if TYPE_CHECKING:
+    from nanobot.agent.skills import SkillsLoader
+
+
+class FindSkillTool(Tool):
+    """Tool to search installed skills by name and description."""
+    
+    def __init__(self, skills: "SkillsLoader"):
+        self._skills = skills
+    
+    @property
+    def name(self) -> str:
+        return "find_skill"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search installed skills by what they do. Returns matching skills with the "
+            "location of their SKILL.md; read it with read_file before using the skill."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "What you want to do, e.g. 'check the weather'",
+                    "minLength": 1,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of skills (default 5)",
+                    "minimum": 1,
+                    "maximum": 20,
+                },
+            },
+            "required": ["query"],
+        }
+    
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        results = self._skills.search_skills(query, limit)
+        if not results:
+            return f"No skills match: {query}"
+        
+        lines = []
+        for r in results:
+            status = "" if r["available"] else " (unavailable: missing requirements)"
+            lines.append(f"- {r['name']}{status}: {r['description']}\n  {r['path']}")
+        return "\n".join(lines)
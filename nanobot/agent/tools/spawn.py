@@ -2,7 +2,7 @@
 
 from typing import Any, TYPE_CHECKING
 
-from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.base import Tool, TurnContext
 
 if TYPE_CHECKING:
     from nanobot.agent.subagent import SubagentManager
@@ -18,13 +18,11 @@ class SpawnTool(Tool):
     
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
+        self._origin = TurnContext("cli", "direct")
     
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
+        self._origin.set(channel, chat_id)
     
     @property
     def name(self) -> str:
@@ -60,6 +58,83 @@ class SpawnTool(Tool):
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=self._origin.channel,
+            origin_chat_id=self._origin.chat_id,
         )
+
+
+class SubagentsTool(Tool):
+    """
+    Tool to inspect and cancel background subagents.
+    
+    Only tasks spawned from the current chat are visible.
+    """
+    
+    def __init__(self, manager: "SubagentManager"):
+        self._manager = manager
+        self._origin = TurnContext("cli", "direct")
+    
+    def set_context(self, channel: str, chat_id: str) -> None:
+        """Set the chat whose subagents are visible."""
+        self._origin.set(channel, chat_id)
+    
+    @property
+    def name(self) -> str:
+        return "subagents"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "List, inspect or cancel background subagents spawned from this chat. "
+            "Actions: list, status, cancel."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["list", "status", "cancel"],
+                    "description": "Action to perform",
+                },
+                "task_id": {
+                    "type": "string",
+                    "description": "Subagent task ID (for status and cancel)",
+                },
+            },
+            "required": ["action"],
+        }
+    
+    async def execute(self, action: str, task_id: str | None = None, **kwargs: Any) -> str:
+        origin_key = f"{self._origin.channel}:{self._origin.chat_id}"
+        
+        if action == "list":
+            tasks = self._manager.list_tasks(origin_key=origin_key, include_finished=True)
+            if not tasks:
+                return "No background tasks."
+            return "Background tasks:\n" + "\n".join(self._format(t) for t in tasks)
+        
+        if not task_id:
+            return "Error: task_id is required for status and cancel"
+        record = self._manager.get_task(task_id)
+        if not record or record.origin_key != origin_key:
+            return f"Error: task {task_id} not found"
+        
+        if action == "status":
+            return self._format(record)
+        if action == "cancel":
+            if self._manager.cancel(task_id):
+                return f"Cancelled task {task_id}"
+            return f"Task {task_id} already finished ({record.status})"
+        return f"Unknown action: {action}"
+    
+    @staticmethod
+    def _format(record: Any) -> str:
+        line = f"- {record.label} (id: {record.id}, {record.status}"
+        if record.status == "running":
+            line += f", iteration {record.iteration}, {record.tokens} tokens"
+            if record.current_tool:
+                line += f", running {record.current_tool}"
+        return line + ")"
@@ -0,0 +1,46 @@
+"""Shared tool sets."""
+
+from functools import lru_cache
+from pathlib import Path
+
+from nanobot.agent.tools.registry import ToolSet
+from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, ListDirTool
+from nanobot.agent.tools.shell import ExecTool
+from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+
+
+@lru_cache(maxsize=8)
+def workspace_toolset(
+    workspace: Path,
+    brave_api_key: str | None = None,
+    exec_timeout: int = 60,
+    restrict_to_workspace: bool = False,
+) -> ToolSet:
+    """
+    Get the stateless workspace tools (files, shell, web) for a configuration.
+    
+    The set is built once per configuration and shared by the main agent and
+    all subagents.
+    
+    Args:
+        workspace: Workspace directory.
+        brave_api_key: Brave Search API key.
+        exec_timeout: Shell command timeout in seconds.
+        restrict_to_workspace: Restrict file and shell access to the workspace.
+    
+    Returns:
+        The shared tool set.
+    """
+    allowed_dir = workspace if restrict_to_workspace else None
+    return ToolSet([
+        ReadFileTool(allowed_dir=allowed_dir),
+        WriteFileTool(allowed_dir=allowed_dir),
+        ListDirTool(allowed_dir=allowed_dir),
+        ExecTool(
+            working_dir=str(workspace),
+            timeout=exec_timeout,
+            restrict_to_workspace=restrict_to_workspace,
+        ),
+        WebSearchTool(api_key=brave_api_key),
+        WebFetchTool(),
+    ])
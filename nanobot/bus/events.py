@@ -16,11 +16,14 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    lane: str = "interactive"  # Bus priority lane: interactive, system, cron, heartbeat
+    session_key_override: str | None = None  # Use a session other than channel:chat_id
+    history_limit: int | None = None  # Keep at most N history messages (0 = ephemeral turn, None = session default)
     
     @property
     def session_key(self) -> str:
         """Unique key for session identification."""
-        return f"{self.channel}:{self.chat_id}"
+        return self.session_key_override or f"{self.channel}:{self.chat_id}"
 
 
 @dataclass
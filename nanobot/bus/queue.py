@@ -1,6 +1,9 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Callable, Awaitable
 
 from loguru import logger
@@ -8,27 +11,189 @@ from loguru import logger
 from nanobot.bus.events import InboundMessage, OutboundMessage
 
 
+# Inbound priority lanes, highest priority first
+LANES = ("interactive", "system", "cron", "heartbeat")
+
+
+@dataclass
+class LaneStats:
+    """Counters for one inbound priority lane."""
+    enqueued: int = 0
+    dequeued: int = 0
+    dropped: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+
 class MessageBus:
     """
     Async message bus that decouples chat channels from the agent core.
     
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+    
+    Inbound messages are split into priority lanes (see LANES) so that a
+    backlog of scheduled work never delays a human waiting in a chat. A
+    lower lane whose oldest message has waited longer than `starvation_s`
+    is served ahead of higher lanes, so background work still progresses.
+    
+    Both directions can be bounded (the inbound limit counts all lanes).
+    When the inbound queue is full, the overflow policy of the message's
+    channel decides what happens to live chat messages:
+    - "block": wait for space (backpressure on the channel handler)
+    - "drop_oldest": discard the oldest queued chat message
+    - "reject": drop the new message and reply with a busy notice
+    Internal lanes (system, cron, heartbeat) always block.
+    
+    With coalescing enabled, a chat message from a sender whose previous
+    message in the same chat is still queued is merged into it, so a burst
+    of quick messages becomes a single agent turn.
     """
     
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "reject")
+    
+    def __init__(
+        self,
+        inbound_maxsize: int = 0,
+        outbound_maxsize: int = 0,
+        overflow_policy: str = "block",
+        channel_policies: dict[str, str] | None = None,
+        coalesce: bool = False,
+        busy_message: str = "I'm busy right now, please try again in a moment.",
+        starvation_s: float = 30.0,
+    ):
+        for policy in [overflow_policy, *(channel_policies or {}).values()]:
+            if policy not in self.OVERFLOW_POLICIES:
+                raise ValueError(f"Unknown overflow policy: {policy}")
+        self.inbound_maxsize = inbound_maxsize
+        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue(maxsize=outbound_maxsize)
+        self.overflow_policy = overflow_policy
+        self.channel_policies = channel_policies or {}
+        self.coalesce = coalesce
+        self.busy_message = busy_message
+        self.starvation_s = starvation_s
+        self._lanes: dict[str, deque[tuple[float, InboundMessage]]] = {lane: deque() for lane in LANES}
+        self._lane_stats: dict[str, LaneStats] = {lane: LaneStats() for lane in LANES}
+        self._inbound_count = 0
+        self._inbound_changed = asyncio.Condition()
         self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
+        self._pending: dict[str, InboundMessage] = {}  # session_key -> queued message
         self._running = False
+        self._dispatch_task: asyncio.Task | None = None
+        
+        # Load shedding counters
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.rejected_count = 0
     
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
+        """
+        Publish a message from a channel to the agent.
+        
+        Returns:
+            False if the message was rejected because the queue is full.
+        """
+        if msg.lane not in self._lanes:
+            raise ValueError(f"Unknown bus lane: {msg.lane}")
+        
+        if self.coalesce and msg.lane == "interactive":
+            pending = self._pending.get(msg.session_key)
+            if pending is not None and pending.sender_id == msg.sender_id:
+                pending.content = f"{pending.content}\n{msg.content}"
+                pending.media.extend(msg.media)
+                self.coalesced_count += 1
+                return True
+        
+        async with self._inbound_changed:
+            if self._inbound_full():
+                policy = "block"
+                if msg.lane == "interactive":
+                    policy = self.channel_policies.get(msg.channel, self.overflow_policy)
+                if policy == "drop_oldest" and self._lanes["interactive"]:
+                    _, dropped = self._lanes["interactive"].popleft()
+                    self._inbound_count -= 1
+                    self._forget(dropped)
+                    self._lane_stats["interactive"].dropped += 1
+                    self.dropped_count += 1
+                    logger.warning(f"Inbound queue full, dropped oldest message from {dropped.session_key}")
+                elif policy == "reject":
+                    self.rejected_count += 1
+                    logger.warning(f"Inbound queue full, rejected message from {msg.session_key}")
+                    await self._reply_busy(msg)
+                    return False
+                
+                # Wait for space under the "block" policy
+                await self._inbound_changed.wait_for(lambda: not self._inbound_full())
+            
+            self._lanes[msg.lane].append((time.monotonic(), msg))
+            self._lane_stats[msg.lane].enqueued += 1
+            self._inbound_count += 1
+            self._inbound_changed.notify_all()
+        
+        if self.coalesce and msg.lane == "interactive":
+            self._pending[msg.session_key] = msg
+        return True
     
     async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+        """Consume the next inbound message by lane priority (blocks until available)."""
+        async with self._inbound_changed:
+            await self._inbound_changed.wait_for(lambda: self._inbound_count > 0)
+            lane = self._next_lane()
+            enqueued_at, msg = self._lanes[lane].popleft()
+            self._inbound_count -= 1
+            self._inbound_changed.notify_all()
+        
+        waited = time.monotonic() - enqueued_at
+        stats = self._lane_stats[lane]
+        stats.dequeued += 1
+        stats.total_wait_s += waited
+        stats.max_wait_s = max(stats.max_wait_s, waited)
+        self._forget(msg)
+        return msg
+    
+    def _next_lane(self) -> str:
+        """Pick the lane to serve: a starved lane first, else the highest non-empty one."""
+        now = time.monotonic()
+        starved = [
+            (queue[0][0], lane) for lane, queue in self._lanes.items()
+            if queue and now - queue[0][0] >= self.starvation_s
+        ]
+        if starved:
+            return min(starved)[1]
+        return next(lane for lane, queue in self._lanes.items() if queue)
+    
+    def _inbound_full(self) -> bool:
+        return self.inbound_maxsize > 0 and self._inbound_count >= self.inbound_maxsize
+    
+    def _forget(self, msg: InboundMessage) -> None:
+        """Stop coalescing into a message that left the queue."""
+        if self._pending.get(msg.session_key) is msg:
+            del self._pending[msg.session_key]
+    
+    async def _reply_busy(self, msg: InboundMessage) -> None:
+        """Tell the sender their message was not accepted."""
+        try:
+            self.outbound.put_nowait(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=self.busy_message,
+            ))
+        except asyncio.QueueFull:
+            logger.warning(f"Outbound queue full, dropped busy reply to {msg.session_key}")
+    
+    def lane_stats(self) -> dict[str, dict[str, float]]:
+        """Get depth, throughput and wait-time metrics per inbound lane."""
+        return {
+            lane: {
+                "depth": len(self._lanes[lane]),
+                "enqueued": stats.enqueued,
+                "dequeued": stats.dequeued,
+                "dropped": stats.dropped,
+                "avg_wait_s": stats.total_wait_s / stats.dequeued if stats.dequeued else 0.0,
+                "max_wait_s": stats.max_wait_s,
+            }
+            for lane, stats in self._lane_stats.items()
+        }
     
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
@@ -51,29 +216,38 @@ class MessageBus:
     async def dispatch_outbound(self) -> None:
         """
         Dispatch outbound messages to subscribed channels.
-        Run this as a background task.
+        Run this as a background task; stop() cancels it.
         """
         self._running = True
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
-                    try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
-            except asyncio.TimeoutError:
-                continue
+        self._dispatch_task = asyncio.current_task()
+        try:
+            while self._running:
+                msg = await self.outbound.get()
+                try:
+                    subscribers = self._outbound_subscribers.get(msg.channel, [])
+                    for callback in subscribers:
+                        try:
+                            await callback(msg)
+                        except Exception as e:
+                            logger.error(f"Error dispatching to {msg.channel}: {e}")
+                finally:
+                    self.outbound.task_done()
+        except asyncio.CancelledError:
+            if self._running:
+                raise
+        finally:
+            self._dispatch_task = None
     
     def stop(self) -> None:
         """Stop the dispatcher loop."""
         self._running = False
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
     
     @property
     def inbound_size(self) -> int:
-        """Number of pending inbound messages."""
-        return self.inbound.qsize()
+        """Number of pending inbound messages across all lanes."""
+        return self._inbound_count
     
     @property
     def outbound_size(self) -> int:
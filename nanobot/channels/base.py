@@ -58,6 +58,21 @@ class BaseChannel(ABC):
         """
         pass
     
+    def send_delay(self, chat_id: str) -> float:
+        """
+        Get how long until the chat may receive its next message.
+        
+        Channels that pace sends per chat override this, so the sender can
+        serve other chats in the meantime instead of waiting in send().
+        
+        Args:
+            chat_id: The chat/channel identifier.
+        
+        Returns:
+            Seconds to wait, 0 if a message can be sent now.
+        """
+        return 0.0
+    
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -1,6 +1,8 @@
 """Channel manager for coordinating chat channels."""
 
 import asyncio
+import time
+from collections import deque
 from typing import Any
 
 from loguru import logger
@@ -11,6 +13,152 @@ from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
 
 
+class ChannelSender:
+    """
+    Sends outbound messages for one channel.
+    
+    Each chat has its own queue, and `concurrency` workers take turns
+    serving the chats that have messages waiting, so sends to different
+    chats run in parallel while each chat keeps its order. A chat the
+    channel is pacing (see BaseChannel.send_delay) is set aside until its
+    next send is allowed instead of holding a worker.
+    
+    At most `max_pending` messages are held. submit() never waits, so one
+    stalled platform cannot hold up the shared dispatcher: when the sender
+    is full, "drop_oldest" drops the oldest waiting message to make room,
+    and any other policy drops the new one.
+    """
+    
+    def __init__(
+        self,
+        channel: BaseChannel,
+        concurrency: int = 4,
+        max_pending: int = 100,
+        overflow: str = "drop_oldest",
+    ):
+        self.channel = channel
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(1, max_pending)
+        self.overflow = overflow
+        self._chats: dict[str, deque[tuple[int, OutboundMessage]]] = {}  # Chats with messages waiting or in flight
+        self._ready: asyncio.Queue[str] = asyncio.Queue()  # Chats a worker may serve now
+        self._paced: dict[str, asyncio.TimerHandle] = {}  # Chats set aside until their next send
+        self._seq = 0
+        self._depth = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: list[asyncio.Task] = []
+        self._latencies_ms: deque[float] = deque(maxlen=200)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+    
+    def start(self) -> None:
+        """Start the send workers."""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+    
+    async def stop(self) -> None:
+        """Cancel the send workers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for handle in self._paced.values():
+            handle.cancel()
+        self._paced.clear()
+    
+    def submit(self, msg: OutboundMessage) -> bool:
+        """
+        Queue a message behind its chat's earlier ones, without waiting.
+        
+        Returns:
+            False if the sender was full and the message was dropped.
+        """
+        if self._depth >= self.max_pending and not (self.overflow == "drop_oldest" and self._drop_oldest()):
+            self.dropped += 1
+            logger.warning(f"{self.channel.name} send queue full, dropped message to {msg.chat_id}")
+            return False
+        
+        self._seq += 1
+        self._depth += 1
+        self._idle.clear()
+        chat = self._chats.get(msg.chat_id)
+        if chat is None:
+            self._chats[msg.chat_id] = deque([(self._seq, msg)])
+            self._ready.put_nowait(msg.chat_id)
+        else:
+            chat.append((self._seq, msg))
+        return True
+    
+    def _drop_oldest(self) -> bool:
+        """Drop the oldest message still waiting to be sent, if there is one."""
+        oldest = min((chat for chat in self._chats.values() if chat), key=lambda c: c[0][0], default=None)
+        if oldest is None:
+            return False
+        _, msg = oldest.popleft()
+        self._depth -= 1
+        self.dropped += 1
+        logger.warning(f"{self.channel.name} send queue full, dropped oldest message to {msg.chat_id}")
+        return True
+    
+    async def join(self) -> None:
+        """Wait until every queued message has been sent (or failed)."""
+        await self._idle.wait()
+    
+    def _resume(self, chat_id: str) -> None:
+        self._paced.pop(chat_id, None)
+        self._ready.put_nowait(chat_id)
+    
+    async def _worker(self) -> None:
+        while True:
+            chat_id = await self._ready.get()
+            delay = self.channel.send_delay(chat_id)
+            if delay > 0:
+                self._paced[chat_id] = asyncio.get_running_loop().call_later(delay, self._resume, chat_id)
+                continue
+            
+            chat = self._chats[chat_id]
+            if not chat:
+                # Its messages were dropped while it waited
+                del self._chats[chat_id]
+                continue
+            _, msg = chat.popleft()
+            start = time.perf_counter()
+            try:
+                await self.channel.send(msg)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error sending to {msg.channel}: {e}")
+            finally:
+                self._latencies_ms.append((time.perf_counter() - start) * 1000)
+                # Back of the line, so busy chats take turns with the others
+                if chat:
+                    self._ready.put_nowait(chat_id)
+                else:
+                    del self._chats[chat_id]
+                self._depth -= 1
+                if not self._depth:
+                    self._idle.set()
+    
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent."""
+        return self._depth
+    
+    def stats(self) -> dict[str, Any]:
+        """Get queue depth and send latency metrics."""
+        latencies = sorted(self._latencies_ms)
+        return {
+            "depth": self.depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "avg_send_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_send_ms": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        }
+
+
 class ChannelManager:
     """
     Manages chat channels and coordinates message routing.
@@ -18,13 +166,15 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages to per-channel senders, so a slow platform
+      never blocks replies on another
     """
     
     def __init__(self, config: Config, bus: MessageBus):
         self.config = config
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
+        self._senders: dict[str, ChannelSender] = {}
         self._dispatch_task: asyncio.Task | None = None
         
         self._init_channels()
@@ -84,7 +234,17 @@ class ChannelManager:
             logger.warning("No channels enabled")
             return
         
-        # Start outbound dispatcher
+        # Start per-channel senders and the outbound dispatcher
+        for name, channel in self.channels.items():
+            bus_config = self.config.bus
+            sender = ChannelSender(
+                channel,
+                self.config.channels.send_concurrency,
+                self.config.channels.send_queue_size,
+                bus_config.channel_overflow.get(name, bus_config.overflow_policy),
+            )
+            sender.start()
+            self._senders[name] = sender
         self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
         
         # Start WhatsApp channel
@@ -96,17 +256,33 @@ class ChannelManager:
         # Wait for all to complete (they should run forever)
         await asyncio.gather(*tasks, return_exceptions=True)
     
-    async def stop_all(self) -> None:
-        """Stop all channels and the dispatcher."""
+    async def stop_all(self, drain_timeout_s: float = 5.0) -> None:
+        """
+        Stop all channels and the dispatcher.
+        
+        Args:
+            drain_timeout_s: How long to wait for pending outbound messages
+                to be sent before stopping.
+        """
         logger.info("Stopping all channels...")
         
-        # Stop dispatcher
+        # Let the dispatcher and senders flush pending replies
+        if self._dispatch_task and drain_timeout_s > 0:
+            try:
+                await asyncio.wait_for(self._drain(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                pending = self.bus.outbound_size + sum(s.depth for s in self._senders.values())
+                logger.warning(f"{pending} outbound messages not sent before shutdown")
+        
+        # Stop dispatcher and senders
         if self._dispatch_task:
             self._dispatch_task.cancel()
             try:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        for sender in self._senders.values():
+            await sender.stop()
         
         # Stop all channels
         for name, channel in self.channels.items():
@@ -116,30 +292,28 @@ class ChannelManager:
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
     
+    async def _drain(self) -> None:
+        """Wait until all queued outbound messages have been sent."""
+        await self.bus.outbound.join()
+        for sender in self._senders.values():
+            await sender.join()
+    
     async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
+        """Route outbound messages to their channel's sender."""
         logger.info("Outbound dispatcher started")
         
         while True:
             try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_outbound(),
-                    timeout=1.0
-                )
-                
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
-                else:
-                    logger.warning(f"Unknown channel: {msg.channel}")
-                    
-            except asyncio.TimeoutError:
-                continue
+                msg = await self.bus.consume_outbound()
             except asyncio.CancelledError:
                 break
+            
+            sender = self._senders.get(msg.channel)
+            if sender:
+                sender.submit(msg)
+            else:
+                logger.warning(f"Unknown channel: {msg.channel}")
+            self.bus.outbound.task_done()
     
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
@@ -150,7 +324,8 @@ class ChannelManager:
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "outbound": self._senders[name].stats() if name in self._senders else None,
             }
             for name, channel in self.channels.items()
         }
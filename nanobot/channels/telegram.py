@@ -2,9 +2,12 @@
 
 import asyncio
 import re
+import time
+from datetime import timedelta
 
 from loguru import logger
 from telegram import Update
+from telegram.error import BadRequest, RetryAfter, TelegramError
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 
 from nanobot.bus.events import OutboundMessage
@@ -13,6 +16,28 @@ from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import TelegramConfig
 
 
+# Telegram rejects messages longer than this (counted after entity parsing,
+# so the HTML length is a safe upper bound)
+MAX_MESSAGE_LENGTH = 4096
+
+_CODE_BLOCK_RE = re.compile(r'```[\w]*\n?([\s\S]*?)```')
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_HEADER_RE = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+_BLOCKQUOTE_RE = re.compile(r'^>\s*(.*)$', re.MULTILINE)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_BOLD_STAR_RE = re.compile(r'\*\*(.+?)\*\*')
+_BOLD_UNDERSCORE_RE = re.compile(r'__(.+?)__')
+_ITALIC_RE = re.compile(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])')
+_STRIKE_RE = re.compile(r'~~(.+?)~~')
+_BULLET_RE = re.compile(r'^[-*]\s+', re.MULTILINE)
+# A fenced code block, the text up to the next one, or an unclosed fence
+_BLOCK_RE = re.compile(r'```[\s\S]*?```|(?:(?!```)[\s\S])+|```')
+
+
+def _escape_html(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
 def _markdown_to_telegram_html(text: str) -> str:
     """
     Convert markdown to Telegram-safe HTML.
@@ -26,7 +51,7 @@ def _markdown_to_telegram_html(text: str) -> str:
         code_blocks.append(m.group(1))
         return f"\x00CB{len(code_blocks) - 1}\x00"
     
-    text = re.sub(r'```[\w]*\n?([\s\S]*?)```', save_code_block, text)
+    text = _CODE_BLOCK_RE.sub(save_code_block, text)
     
     # 2. Extract and protect inline code
     inline_codes: list[str] = []
@@ -34,63 +59,163 @@ def _markdown_to_telegram_html(text: str) -> str:
         inline_codes.append(m.group(1))
         return f"\x00IC{len(inline_codes) - 1}\x00"
     
-    text = re.sub(r'`([^`]+)`', save_inline_code, text)
+    text = _INLINE_CODE_RE.sub(save_inline_code, text)
     
     # 3. Headers # Title -> just the title text
-    text = re.sub(r'^#{1,6}\s+(.+)$', r'\1', text, flags=re.MULTILINE)
+    text = _HEADER_RE.sub(r'\1', text)
     
     # 4. Blockquotes > text -> just the text (before HTML escaping)
-    text = re.sub(r'^>\s*(.*)$', r'\1', text, flags=re.MULTILINE)
+    text = _BLOCKQUOTE_RE.sub(r'\1', text)
     
     # 5. Escape HTML special characters
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = _escape_html(text)
     
     # 6. Links [text](url) - must be before bold/italic to handle nested cases
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
     
     # 7. Bold **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
-    text = re.sub(r'__(.+?)__', r'<b>\1</b>', text)
+    text = _BOLD_STAR_RE.sub(r'<b>\1</b>', text)
+    text = _BOLD_UNDERSCORE_RE.sub(r'<b>\1</b>', text)
     
     # 8. Italic _text_ (avoid matching inside words like some_var_name)
-    text = re.sub(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])', r'<i>\1</i>', text)
+    text = _ITALIC_RE.sub(r'<i>\1</i>', text)
     
     # 9. Strikethrough ~~text~~
-    text = re.sub(r'~~(.+?)~~', r'<s>\1</s>', text)
+    text = _STRIKE_RE.sub(r'<s>\1</s>', text)
     
     # 10. Bullet lists - item -> • item
-    text = re.sub(r'^[-*]\s+', '• ', text, flags=re.MULTILINE)
+    text = _BULLET_RE.sub('• ', text)
     
     # 11. Restore inline code with HTML tags
     for i, code in enumerate(inline_codes):
         # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00IC{i}\x00", f"<code>{escaped}</code>")
+        text = text.replace(f"\x00IC{i}\x00", f"<code>{_escape_html(code)}</code>")
     
     # 12. Restore code blocks with HTML tags
     for i, code in enumerate(code_blocks):
         # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00CB{i}\x00", f"<pre><code>{escaped}</code></pre>")
+        text = text.replace(f"\x00CB{i}\x00", f"<pre><code>{_escape_html(code)}</code></pre>")
     
     return text
 
 
+def _split_markdown(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[tuple[str, str]]:
+    """
+    Split markdown into chunks whose HTML fits in one Telegram message.
+    
+    Text is cut at code block and paragraph boundaries, falling back to
+    line, then word boundaries for oversized pieces; an oversized code block
+    is split by lines into several fenced blocks. Each piece is converted on
+    its own, so every chunk is self-contained, valid HTML.
+    
+    Returns:
+        (markdown, html) pairs, in order.
+    """
+    pieces: list[tuple[str, str]] = []
+    for block in _BLOCK_RE.findall(text):
+        if block.startswith("```"):
+            pieces.extend(_fit_code_block(block, limit))
+            continue
+        for para in re.split(r'\n\s*\n', block):
+            if para.strip():
+                pieces.extend(_fit_text(para.strip("\n"), limit))
+    
+    # Pack pieces greedily, joined by a blank line
+    chunks: list[tuple[str, str]] = []
+    md_parts: list[str] = []
+    html_parts: list[str] = []
+    size = 0
+    for md, html in pieces:
+        if html_parts and size + 2 + len(html) > limit:
+            chunks.append(("\n\n".join(md_parts), "\n\n".join(html_parts)))
+            md_parts, html_parts, size = [], [], 0
+        size += (2 if html_parts else 0) + len(html)
+        md_parts.append(md)
+        html_parts.append(html)
+    if html_parts:
+        chunks.append(("\n\n".join(md_parts), "\n\n".join(html_parts)))
+    return chunks
+
+
+def _fit_text(text: str, limit: int) -> list[tuple[str, str]]:
+    """Convert a paragraph, splitting it at lines or words if its HTML is too long."""
+    html = _markdown_to_telegram_html(text)
+    if len(html) <= limit:
+        return [(text, html)]
+    
+    lines = text.split("\n")
+    if len(lines) > 1:
+        mid = len(lines) // 2
+        return _fit_text("\n".join(lines[:mid]), limit) + _fit_text("\n".join(lines[mid:]), limit)
+    
+    # A single long line: cut at a space near the size that fits
+    cut = max(1, len(text) * limit // len(html) - 1)
+    space = text.rfind(" ", 0, cut)
+    if space > cut // 2:
+        cut = space
+    return _fit_text(text[:cut], limit) + _fit_text(text[cut:].lstrip(" "), limit)
+
+
+def _fit_code_block(block: str, limit: int) -> list[tuple[str, str]]:
+    """Convert a fenced code block, splitting it into several by lines if too long."""
+    html = _markdown_to_telegram_html(block)
+    if len(html) <= limit:
+        return [(block, html)]
+    
+    match = _CODE_BLOCK_RE.fullmatch(block)
+    if not match:
+        return _fit_text(block, limit)
+    
+    overhead = len("<pre><code></code></pre>")
+    pieces: list[tuple[str, str]] = []
+    lines: list[str] = []
+    size = 0
+    for line in match.group(1).rstrip("\n").split("\n"):
+        escaped = _escape_html(line)
+        # A single line longer than a message is sent as plain text pieces
+        if overhead + len(escaped) > limit:
+            if lines:
+                pieces.append(_code_piece(lines))
+                lines, size = [], 0
+            pieces.extend(_fit_text(line, limit))
+            continue
+        if lines and overhead + size + 1 + len(escaped) > limit:
+            pieces.append(_code_piece(lines))
+            lines, size = [], 0
+        size += (1 if lines else 0) + len(escaped)
+        lines.append(line)
+    if lines:
+        pieces.append(_code_piece(lines))
+    return pieces
+
+
+def _code_piece(lines: list[str]) -> tuple[str, str]:
+    code = "\n".join(lines)
+    return f"```\n{code}\n```", f"<pre><code>{_escape_html(code)}</code></pre>"
+
+
 class TelegramChannel(BaseChannel):
     """
     Telegram channel using long polling.
     
     Simple and reliable - no webhook/public IP needed.
+    
+    Long replies are split into several messages under Telegram's size
+    limit, and sends to each chat are spaced by `min_send_interval_s`.
     """
     
     name = "telegram"
     
+    # Attempts per message when Telegram asks us to slow down
+    MAX_SEND_ATTEMPTS = 3
+    
     def __init__(self, config: TelegramConfig, bus: MessageBus, groq_api_key: str = ""):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
         self.groq_api_key = groq_api_key
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
+        self._next_send: dict[int, float] = {}  # chat_id -> monotonic time of its next allowed send
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -152,7 +277,7 @@ class TelegramChannel(BaseChannel):
             self._app = None
     
     async def send(self, msg: OutboundMessage) -> None:
-        """Send a message through Telegram."""
+        """Send a message through Telegram, split into chunks that fit the size limit."""
         if not self._app:
             logger.warning("Telegram bot not running")
             return
@@ -160,25 +285,57 @@ class TelegramChannel(BaseChannel):
         try:
             # chat_id should be the Telegram chat ID (integer)
             chat_id = int(msg.chat_id)
-            # Convert markdown to Telegram HTML
-            html_content = _markdown_to_telegram_html(msg.content)
-            await self._app.bot.send_message(
-                chat_id=chat_id,
-                text=html_content,
-                parse_mode="HTML"
-            )
         except ValueError:
             logger.error(f"Invalid chat_id: {msg.chat_id}")
-        except Exception as e:
-            # Fallback to plain text if HTML parsing fails
-            logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            return
+        
+        # Convert markdown to Telegram HTML, one chunk per message
+        for markdown, html in _split_markdown(msg.content):
+            try:
+                try:
+                    await self._send_chunk(chat_id, html, parse_mode="HTML")
+                except BadRequest as e:
+                    # Fallback to plain text if HTML parsing fails
+                    logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+                    await self._send_chunk(chat_id, markdown[:MAX_MESSAGE_LENGTH])
+            except RetryAfter as e:
+                logger.error(f"Telegram flood control for chat {chat_id} persisted, dropping the rest of the message: {e}")
+                return
+            except TelegramError as e:
+                logger.error(f"Error sending Telegram message: {e}")
+                return
+    
+    async def _send_chunk(self, chat_id: int, text: str, parse_mode: str | None = None) -> None:
+        """Send one message, pacing sends per chat and honoring flood-control waits."""
+        for attempt in range(self.MAX_SEND_ATTEMPTS):
+            await self._wait_turn(chat_id)
             try:
-                await self._app.bot.send_message(
-                    chat_id=int(msg.chat_id),
-                    text=msg.content
-                )
-            except Exception as e2:
-                logger.error(f"Error sending Telegram message: {e2}")
+                await self._app.bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+                return
+            except RetryAfter as e:
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                if attempt == self.MAX_SEND_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Telegram flood control for chat {chat_id}, retrying in {delay}s")
+                self._next_send[chat_id] = max(self._next_send.get(chat_id, 0.0), time.monotonic() + delay)
+    
+    def send_delay(self, chat_id: str) -> float:
+        """Get how long until the chat's next send slot, so the sender can serve others meanwhile."""
+        try:
+            next_send = self._next_send.get(int(chat_id), 0.0)
+        except ValueError:
+            return 0.0
+        return max(0.0, next_send - time.monotonic())
+    
+    async def _wait_turn(self, chat_id: int) -> None:
+        """Wait until the chat may receive its next message, reserving the slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_send.get(chat_id, 0.0))
+        self._next_send[chat_id] = slot + self.config.min_send_interval_s
+        if slot > now:
+            await asyncio.sleep(slot - now)
     
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -166,6 +166,8 @@ def gateway(
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.session.manager import history_limit_for
+    from nanobot.usage.tracker import UsageTracker
     
     if verbose:
         import logging
@@ -176,7 +178,15 @@ def gateway(
     config = load_config()
     
     # Create components
-    bus = MessageBus()
+    bus = MessageBus(
+        inbound_maxsize=config.bus.inbound_max_size,
+        outbound_maxsize=config.bus.outbound_max_size,
+        overflow_policy=config.bus.overflow_policy,
+        channel_policies=config.bus.channel_overflow,
+        coalesce=config.bus.coalesce,
+        busy_message=config.bus.busy_message,
+        starvation_s=config.bus.starvation_s,
+    )
     
     # Create provider (supports OpenRouter, Anthropic, OpenAI, Bedrock)
     api_key = config.get_api_key()
@@ -197,7 +207,10 @@ def gateway(
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, config=config.cron)
+    
+    # Token/cost/latency accounting shared by the agent and subagents
+    usage = UsageTracker(get_data_dir() / "usage" / "usage.json")
     
     # Create agent with cron service
     agent = AgentLoop(
@@ -210,17 +223,35 @@ def gateway(
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        usage_tracker=usage,
+        routing_config=config.agents.routing,
+        subagents_config=config.agents.subagents,
+        compaction_config=config.agents.compaction,
+        tool_history_config=config.agents.tool_history,
+        memory_config=config.agents.memory,
+        skills_config=config.agents.skills,
+        subagent_status_path=get_data_dir() / "subagents.json",
     )
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
-        response = await agent.process_direct(
-            job.payload.message,
+        kwargs: dict = dict(
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
             chat_id=job.payload.to or "direct",
+            lane="cron",
+            history_limit=history_limit_for(
+                job.session_mode or config.cron.session_mode,
+                job.history_messages or config.cron.history_messages,
+            ),
         )
+        # Serial runs wait their turn in the agent loop's cron lane, and their
+        # timeout starts with the turn; parallel runs go alongside the loop
+        if cron.on_job_times_out:
+            response = await agent.process_queued(job.payload.message, timeout=cron.timeout_for(job), **kwargs)
+        else:
+            response = await agent.process_direct(job.payload.message, **kwargs)
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
             await bus.publish_outbound(OutboundMessage(
@@ -230,17 +261,27 @@ def gateway(
             ))
         return response
     cron.on_job = on_cron_job
+    cron.on_job_times_out = config.cron.max_concurrent == 1
     
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.process_queued(
+            prompt,
+            session_key="heartbeat",
+            lane="heartbeat",
+            history_limit=history_limit_for(config.heartbeat.session_mode, config.heartbeat.history_messages),
+        )
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
         on_heartbeat=on_heartbeat,
-        interval_s=30 * 60,  # 30 minutes
-        enabled=True
+        interval_s=config.heartbeat.interval_s,
+        enabled=config.heartbeat.enabled,
+        skip_unchanged=config.heartbeat.skip_unchanged,
+        max_skip_s=config.heartbeat.max_skip_s,
+        state_path=get_data_dir() / "heartbeat.json",
+        usage=usage,
     )
     
     # Create channel manager
@@ -255,22 +296,45 @@ def gateway(
     if cron_status["jobs"] > 0:
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
-    console.print(f"[green]✓[/green] Heartbeat: every 30m")
+    if config.heartbeat.enabled:
+        console.print(f"[green]✓[/green] Heartbeat: every {config.heartbeat.interval_s // 60}m")
+    _print_usage_overview(usage)
     
     async def run():
+        import signal
+        
+        shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, shutdown.set)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C cancels run() instead
+        
         try:
             await cron.start()
             await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
-        except KeyboardInterrupt:
+            agent_task = asyncio.create_task(agent.run())
+            channels_task = asyncio.create_task(channels.start_all())
+            try:
+                await shutdown.wait()
+            except asyncio.CancelledError:
+                pass
+            
             console.print("\nShutting down...")
             heartbeat.stop()
             cron.stop()
-            agent.stop()
-            await channels.stop_all()
+            
+            # Let the in-flight turn finish, then flush replies before stopping channels
+            agent.stop(drain=True)
+            try:
+                await asyncio.wait_for(agent_task, timeout=config.gateway.drain_timeout_s)
+            except asyncio.TimeoutError:
+                console.print("[yellow]In-flight turn did not finish in time, cancelled[/yellow]")
+            await channels.stop_all(drain_timeout_s=config.gateway.drain_timeout_s)
+            channels_task.cancel()
+        finally:
+            usage.flush()
     
     asyncio.run(run())
 
@@ -288,10 +352,11 @@ def agent(
     session_id: str = typer.Option("cli:default", "--session", "-s", help="Session ID"),
 ):
     """Interact with the agent directly."""
-    from nanobot.config.loader import load_config
+    from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.agent.loop import AgentLoop
+    from nanobot.usage.tracker import UsageTracker
     
     config = load_config()
     
@@ -311,6 +376,7 @@ def agent(
         default_model=config.agents.defaults.model
     )
     
+    usage = UsageTracker(get_data_dir() / "usage" / "usage.json")
     agent_loop = AgentLoop(
         bus=bus,
         provider=provider,
@@ -318,12 +384,20 @@ def agent(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        usage_tracker=usage,
+        routing_config=config.agents.routing,
+        subagents_config=config.agents.subagents,
+        compaction_config=config.agents.compaction,
+        tool_history_config=config.agents.tool_history,
+        memory_config=config.agents.memory,
+        skills_config=config.agents.skills,
     )
     
     if message:
         # Single message mode
         async def run_once():
             response = await agent_loop.process_direct(message, session_id)
+            usage.flush()
             console.print(f"\n{__logo__} {response}")
         
         asyncio.run(run_once())
@@ -343,6 +417,7 @@ def agent(
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
+            usage.flush()
         
         asyncio.run(run_interactive())
 
@@ -482,13 +557,16 @@ app.add_typer(cron_app, name="cron")
 @cron_app.command("list")
 def cron_list(
     all: bool = typer.Option(False, "--all", "-a", help="Include disabled jobs"),
+    next_count: int = typer.Option(1, "--next", "-n", help="Number of upcoming run times to show"),
 ):
     """List scheduled jobs."""
-    from nanobot.config.loader import get_data_dir
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     
     store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = CronService(store_path, config=load_config().cron)
     
     jobs = service.list_jobs(include_disabled=all)
     
@@ -501,23 +579,25 @@ def cron_list(
     table.add_column("Name")
     table.add_column("Schedule")
     table.add_column("Status")
-    table.add_column("Next Run")
+    table.add_column("Next Run" if next_count <= 1 else f"Next {next_count} Runs")
     
-    import time
     for job in jobs:
         # Format schedule
         if job.schedule.kind == "every":
             sched = f"every {(job.schedule.every_ms or 0) // 1000}s"
         elif job.schedule.kind == "cron":
             sched = job.schedule.expr or ""
+            if job.schedule.tz:
+                sched += f" ({job.schedule.tz})"
         else:
             sched = "one-time"
         
-        # Format next run
-        next_run = ""
-        if job.state.next_run_at_ms:
-            next_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(job.state.next_run_at_ms / 1000))
-            next_run = next_time
+        # Format upcoming runs, in the job's timezone if it has one
+        zone = ZoneInfo(job.schedule.tz) if job.schedule.tz else None
+        next_run = "\n".join(
+            datetime.fromtimestamp(ms / 1000, zone).strftime("%Y-%m-%d %H:%M")
+            for ms in service.next_runs(job, next_count)
+        )
         
         status = "[green]enabled[/green]" if job.enabled else "[dim]disabled[/dim]"
         
@@ -532,13 +612,18 @@ def cron_add(
     message: str = typer.Option(..., "--message", "-m", help="Message for agent"),
     every: int = typer.Option(None, "--every", "-e", help="Run every N seconds"),
     cron_expr: str = typer.Option(None, "--cron", "-c", help="Cron expression (e.g. '0 9 * * *')"),
+    tz: str = typer.Option(None, "--tz", help="Timezone for --cron (e.g. 'Europe/Berlin'; default UTC)"),
     at: str = typer.Option(None, "--at", help="Run once at time (ISO format)"),
     deliver: bool = typer.Option(False, "--deliver", "-d", help="Deliver response to channel"),
     to: str = typer.Option(None, "--to", help="Recipient for delivery"),
     channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
+    timeout: float = typer.Option(None, "--timeout", help="Per-run timeout in seconds (default: cron.timeoutS)"),
+    overlap: str = typer.Option(None, "--overlap", help="If still running when due again: skip, queue or allow"),
+    session: str = typer.Option(None, "--session", help="History across runs: persistent, capped or ephemeral"),
+    history: int = typer.Option(None, "--history", help="Messages kept by a capped session"),
 ):
     """Add a scheduled job."""
-    from nanobot.config.loader import get_data_dir
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronSchedule
     
@@ -546,7 +631,7 @@ def cron_add(
     if every:
         schedule = CronSchedule(kind="every", every_ms=every * 1000)
     elif cron_expr:
-        schedule = CronSchedule(kind="cron", expr=cron_expr)
+        schedule = CronSchedule(kind="cron", expr=cron_expr, tz=tz)
     elif at:
         import datetime
         dt = datetime.datetime.fromisoformat(at)
@@ -555,17 +640,32 @@ def cron_add(
         console.print("[red]Error: Must specify --every, --cron, or --at[/red]")
         raise typer.Exit(1)
     
+    if overlap not in (None, "skip", "queue", "allow"):
+        console.print("[red]Error: --overlap must be skip, queue or allow[/red]")
+        raise typer.Exit(1)
+    if session not in (None, "persistent", "capped", "ephemeral"):
+        console.print("[red]Error: --session must be persistent, capped or ephemeral[/red]")
+        raise typer.Exit(1)
+    
     store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = CronService(store_path, config=load_config().cron)
     
-    job = service.add_job(
-        name=name,
-        schedule=schedule,
-        message=message,
-        deliver=deliver,
-        to=to,
-        channel=channel,
-    )
+    try:
+        job = service.add_job(
+            name=name,
+            schedule=schedule,
+            message=message,
+            deliver=deliver,
+            to=to,
+            channel=channel,
+            timeout_s=timeout,
+            overlap=overlap,
+            session_mode=session,
+            history_messages=history,
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
     
     console.print(f"[green]✓[/green] Added job '{job.name}' ({job.id})")
 
@@ -628,6 +728,136 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Usage Commands
+# ============================================================================
+
+
+def _print_usage_overview(usage) -> None:
+    """Print a one-line token/cost overview plus per-model latency."""
+    rows = usage.summary("model", days=1)
+    if not rows:
+        return
+    tokens = sum(r["total_tokens"] for r in rows)
+    cost = sum(r["cost_usd"] for r in rows)
+    console.print(f"[green]✓[/green] Usage today: {tokens:,} tokens, ${cost:.4f}")
+    for model, lat in usage.latency_percentiles().items():
+        console.print(
+            f"  [dim]{model}: p50 {lat['p50']:.0f}ms, p90 {lat['p90']:.0f}ms, "
+            f"p99 {lat['p99']:.0f}ms[/dim]"
+        )
+
+
+@app.command()
+def usage(
+    by: str = typer.Option("model", "--by", "-b", help="Group by: model, session, channel, subagent, cron"),
+    days: int = typer.Option(7, "--days", "-d", help="Number of days to include"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum rows to show"),
+):
+    """Show token usage, cost and latency."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.tracker import DIMENSIONS, UsageTracker
+    
+    if by not in DIMENSIONS:
+        console.print(f"[red]Error: --by must be one of {', '.join(DIMENSIONS)}[/red]")
+        raise typer.Exit(1)
+    
+    tracker = UsageTracker(get_data_dir() / "usage" / "usage.json")
+    rows = tracker.summary(by, days=days)
+    
+    if not rows:
+        console.print("No usage recorded.")
+        return
+    
+    table = Table(title=f"Usage by {by} (last {days} days)")
+    table.add_column(by.capitalize(), style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt", justify="right")
+    table.add_column("Completion", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Cost", justify="right")
+    
+    for r in rows[:limit]:
+        table.add_row(
+            r["key"],
+            str(r["calls"]),
+            f"{r['prompt_tokens']:,}",
+            f"{r['completion_tokens']:,}",
+            f"{r['total_tokens']:,}",
+            f"${r['cost_usd']:.4f}",
+        )
+    
+    console.print(table)
+    
+    latency = tracker.latency_percentiles()
+    if latency:
+        lat_table = Table(title="Latency by model (ms)")
+        lat_table.add_column("Model", style="cyan")
+        lat_table.add_column("Samples", justify="right")
+        lat_table.add_column("p50", justify="right")
+        lat_table.add_column("p90", justify="right")
+        lat_table.add_column("p99", justify="right")
+        for model, lat in latency.items():
+            lat_table.add_row(
+                model,
+                str(lat["samples"]),
+                f"{lat['p50']:.0f}",
+                f"{lat['p90']:.0f}",
+                f"{lat['p99']:.0f}",
+            )
+        console.print(lat_table)
+
+
+@app.command()
+def subagents(
+    all: bool = typer.Option(False, "--all", "-a", help="Include finished tasks"),
+):
+    """Show background subagents of the running gateway."""
+    import json
+    import time
+    from nanobot.config.loader import get_data_dir
+    
+    status_path = get_data_dir() / "subagents.json"
+    tasks = []
+    if status_path.exists():
+        try:
+            tasks = json.loads(status_path.read_text()).get("tasks", [])
+        except Exception as e:
+            console.print(f"[red]Error reading subagent status: {e}[/red]")
+            raise typer.Exit(1)
+    
+    if not all:
+        tasks = [t for t in tasks if t["status"] in ("pending", "running")]
+    if not tasks:
+        console.print("No background subagents.")
+        return
+    
+    table = Table(title="Subagents")
+    table.add_column("ID", style="cyan")
+    table.add_column("Label")
+    table.add_column("Origin")
+    table.add_column("Status")
+    table.add_column("Iteration", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Tool")
+    table.add_column("Age", justify="right")
+    
+    now = time.time()
+    for t in tasks:
+        table.add_row(
+            t["id"],
+            t["label"],
+            t["origin"],
+            t["status"],
+            str(t["iteration"]),
+            f"{t['tokens']:,}",
+            t["currentTool"] or "",
+            f"{now - t['createdAt']:.0f}s",
+        )
+    
+    console.print(table)
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -636,7 +866,8 @@ def cron_run(
 @app.command()
 def status():
     """Show nanobot status."""
-    from nanobot.config.loader import load_config, get_config_path
+    from nanobot.config.loader import load_config, get_config_path, get_data_dir
+    from nanobot.usage.tracker import UsageTracker
 
     config_path = get_config_path()
     config = load_config()
@@ -663,6 +894,8 @@ def status():
         console.print(f"Gemini API: {'[green]✓[/green]' if has_gemini else '[dim]not set[/dim]'}")
         vllm_status = f"[green]✓ {config.providers.vllm.api_base}[/green]" if has_vllm else "[dim]not set[/dim]"
         console.print(f"vLLM/Local: {vllm_status}")
+        
+        _print_usage_overview(UsageTracker(get_data_dir() / "usage" / "usage.json"))
 
 
 if __name__ == "__main__":
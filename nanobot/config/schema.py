@@ -1,6 +1,7 @@
 """Configuration schema using Pydantic."""
 
 from pathlib import Path
+from typing import Literal
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -18,6 +19,7 @@ class TelegramConfig(BaseModel):
     token: str = ""  # Bot token from @BotFather
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs or usernames
     proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
+    min_send_interval_s: float = 1.0  # Spacing between messages to one chat (Telegram allows about 1/s)
 
 
 class FeishuConfig(BaseModel):
@@ -45,6 +47,8 @@ class ChannelsConfig(BaseModel):
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
     feishu: FeishuConfig = Field(default_factory=FeishuConfig)
+    send_concurrency: int = 4  # Concurrent outbound sends per channel (order is kept per chat)
+    send_queue_size: int = 100  # Outbound messages a channel holds; when full, "drop_oldest" bus overflow drops the oldest, else the newest
 
 
 class AgentDefaults(BaseModel):
@@ -56,9 +60,67 @@ class AgentDefaults(BaseModel):
     max_tool_iterations: int = 20
 
 
+class ModelRoutingConfig(BaseModel):
+    """Per-call-class model routing. Empty values fall back to agents.defaults.model."""
+    interactive: str = ""  # Live user messages
+    continuation: str = ""  # Tool-loop iterations after the first call of a turn
+    system: str = ""  # Subagent announce summaries
+    heartbeat: str = ""  # HEARTBEAT.md checks
+    cron: str = ""  # Scheduled jobs
+    subagent: str = ""  # Background subagent tasks
+    escalate_model: str = ""  # Strong model to retry with when a response is tool-heavy
+    escalate_min_tool_calls: int = 3  # Tool calls in one response that trigger escalation
+
+
+class SubagentsConfig(BaseModel):
+    """Background subagent pool configuration."""
+    max_concurrent: int = 4  # Subagents running at once across all chats
+    max_per_chat: int = 2  # Subagents running at once per originating chat
+    max_pending: int = 20  # Queued subagents before spawn is refused
+    max_iterations: int = 15  # Tool-loop iterations per subagent
+    execution: Literal["inline", "process"] = "inline"  # "process" runs each subagent in a worker process
+    process_workers: int = 2  # Worker processes for "process" execution (also caps running subagents)
+    progress: bool = False  # Send tool progress updates to the originating chat ("inline" execution only)
+    progress_interval_s: float = 5.0  # Minimum time between progress updates of one subagent
+    delivery: Literal["summarize", "direct"] = "summarize"  # "direct" sends the result without a summarizing LLM call
+
+
+class CompactionConfig(BaseModel):
+    """Session history compaction into rolling summaries."""
+    enabled: bool = True
+    threshold_tokens: int = 12000  # Compact once the unsummarized history is estimated above this
+    keep_recent: int = 10  # Messages kept verbatim after the summary
+    model: str = ""  # Summary model; empty uses the "system" routing class
+
+
+class ToolHistoryConfig(BaseModel):
+    """Keeping tool calls and results in session history."""
+    enabled: bool = False
+    inline_max_chars: int = 2000  # Larger tool outputs are stored as blobs
+    preview_chars: int = 200  # Preview kept in history for a blob
+    expand_turns: int = 2  # Recent turns whose blobs are expanded into the prompt
+
+
+class MemoryConfig(BaseModel):
+    """Memory injection into the system prompt."""
+    budget_tokens: int = 2000  # Memory over this is filtered by relevance (0 = no limit)
+    pin_marker: str = "<!-- pin -->"  # MEMORY.md sections containing this are always included
+
+
+class SkillsConfig(BaseModel):
+    """Skills listing in the system prompt."""
+    summary_top_k: int = 0  # List only the N skills most relevant to the message (0 = all)
+
+
 class AgentsConfig(BaseModel):
     """Agent configuration."""
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
+    routing: ModelRoutingConfig = Field(default_factory=ModelRoutingConfig)
+    subagents: SubagentsConfig = Field(default_factory=SubagentsConfig)
+    compaction: CompactionConfig = Field(default_factory=CompactionConfig)
+    tool_history: ToolHistoryConfig = Field(default_factory=ToolHistoryConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    skills: SkillsConfig = Field(default_factory=SkillsConfig)
 
 
 class ProviderConfig(BaseModel):
@@ -84,6 +146,40 @@ class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
     port: int = 18790
+    drain_timeout_s: float = 30.0  # Max time to finish in-flight turns and replies on shutdown
+
+
+class BusConfig(BaseModel):
+    """Message bus queue limits and overload handling."""
+    inbound_max_size: int = 1000  # 0 = unbounded
+    outbound_max_size: int = 1000  # 0 = unbounded
+    overflow_policy: Literal["block", "drop_oldest", "reject"] = "block"
+    channel_overflow: dict[str, Literal["block", "drop_oldest", "reject"]] = Field(default_factory=dict)  # Per-channel override
+    coalesce: bool = False  # Merge queued messages from the same sender in a chat into one turn (opt-in)
+    busy_message: str = "I'm busy right now, please try again in a moment."
+    starvation_s: float = 30.0  # Serve a lower-priority lane once its oldest message waited this long
+
+
+class CronConfig(BaseModel):
+    """Scheduled job execution."""
+    max_concurrent: int = 4  # Due jobs run in parallel up to this limit (1 = one at a time, in the agent's cron lane)
+    timeout_s: float = 600.0  # Default per-job timeout (0 = none)
+    overlap: Literal["skip", "queue", "allow"] = "skip"  # Default when a job comes due while its last run is still going
+    misfire: Literal["run_once", "run_all", "skip"] = "run_once"  # Runs missed while the gateway was down
+    max_catchup: int = 3  # Most missed runs made up per job with misfire "run_all"
+    jitter_s: float = 0.0  # Spread recurring jobs over this window with a fixed per-job offset
+    session_mode: Literal["persistent", "capped", "ephemeral"] = "capped"  # History kept across a job's runs
+    history_messages: int = 10  # History size for "capped" sessions
+
+
+class HeartbeatConfig(BaseModel):
+    """Periodic HEARTBEAT.md checks."""
+    enabled: bool = True
+    interval_s: int = 30 * 60
+    skip_unchanged: bool = True  # Skip ticks while HEARTBEAT.md is unchanged and the last check was OK
+    max_skip_s: int = 6 * 3600  # Run at least this often anyway (0 = only on change)
+    session_mode: Literal["persistent", "capped", "ephemeral"] = "capped"  # History kept across checks
+    history_messages: int = 6  # History size for "capped" sessions
 
 
 class WebSearchConfig(BaseModel):
@@ -115,6 +211,9 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
+    heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     
     @property
@@ -1,107 +1,263 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
+import heapq
 import json
 import time
 import uuid
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from zoneinfo import ZoneInfo
+from typing import IO, Any, Callable, Coroutine, TYPE_CHECKING
 
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
 
+if TYPE_CHECKING:
+    from croniter import croniter
+    
+    from nanobot.config.schema import CronConfig
+
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
-    """Compute next run time in ms."""
+@lru_cache(maxsize=1024)
+def _cron_iter(expr: str, tz: str | None) -> "croniter":
+    """
+    Parse a cron expression for a timezone (UTC if none).
+    
+    Parsing dominates the cost of croniter, so parsed expressions are
+    cached. The key is the expression and timezone, so editing either gets
+    a fresh entry. Callers re-position the iterator with set_current().
+    """
+    from croniter import croniter
+    return croniter(expr, datetime.now(ZoneInfo(tz) if tz else timezone.utc))
+
+
+def _next_runs(
+    schedule: CronSchedule,
+    now_ms: int,
+    count: int = 1,
+    anchor_ms: int | None = None,
+    offset_ms: int = 0,
+) -> list[int]:
+    """
+    Compute the next run times after now_ms, in ms.
+    
+    Args:
+        schedule: The schedule.
+        now_ms: Reference time; all results are strictly later.
+        count: Number of run times to compute.
+        anchor_ms: Start of the interval grid for "every" schedules (runs
+            fall on anchor + k * every, k >= 1). Defaults to now_ms.
+        offset_ms: Fixed jitter added to every run of recurring schedules.
+    """
     if schedule.kind == "at":
-        return schedule.at_ms if schedule.at_ms and schedule.at_ms > now_ms else None
+        return [schedule.at_ms] if schedule.at_ms and schedule.at_ms > now_ms else []
+    
+    # Jitter shifts the whole sequence, so find the unshifted runs after now - offset
+    base_ms = now_ms - offset_ms
     
     if schedule.kind == "every":
         if not schedule.every_ms or schedule.every_ms <= 0:
-            return None
-        # Next interval from now
-        return now_ms + schedule.every_ms
+            return []
+        anchor = anchor_ms if anchor_ms is not None else base_ms
+        k = max(1, (base_ms - anchor) // schedule.every_ms + 1)
+        first = anchor + k * schedule.every_ms + offset_ms
+        return [first + i * schedule.every_ms for i in range(count)]
     
     if schedule.kind == "cron" and schedule.expr:
         try:
-            from croniter import croniter
-            cron = croniter(schedule.expr, time.time())
-            next_time = cron.get_next()
-            return int(next_time * 1000)
+            cron = _cron_iter(schedule.expr, schedule.tz)
+            cron.set_current(base_ms / 1000, force=True)
+            return [int(cron.get_next() * 1000) + offset_ms for _ in range(count)]
         except Exception:
-            return None
+            return []
     
-    return None
+    return []
+
+
+def _compute_next_run(
+    schedule: CronSchedule,
+    now_ms: int,
+    anchor_ms: int | None = None,
+    offset_ms: int = 0,
+) -> int | None:
+    """Compute the first run time after now_ms, in ms (see _next_runs)."""
+    runs = _next_runs(schedule, now_ms, 1, anchor_ms, offset_ms)
+    return runs[0] if runs else None
+
+
+def _job_from_dict(j: dict[str, Any]) -> CronJob:
+    """Build a job from its stored form."""
+    return CronJob(
+        id=j["id"],
+        name=j["name"],
+        enabled=j.get("enabled", True),
+        schedule=CronSchedule(
+            kind=j["schedule"]["kind"],
+            at_ms=j["schedule"].get("atMs"),
+            every_ms=j["schedule"].get("everyMs"),
+            expr=j["schedule"].get("expr"),
+            tz=j["schedule"].get("tz"),
+        ),
+        payload=CronPayload(
+            kind=j["payload"].get("kind", "agent_turn"),
+            message=j["payload"].get("message", ""),
+            deliver=j["payload"].get("deliver", False),
+            channel=j["payload"].get("channel"),
+            to=j["payload"].get("to"),
+        ),
+        state=CronJobState(
+            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
+            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
+            last_status=j.get("state", {}).get("lastStatus"),
+            last_error=j.get("state", {}).get("lastError"),
+        ),
+        created_at_ms=j.get("createdAtMs", 0),
+        updated_at_ms=j.get("updatedAtMs", 0),
+        delete_after_run=j.get("deleteAfterRun", False),
+        timeout_s=j.get("timeoutS"),
+        overlap=j.get("overlap"),
+        session_mode=j.get("sessionMode"),
+        history_messages=j.get("historyMessages"),
+    )
+
+
+def _job_to_dict(j: CronJob) -> dict[str, Any]:
+    """Get the stored form of a job."""
+    return {
+        "id": j.id,
+        "name": j.name,
+        "enabled": j.enabled,
+        "schedule": {
+            "kind": j.schedule.kind,
+            "atMs": j.schedule.at_ms,
+            "everyMs": j.schedule.every_ms,
+            "expr": j.schedule.expr,
+            "tz": j.schedule.tz,
+        },
+        "payload": {
+            "kind": j.payload.kind,
+            "message": j.payload.message,
+            "deliver": j.payload.deliver,
+            "channel": j.payload.channel,
+            "to": j.payload.to,
+        },
+        "state": {
+            "nextRunAtMs": j.state.next_run_at_ms,
+            "lastRunAtMs": j.state.last_run_at_ms,
+            "lastStatus": j.state.last_status,
+            "lastError": j.state.last_error,
+        },
+        "createdAtMs": j.created_at_ms,
+        "updatedAtMs": j.updated_at_ms,
+        "deleteAfterRun": j.delete_after_run,
+        "timeoutS": j.timeout_s,
+        "overlap": j.overlap,
+        "sessionMode": j.session_mode,
+        "historyMessages": j.history_messages,
+    }
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+    
+    Jobs are kept in a dict by ID, and a min-heap of (next run, job ID)
+    entries gives the next wake-up in O(log n). Heap entries are not removed
+    when a job changes; stale ones are dropped when they reach the top.
+    
+    Persistence is incremental: every change appends one line to a journal
+    next to the store file, and the store file itself is a snapshot that is
+    rewritten only once the journal has grown as long as the job list.
+    Loading reads the snapshot and replays the journal over it.
+    
+    Due jobs run as background tasks, at most `max_concurrent` at a time,
+    each bounded by its timeout. A job that comes due while its previous run
+    is still going is skipped (recorded as "skipped"), queued to run once
+    more afterwards, or started anyway, depending on its overlap policy.
+    
+    Interval jobs run on a grid anchored at their creation time, so they do
+    not drift by the time each run takes. Runs missed while the service was
+    down are handled by the misfire policy on start, and an optional jitter
+    window gives each recurring job a fixed offset so jobs scheduled for the
+    same minute do not all fire at once.
+    """
+    
+    # Journals shorter than this are never compacted into the snapshot
+    SNAPSHOT_MIN_ENTRIES = 1000
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        config: "CronConfig | None" = None,
     ):
+        from nanobot.config.schema import CronConfig
         self.store_path = store_path
+        self.journal_path = store_path.with_name(store_path.name + ".journal")
         self.on_job = on_job  # Callback to execute job, returns response text
+        # on_job applies timeout_for(job) itself, e.g. counting from when a
+        # queued turn starts rather than from when it was queued
+        self.on_job_times_out = False
         self._store: CronStore | None = None
+        self._heap: list[tuple[int, str]] = []  # (next_run_at_ms, job_id)
+        self._in_heap: dict[str, int] = {}  # job_id -> run time it already has a heap entry for
+        self._journal_file: IO[str] | None = None
+        self._journal_entries = 0
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self.config = config or CronConfig()
+        self._slots = asyncio.Semaphore(max(1, self.config.max_concurrent))
+        self._active: dict[str, set[asyncio.Task]] = {}  # job_id -> in-flight runs
+        self._queued: set[str] = set()  # Jobs to run again once their current run finishes
+        self._catch_up: dict[str, int] = {}  # job_id -> missed runs still to make up
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
+        """Load jobs from the snapshot and replay the journal."""
         if self._store:
             return self._store
         
+        jobs: dict[str, CronJob] = {}
         if self.store_path.exists():
             try:
                 data = json.loads(self.store_path.read_text())
-                jobs = []
                 for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
+                    jobs[j["id"]] = _job_from_dict(j)
             except Exception as e:
                 logger.warning(f"Failed to load cron store: {e}")
-                self._store = CronStore()
-        else:
-            self._store = CronStore()
+                jobs = {}
+        
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        if entry["op"] == "put":
+                            job = _job_from_dict(entry["job"])
+                            jobs[job.id] = job
+                        elif entry["op"] == "del":
+                            jobs.pop(entry["id"], None)
+                    except Exception as e:
+                        # A crash mid-append can leave a truncated last line
+                        logger.warning(f"Skipping bad cron journal entry: {e}")
+                    self._journal_entries += 1
         
+        self._store = CronStore(jobs=jobs)
+        self._rebuild_heap()
         return self._store
     
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Write a full snapshot of the jobs and truncate the journal."""
         if not self._store:
             return
         
@@ -109,49 +265,85 @@ class CronService:
         
         data = {
             "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
+            "jobs": [_job_to_dict(j) for j in self._store.jobs.values()],
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        # Replace atomically; if we crash before truncating the journal, its
+        # entries are replayed over the new snapshot, which is harmless
+        tmp = self.store_path.with_name(self.store_path.name + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        tmp.replace(self.store_path)
+        
+        self._close_journal()
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+    
+    def _append_journal(self, entry: dict[str, Any]) -> None:
+        """Persist one change, compacting into a snapshot when the journal is long."""
+        if self._journal_entries >= max(self.SNAPSHOT_MIN_ENTRIES, len(self._store.jobs)):
+            self._save_store()
+            return
+        
+        if self._journal_file is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+        self._journal_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._journal_file.flush()
+        self._journal_entries += 1
+    
+    def _close_journal(self) -> None:
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+    
+    def _persist_job(self, job: CronJob) -> None:
+        """Journal a job's current state and queue its next run."""
+        self._append_journal({"op": "put", "job": _job_to_dict(job)})
+        self._push(job)
+    
+    def _persist_delete(self, job_id: str) -> None:
+        """Journal the removal of a job."""
+        self._append_journal({"op": "del", "id": job_id})
+    
+    def _push(self, job: CronJob) -> None:
+        """Add a heap entry for a job's next run, unless it already has one."""
+        run_at = job.state.next_run_at_ms
+        if not (job.enabled and run_at) or self._in_heap.get(job.id) == run_at:
+            return
+        heapq.heappush(self._heap, (run_at, job.id))
+        self._in_heap[job.id] = run_at
+        # Too many stale entries: rebuild rather than let the heap grow
+        if len(self._heap) > 2 * len(self._store.jobs) + 64:
+            self._rebuild_heap()
+    
+    def _pop(self) -> tuple[int, str]:
+        """Remove and return the earliest heap entry."""
+        entry = heapq.heappop(self._heap)
+        if self._in_heap.get(entry[1]) == entry[0]:
+            del self._in_heap[entry[1]]
+        return entry
+    
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (j.state.next_run_at_ms, j.id) for j in self._store.jobs.values()
+            if j.enabled and j.state.next_run_at_ms
+        ]
+        heapq.heapify(self._heap)
+        self._in_heap = {job_id: run_at for run_at, job_id in self._heap}
+    
+    def _is_current(self, entry: tuple[int, str]) -> bool:
+        """Check that a heap entry still matches its job."""
+        job = self._store.jobs.get(entry[1])
+        return bool(job and job.enabled and job.state.next_run_at_ms == entry[0])
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
         self._load_store()
-        self._recompute_next_runs()
+        self._catch_up_missed()
         self._save_store()
         self._arm_timer()
-        logger.info(f"Cron service started with {len(self._store.jobs if self._store else [])} jobs")
+        logger.info(f"Cron service started with {len(self._store.jobs)} jobs")
     
     def stop(self) -> None:
         """Stop the cron service."""
@@ -159,23 +351,72 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for runs in self._active.values():
+            for task in runs:
+                task.cancel()
+        self._queued.clear()
+        self._catch_up.clear()
+        self._close_journal()
+    
+    def _jitter_ms(self, job: CronJob) -> int:
+        """Get a job's fixed jitter offset."""
+        jitter_ms = int(self.config.jitter_s * 1000)
+        if jitter_ms <= 0 or job.schedule.kind == "at":
+            return 0
+        # Stable per job, so its runs stay evenly spaced
+        return zlib.crc32(job.id.encode()) % (jitter_ms + 1)
     
-    def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
+    def _next_run(self, job: CronJob, now_ms: int) -> int | None:
+        """Compute a job's next run on its anchored, jittered schedule."""
+        return _compute_next_run(job.schedule, now_ms, job.created_at_ms or None, self._jitter_ms(job))
+    
+    def _catch_up_missed(self) -> None:
+        """
+        Recompute next runs after a restart, applying the misfire policy.
+        
+        A job whose stored next run is in the past missed runs while the
+        service was down. With "skip" it just moves on to its next run; with
+        "run_once" it runs once now; with "run_all" it runs once per missed
+        run, up to `max_catchup` times.
+        """
         if not self._store:
             return
         now = _now_ms()
-        for job in self._store.jobs:
-            if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+        policy = self.config.misfire
+        limit = 1 if policy == "run_once" else max(1, self.config.max_catchup)
+        
+        for job in self._store.jobs.values():
+            if not job.enabled:
+                continue
+            due = job.state.next_run_at_ms
+            job.state.next_run_at_ms = self._next_run(job, now)
+            if not due or due > now:
+                continue
+            
+            missed = 0
+            while due is not None and due <= now and missed < limit:
+                missed += 1
+                due = self._next_run(job, due)
+            
+            if policy == "skip":
+                logger.info(f"Cron: job '{job.name}' missed {missed} run(s) while down, skipped")
+                if job.schedule.kind == "at":
+                    job.enabled = False
+                continue
+            # Due now; runs beyond the first follow back-to-back
+            logger.info(f"Cron: job '{job.name}' missed {missed} run(s) while down, catching up")
+            job.state.next_run_at_ms = now
+            if missed > 1:
+                self._catch_up[job.id] = missed - 1
+        self._rebuild_heap()
     
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
         if not self._store:
             return None
-        times = [j.state.next_run_at_ms for j in self._store.jobs 
-                 if j.enabled and j.state.next_run_at_ms]
-        return min(times) if times else None
+        while self._heap and not self._is_current(self._heap[0]):
+            self._pop()
+        return self._heap[0][0] if self._heap else None
     
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
@@ -197,36 +438,98 @@ class CronService:
         self._timer_task = asyncio.create_task(tick())
     
     async def _on_timer(self) -> None:
-        """Handle timer tick - run due jobs."""
+        """Handle timer tick - dispatch due jobs."""
         if not self._store:
             return
         
         now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
+        due_jobs: dict[str, CronJob] = {}  # Each job at most once per tick
+        while self._heap and self._heap[0][0] <= now:
+            entry = self._pop()
+            if self._is_current(entry):
+                due_jobs[entry[1]] = self._store.jobs[entry[1]]
         
-        for job in due_jobs:
-            await self._execute_job(job)
+        for job in due_jobs.values():
+            self._dispatch(job)
         
-        self._save_store()
         self._arm_timer()
     
+    def _dispatch(self, job: CronJob) -> None:
+        """Start a due job in the background, applying its overlap policy."""
+        # Advance the schedule first, so the next run is armed independently
+        # of how long this one takes
+        self._advance(job)
+        
+        overlap = job.overlap or self.config.overlap
+        if self._active.get(job.id) and overlap != "allow":
+            if overlap == "queue":
+                self._queued.add(job.id)
+                logger.info(f"Cron: job '{job.name}' still running, queued another run")
+            else:
+                job.state.last_status = "skipped"
+                job.state.last_error = "previous run still in progress"
+                logger.info(f"Cron: job '{job.name}' still running, skipped")
+            job.updated_at_ms = _now_ms()
+            self._persist_job(job)
+            return
+        
+        self._start(job)
+    
+    def _start(self, job: CronJob) -> None:
+        task = asyncio.create_task(self._run_limited(job))
+        self._active.setdefault(job.id, set()).add(task)
+        task.add_done_callback(lambda t: self._on_job_done(job, t))
+    
+    async def _run_limited(self, job: CronJob) -> None:
+        async with self._slots:
+            await self._execute_job(job)
+    
+    def _on_job_done(self, job: CronJob, task: asyncio.Task) -> None:
+        """Forget a finished run, and start the queued one if there is one."""
+        runs = self._active.get(job.id)
+        if runs is not None:
+            runs.discard(task)
+            if not runs:
+                del self._active[job.id]
+        if job.id in self._active or not (self._running and self._store.jobs.get(job.id) is job):
+            return
+        if self._catch_up.get(job.id):
+            self._catch_up[job.id] -= 1
+            self._start(job)
+        elif job.id in self._queued:
+            self._queued.discard(job.id)
+            self._start(job)
+    
+    def _advance(self, job: CronJob) -> None:
+        """Move a job's schedule past the run that is starting now."""
+        if job.schedule.kind == "at":
+            job.enabled = False
+            job.state.next_run_at_ms = None
+        else:
+            job.state.next_run_at_ms = self._next_run(job, _now_ms())
+        self._persist_job(job)
+    
     async def _execute_job(self, job: CronJob) -> None:
-        """Execute a single job."""
+        """Execute a single job and record the outcome."""
         start_ms = _now_ms()
+        timeout = self.timeout_for(job)
         logger.info(f"Cron: executing job '{job.name}' ({job.id})")
         
         try:
             response = None
-            if self.on_job:
+            if self.on_job and self.on_job_times_out:
                 response = await self.on_job(job)
+            elif self.on_job:
+                response = await asyncio.wait_for(self.on_job(job), timeout)
             
             job.state.last_status = "ok"
             job.state.last_error = None
             logger.info(f"Cron: job '{job.name}' completed")
             
+        except asyncio.TimeoutError:
+            job.state.last_status = "error"
+            job.state.last_error = f"timed out after {timeout:g}s" if timeout else "timed out"
+            logger.error(f"Cron: job '{job.name}' {job.state.last_error}")
         except Exception as e:
             job.state.last_status = "error"
             job.state.last_error = str(e)
@@ -235,25 +538,40 @@ class CronService:
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
         
-        # Handle one-shot jobs
-        if job.schedule.kind == "at":
-            if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
+        # The job may have been removed while it ran
+        if self._store.jobs.get(job.id) is not job:
+            return
+        if job.schedule.kind == "at" and job.delete_after_run:
+            self._store.jobs.pop(job.id)
+            self._persist_delete(job.id)
         else:
-            # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            self._persist_job(job)
     
     # ========== Public API ==========
     
+    def timeout_for(self, job: CronJob) -> float | None:
+        """Get how long a run of the job may take (None = no limit)."""
+        timeout = job.timeout_s if job.timeout_s is not None else self.config.timeout_s
+        return timeout or None
+    
     def list_jobs(self, include_disabled: bool = False) -> list[CronJob]:
         """List all jobs."""
         store = self._load_store()
-        jobs = store.jobs if include_disabled else [j for j in store.jobs if j.enabled]
+        jobs = [j for j in store.jobs.values() if include_disabled or j.enabled]
         return sorted(jobs, key=lambda j: j.state.next_run_at_ms or float('inf'))
     
+    def get_job(self, job_id: str) -> CronJob | None:
+        """Get a job by ID."""
+        return self._load_store().jobs.get(job_id)
+    
+    def next_runs(self, job: CronJob, count: int = 5) -> list[int]:
+        """Preview a job's next run times (ms), starting with its scheduled next run."""
+        if not job.enabled or not job.state.next_run_at_ms or count < 1:
+            return []
+        first = job.state.next_run_at_ms
+        rest = _next_runs(job.schedule, first, count - 1, job.created_at_ms or None, self._jitter_ms(job))
+        return [first] + rest
+    
     def add_job(
         self,
         name: str,
@@ -263,13 +581,32 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        timeout_s: float | None = None,
+        overlap: str | None = None,
+        session_mode: str | None = None,
+        history_messages: int | None = None,
     ) -> CronJob:
-        """Add a new job."""
+        """
+        Add a new job.
+        
+        Raises:
+            ValueError: If the cron expression or timezone is invalid.
+        """
+        if schedule.kind == "cron":
+            try:
+                _cron_iter(schedule.expr or "", schedule.tz)
+            except Exception as e:
+                raise ValueError(f"Invalid cron schedule: {e}") from e
+        
         store = self._load_store()
         now = _now_ms()
         
+        job_id = str(uuid.uuid4())[:8]
+        while job_id in store.jobs:
+            job_id = str(uuid.uuid4())[:8]
+        
         job = CronJob(
-            id=str(uuid.uuid4())[:8],
+            id=job_id,
             name=name,
             enabled=True,
             schedule=schedule,
@@ -280,14 +617,18 @@ class CronService:
                 channel=channel,
                 to=to,
             ),
-            state=CronJobState(next_run_at_ms=_compute_next_run(schedule, now)),
             created_at_ms=now,
             updated_at_ms=now,
             delete_after_run=delete_after_run,
+            timeout_s=timeout_s,
+            overlap=overlap,
+            session_mode=session_mode,
+            history_messages=history_messages,
         )
+        job.state.next_run_at_ms = self._next_run(job, now)
         
-        store.jobs.append(job)
-        self._save_store()
+        store.jobs[job.id] = job
+        self._persist_job(job)
         self._arm_timer()
         
         logger.info(f"Cron: added job '{name}' ({job.id})")
@@ -296,12 +637,10 @@ class CronService:
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
         store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        removed = store.jobs.pop(job_id, None) is not None
         
         if removed:
-            self._save_store()
+            self._persist_delete(job_id)
             self._arm_timer()
             logger.info(f"Cron: removed job {job_id}")
         
@@ -310,31 +649,29 @@ class CronService:
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
         store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        job = store.jobs.get(job_id)
+        if not job:
+            return None
+        job.enabled = enabled
+        job.updated_at_ms = _now_ms()
+        if enabled:
+            job.state.next_run_at_ms = self._next_run(job, _now_ms())
+        else:
+            job.state.next_run_at_ms = None
+        self._persist_job(job)
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
         store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        job = store.jobs.get(job_id)
+        if not job or (not force and not job.enabled):
+            return False
+        self._advance(job)
+        await self._execute_job(job)
+        self._arm_timer()
+        return True
     
     def status(self) -> dict:
         """Get service status."""
@@ -343,4 +680,5 @@ class CronService:
             "enabled": self._running,
             "jobs": len(store.jobs),
             "next_wake_at_ms": self._get_next_wake_ms(),
+            "running": sum(len(runs) for runs in self._active.values()),
         }
@@ -50,10 +50,15 @@ class CronJob:
     created_at_ms: int = 0
     updated_at_ms: int = 0
     delete_after_run: bool = False
+    # Per-job overrides of the service defaults (None = use the default)
+    timeout_s: float | None = None
+    overlap: Literal["skip", "queue", "allow"] | None = None
+    session_mode: Literal["persistent", "capped", "ephemeral"] | None = None
+    history_messages: int | None = None
 
 
 @dataclass
 class CronStore:
     """Persistent store for cron jobs."""
     version: int = 1
-    jobs: list[CronJob] = field(default_factory=list)
+    jobs: dict[str, CronJob] = field(default_factory=dict)  # id -> job
@@ -1,11 +1,22 @@
 """Heartbeat service - periodic agent wake-up to check for tasks."""
 
 import asyncio
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, TYPE_CHECKING
 
 from loguru import logger
 
+from nanobot.cron.service import _compute_next_run, _cron_iter
+from nanobot.cron.types import CronSchedule
+
+if TYPE_CHECKING:
+    from nanobot.usage.tracker import UsageTracker
+
 # Default interval: 30 minutes
 DEFAULT_HEARTBEAT_INTERVAL_S = 30 * 60
 
@@ -17,6 +28,16 @@ If nothing needs attention, reply with just: HEARTBEAT_OK"""
 # Token that indicates "nothing to do"
 HEARTBEAT_OK_TOKEN = "HEARTBEAT_OK"
 
+# Per-task schedule marker, e.g. "- Check backups <!-- every: 6h -->" or "<!-- cron: 0 9 * * 1 -->"
+_SCHEDULE_RE = re.compile(r"<!--\s*(every|cron):\s*(.+?)\s*-->")
+_EVERY_RE = re.compile(r"^(\d+)\s*([smhd])$")
+_LIST_ITEM_RE = re.compile(r"^[-*]\s+(\[[ xX]\]\s+)?")
+_UNIT_MS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
 
 def _is_heartbeat_empty(content: str | None) -> bool:
     """Check if HEARTBEAT.md has no actionable content."""
@@ -35,12 +56,60 @@ def _is_heartbeat_empty(content: str | None) -> bool:
     return True
 
 
+@dataclass
+class ScheduledTask:
+    """A HEARTBEAT.md line carrying its own schedule."""
+    key: str  # Hash of the task text, to track its runs across edits elsewhere in the file
+    text: str
+    schedule: CronSchedule
+
+
+def _parse_scheduled_tasks(content: str) -> list[ScheduledTask]:
+    """Find the task lines of HEARTBEAT.md that have a schedule marker."""
+    tasks = []
+    for line in content.split("\n"):
+        match = _SCHEDULE_RE.search(line)
+        if not match or line.strip().startswith("<!--"):
+            continue
+        kind, value = match.groups()
+        if kind == "every":
+            every = _EVERY_RE.match(value.lower())
+            if not every:
+                logger.warning(f"Heartbeat: bad interval '{value}' in: {line.strip()}")
+                continue
+            schedule = CronSchedule(kind="every", every_ms=int(every.group(1)) * _UNIT_MS[every.group(2)])
+        else:
+            try:
+                _cron_iter(value, None)
+            except Exception:
+                logger.warning(f"Heartbeat: bad cron expression '{value}' in: {line.strip()}")
+                continue
+            schedule = CronSchedule(kind="cron", expr=value)
+        text = _LIST_ITEM_RE.sub("", _SCHEDULE_RE.sub("", line).strip())
+        key = hashlib.sha256(text.encode()).hexdigest()[:16]
+        tasks.append(ScheduledTask(key=key, text=text, schedule=schedule))
+    return tasks
+
+
 class HeartbeatService:
     """
     Periodic heartbeat service that wakes the agent to check for tasks.
     
     The agent reads HEARTBEAT.md from the workspace and executes any
     tasks listed there. If nothing needs attention, it replies HEARTBEAT_OK.
+    
+    Most ticks need no LLM call: the file is stat'ed each tick and only
+    re-read and hashed when its mtime or size changed. With `skip_unchanged`,
+    a tick is skipped when the content hash is the same as on the last run
+    and that run ended in HEARTBEAT_OK, unless a scheduled task is due or
+    `max_skip_s` has passed since the last run.
+    
+    Task lines can carry their own schedule (`<!-- every: 6h -->` or
+    `<!-- cron: 0 9 * * 1 -->`). Such tasks only count as due once their
+    schedule comes around, and the prompt tells the agent which ones are due.
+    
+    Outcomes, per-task runs and tick costs are kept in a small JSON state
+    file so they survive restarts.
     """
     
     def __init__(
@@ -49,26 +118,113 @@ class HeartbeatService:
         on_heartbeat: Callable[[str], Coroutine[Any, Any, str]] | None = None,
         interval_s: int = DEFAULT_HEARTBEAT_INTERVAL_S,
         enabled: bool = True,
+        skip_unchanged: bool = True,
+        max_skip_s: int = 0,
+        state_path: Path | None = None,
+        usage: "UsageTracker | None" = None,
+        session_key: str = "heartbeat",
     ):
         self.workspace = workspace
         self.on_heartbeat = on_heartbeat
         self.interval_s = interval_s
         self.enabled = enabled
+        self.skip_unchanged = skip_unchanged
+        self.max_skip_s = max_skip_s
+        self.state_path = state_path
+        self.usage = usage
+        self.session_key = session_key  # Session the heartbeat turn runs in, for cost accounting
         self._running = False
         self._task: asyncio.Task | None = None
+        self._file_sig: tuple[int, int] | None = None  # (mtime_ns, size) of the last read
+        self._content: str | None = None
+        self._hash: str | None = None
+        self._scheduled: list[ScheduledTask] = []
+        self.state: dict[str, Any] = self._load_state()
     
     @property
     def heartbeat_file(self) -> Path:
         return self.workspace / "HEARTBEAT.md"
     
     def _read_heartbeat_file(self) -> str | None:
-        """Read HEARTBEAT.md content."""
-        if self.heartbeat_file.exists():
+        """Read HEARTBEAT.md content, re-reading only when its mtime or size changed."""
+        try:
+            st = self.heartbeat_file.stat()
+        except OSError:
+            self._file_sig = self._content = self._hash = None
+            self._scheduled = []
+            return None
+        
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig != self._file_sig:
             try:
-                return self.heartbeat_file.read_text()
+                self._content = self.heartbeat_file.read_text()
             except Exception:
                 return None
-        return None
+            self._file_sig = sig
+            self._hash = hashlib.sha256(self._content.encode()).hexdigest()
+            self._scheduled = _parse_scheduled_tasks(self._content)
+        return self._content
+    
+    def _load_state(self) -> dict[str, Any]:
+        state: dict[str, Any] = {}
+        if self.state_path and self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text())
+            except Exception as e:
+                logger.warning(f"Failed to load heartbeat state: {e}")
+        state.setdefault("tasks", {})
+        state.setdefault("stats", {"ticks": 0, "runs": 0, "skipped": 0, "tokens": 0, "costUsd": 0.0})
+        return state
+    
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.state_path.write_text(json.dumps(self.state, indent=2))
+        except Exception as e:
+            logger.warning(f"Failed to save heartbeat state: {e}")
+    
+    def _due_tasks(self, now_ms: int) -> list[ScheduledTask]:
+        """Get the scheduled tasks whose next run has come."""
+        runs = self.state["tasks"]
+        due = []
+        for task in self._scheduled:
+            # A new task counts from when it was first seen
+            last = runs.setdefault(task.key, now_ms)
+            next_run = _compute_next_run(task.schedule, last, anchor_ms=last)
+            if next_run is not None and next_run <= now_ms:
+                due.append(task)
+        # Forget tasks that were removed from the file
+        keys = {t.key for t in self._scheduled}
+        for key in [k for k in runs if k not in keys]:
+            del runs[key]
+        return due
+    
+    def _skip_reason(self, now_ms: int, due: list[ScheduledTask]) -> str | None:
+        """Decide whether a tick can be skipped; returns why, or None to run."""
+        if not self.skip_unchanged or due:
+            return None
+        if self._hash != self.state.get("hash") or self.state.get("lastOutcome") != "ok":
+            return None
+        last_run = self.state.get("lastRunAtMs") or 0
+        if self.max_skip_s and now_ms - last_run >= self.max_skip_s * 1000:
+            return None
+        return "unchanged since last OK"
+    
+    def _build_prompt(self, due: list[ScheduledTask]) -> str:
+        if not self._scheduled:
+            return HEARTBEAT_PROMPT
+        if not due:
+            return HEARTBEAT_PROMPT + (
+                "\n\nNo scheduled tasks (marked <!-- every: ... --> or <!-- cron: ... -->) are due; "
+                "skip them."
+            )
+        lines = "\n".join(f"- {t.text}" for t in due)
+        return HEARTBEAT_PROMPT + (
+            f"\n\nScheduled tasks due now:\n{lines}\n"
+            "Other scheduled tasks (marked <!-- every: ... --> or <!-- cron: ... -->) are not due yet; skip them."
+        )
     
     async def start(self) -> None:
         """Start the heartbeat service."""
@@ -101,30 +257,80 @@ class HeartbeatService:
     
     async def _tick(self) -> None:
         """Execute a single heartbeat tick."""
+        now = _now_ms()
         content = self._read_heartbeat_file()
+        self.state["stats"]["ticks"] += 1
         
         # Skip if HEARTBEAT.md is empty or doesn't exist
         if _is_heartbeat_empty(content):
             logger.debug("Heartbeat: no tasks (HEARTBEAT.md empty)")
+            self._record_skip(now, "empty")
+            return
+        
+        due = self._due_tasks(now)
+        reason = self._skip_reason(now, due)
+        if reason:
+            logger.debug(f"Heartbeat: skipped ({reason})")
+            self._record_skip(now, reason)
             return
         
         logger.info("Heartbeat: checking for tasks...")
+        await self._run(self._build_prompt(due), due)
+    
+    async def _run(self, prompt: str, due: list[ScheduledTask]) -> str | None:
+        """Run a heartbeat turn and record its outcome and cost."""
+        if not self.on_heartbeat:
+            return None
         
-        if self.on_heartbeat:
-            try:
-                response = await self.on_heartbeat(HEARTBEAT_PROMPT)
-                
-                # Check if agent said "nothing to do"
-                if HEARTBEAT_OK_TOKEN.replace("_", "") in response.upper().replace("_", ""):
-                    logger.info("Heartbeat: OK (no action needed)")
-                else:
-                    logger.info(f"Heartbeat: completed task")
-                    
-            except Exception as e:
-                logger.error(f"Heartbeat execution failed: {e}")
+        start = _now_ms()
+        before = self.usage.totals("session", self.session_key) if self.usage else (0, 0.0)
+        response = None
+        try:
+            response = await self.on_heartbeat(prompt)
+            # Check if agent said "nothing to do"
+            if HEARTBEAT_OK_TOKEN.replace("_", "") in (response or "").upper().replace("_", ""):
+                outcome = "ok"
+            else:
+                outcome = "acted"
+        except Exception as e:
+            logger.error(f"Heartbeat execution failed: {e}")
+            outcome = "error"
+        
+        after = self.usage.totals("session", self.session_key) if self.usage else (0, 0.0)
+        tokens, cost = after[0] - before[0], after[1] - before[1]
+        duration_ms = _now_ms() - start
+        
+        for task in due:
+            self.state["tasks"][task.key] = start
+        stats = self.state["stats"]
+        stats["runs"] += 1
+        stats["tokens"] += tokens
+        stats["costUsd"] += cost
+        self.state.update({
+            "hash": self._hash,
+            "lastOutcome": outcome,
+            "lastRunAtMs": start,
+            "lastTick": {
+                "atMs": start, "ran": True, "outcome": outcome,
+                "durationMs": duration_ms, "tokens": tokens, "costUsd": cost,
+            },
+        })
+        self._save_state()
+        
+        cost_note = f"{tokens:,} tokens, ${cost:.4f}, {duration_ms / 1000:.1f}s"
+        if outcome == "ok":
+            logger.info(f"Heartbeat: OK (no action needed; {cost_note})")
+        elif outcome == "acted":
+            logger.info(f"Heartbeat: completed task ({cost_note})")
+        return response
+    
+    def _record_skip(self, now_ms: int, reason: str) -> None:
+        self.state["stats"]["skipped"] += 1
+        self.state["lastTick"] = {"atMs": now_ms, "ran": False, "reason": reason}
+        self._save_state()
     
     async def trigger_now(self) -> str | None:
         """Manually trigger a heartbeat."""
-        if self.on_heartbeat:
-            return await self.on_heartbeat(HEARTBEAT_PROMPT)
-        return None
+        self._read_heartbeat_file()
+        due = self._due_tasks(_now_ms())
+        return await self._run(self._build_prompt(due), due)
@@ -20,6 +20,8 @@ class LLMResponse:
     tool_calls: list[ToolCallRequest] = field(default_factory=list)
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
+    latency_ms: float = 0.0
+    cost_usd: float = 0.0
     
     @property
     def has_tool_calls(self) -> bool:
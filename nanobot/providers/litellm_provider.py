@@ -1,6 +1,7 @@
 """LiteLLM provider implementation for multi-provider support."""
 
 import os
+import time
 from typing import Any
 
 import litellm
@@ -135,15 +136,18 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        start = time.perf_counter()
         try:
             response = await acompletion(**kwargs)
-            return self._parse_response(response)
+            result = self._parse_response(response)
         except Exception as e:
             # Return error as content for graceful handling
-            return LLMResponse(
+            result = LLMResponse(
                 content=f"Error calling LLM: {str(e)}",
                 finish_reason="error",
             )
+        result.latency_ms = (time.perf_counter() - start) * 1000
+        return result
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -176,11 +180,16 @@ class LiteLLMProvider(LLMProvider):
                 "total_tokens": response.usage.total_tokens,
             }
         
+        # LiteLLM computes the cost from its model price map when known
+        hidden = getattr(response, "_hidden_params", None) or {}
+        cost = hidden.get("response_cost") or 0.0
+        
         return LLMResponse(
             content=message.content,
             tool_calls=tool_calls,
             finish_reason=choice.finish_reason or "stop",
             usage=usage,
+            cost_usd=float(cost),
         )
     
     def get_default_model(self) -> str:
@@ -0,0 +1,47 @@
+"""Content-addressed storage for large session payloads."""
+
+import hashlib
+from pathlib import Path
+
+from loguru import logger
+
+
+class BlobStore:
+    """
+    Stores text blobs by the SHA-256 of their content.
+    
+    Identical payloads (the same file read twice, the same page fetched
+    again) are stored once. Blobs live at `<root>/<first 2 hex>/<digest>.txt`.
+    """
+    
+    def __init__(self, root: Path):
+        self.root = root
+    
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.txt"
+    
+    def put(self, text: str) -> str:
+        """
+        Store a blob.
+        
+        Returns:
+            The blob's digest.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(path)
+        return digest
+    
+    def get(self, digest: str) -> str | None:
+        """Get a blob by digest, or None if it is missing."""
+        try:
+            return self._path(digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read blob {digest}: {e}")
+            return None
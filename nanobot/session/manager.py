@@ -1,14 +1,37 @@
 """Session management for conversation history."""
 
+import asyncio
 import json
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Awaitable, Callable, TYPE_CHECKING
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.session.blobs import BlobStore
+from nanobot.utils.helpers import ensure_dir, estimate_tokens, safe_filename
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import CompactionConfig, ToolHistoryConfig
+
+# Summarizes (messages, previous summary) into a new summary
+Summarizer = Callable[[list[dict[str, Any]], str | None], Awaitable[str]]
+
+
+def history_limit_for(mode: str, max_messages: int) -> int | None:
+    """
+    Map a session mode to a history limit for scheduled turns.
+    
+    "persistent" keeps the normal session (None), "ephemeral" runs the turn
+    without history and without saving it (0), and "capped" keeps only the
+    last `max_messages` messages.
+    """
+    if mode == "persistent":
+        return None
+    if mode == "ephemeral":
+        return 0
+    return max(1, max_messages)
 
 
 @dataclass
@@ -36,25 +59,98 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
     
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+    def get_history(
+        self,
+        max_messages: int = 50,
+        blobs: BlobStore | None = None,
+        expand_turns: int = 0,
+    ) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
         
+        If older turns have been compacted, their summary comes first,
+        followed by the messages after it. History never starts in the middle
+        of a turn, so tool results always follow their tool calls.
+        
         Args:
             max_messages: Maximum messages to return.
+            blobs: Store to expand out-of-line tool outputs from.
+            expand_turns: Number of most recent turns whose out-of-line tool
+                outputs are expanded; older ones keep their short reference.
         
         Returns:
             List of messages in LLM format.
         """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+        summary = self.metadata.get("summary")
+        start = summary["upto"] if summary else 0
+        
+        # Get recent messages, starting at a user message
+        recent = self.messages[self._turn_start(max(start, len(self.messages) - max_messages), start):]
+        
+        # Out-of-line outputs are expanded from the Nth user message from the end
+        expand_from = len(recent)
+        if blobs and expand_turns > 0:
+            user_indexes = [i for i, m in enumerate(recent) if m["role"] == "user"]
+            if user_indexes:
+                expand_from = user_indexes[-min(expand_turns, len(user_indexes))]
+        
+        # Convert to LLM format (role and content, plus tool call fields)
+        history = []
+        for i, m in enumerate(recent):
+            msg = {"role": m["role"], "content": m["content"]}
+            for key in ("tool_calls", "tool_call_id", "name"):
+                if key in m:
+                    msg[key] = m[key]
+            if "blob" in m and i >= expand_from:
+                msg["content"] = blobs.get(m["blob"]) or m["content"]
+            history.append(msg)
+        if summary:
+            history.insert(0, {
+                "role": "system",
+                "content": f"[Summary of the earlier conversation]\n{summary['text']}",
+            })
+        return history
+    
+    def uncompacted(self) -> list[dict[str, Any]]:
+        """Get the messages not covered by the summary."""
+        summary = self.metadata.get("summary")
+        return self.messages[summary["upto"]:] if summary else self.messages
+    
+    def _turn_start(self, first: int, floor: int = 0) -> int:
+        """
+        Find where to cut the messages so the kept part starts at a user message.
         
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        Moves forward from `first` to the next user message. If the window
+        holds none (the last turn alone is longer than the window), backs up
+        to the last user message instead, so the latest turn is always kept.
+        """
+        i = first
+        while i < len(self.messages) and self.messages[i]["role"] != "user":
+            i += 1
+        if i < len(self.messages):
+            return i
+        i = min(first, len(self.messages)) - 1
+        while i > floor and self.messages[i]["role"] != "user":
+            i -= 1
+        return max(i, floor)
+    
+    def trim(self, max_messages: int) -> None:
+        """
+        Drop all but the last `max_messages` messages, starting at a user message.
+        
+        The latest turn is always kept whole, even if it is longer than
+        `max_messages`. The summary is dropped too: a capped session stays
+        small on its own.
+        """
+        first = self._turn_start(max(0, len(self.messages) - max_messages))
+        if first:
+            self.messages = self.messages[first:]
+        self.metadata.pop("summary", None)
     
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
+        self.metadata.pop("summary", None)
         self.updated_at = datetime.now()
 
 
@@ -63,12 +159,29 @@ class SessionManager:
     Manages conversation sessions.
     
     Sessions are stored as JSONL files in the sessions directory.
+    
+    When a summarizer is set, sessions whose uncompacted history grows past
+    the compaction threshold are compacted in the background: older turns
+    are folded into a rolling summary kept in the session metadata. The full
+    transcript stays on disk; only the history sent to the LLM shrinks.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        compaction: "CompactionConfig | None" = None,
+        summarizer: Summarizer | None = None,
+        tool_history: "ToolHistoryConfig | None" = None,
+    ):
+        from nanobot.config.schema import CompactionConfig, ToolHistoryConfig
         self.workspace = workspace
         self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
+        self.blobs = BlobStore(self.sessions_dir / "blobs")
+        self.compaction = compaction or CompactionConfig()
+        self.tool_history = tool_history or ToolHistoryConfig()
+        self.summarizer = summarizer
         self._cache: dict[str, Session] = {}
+        self._compactions: dict[str, asyncio.Task[None]] = {}
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -153,6 +266,101 @@ class SessionManager:
         
         self._cache[session.key] = session
     
+    def get_history(self, session: Session, max_messages: int = 50) -> list[dict[str, Any]]:
+        """Get a session's LLM history, expanding recent out-of-line tool outputs."""
+        return session.get_history(
+            max_messages, blobs=self.blobs, expand_turns=self.tool_history.expand_turns,
+        )
+    
+    def add_turn(
+        self,
+        session: Session,
+        user_content: str,
+        turn: list[dict[str, Any]],
+        final_content: str,
+    ) -> None:
+        """
+        Add a completed turn to a session.
+        
+        If tool history is enabled, the assistant tool calls and tool results
+        of the turn are kept too; outputs longer than `inline_max_chars` are
+        moved to the blob store and replaced by a short reference.
+        
+        Args:
+            session: The session.
+            user_content: The user message that started the turn.
+            turn: Messages the agent loop appended after the user message.
+            final_content: The final assistant reply.
+        """
+        session.add_message("user", user_content)
+        if self.tool_history.enabled:
+            for m in turn:
+                if m["role"] == "assistant" and m.get("tool_calls"):
+                    session.add_message("assistant", m["content"], tool_calls=m["tool_calls"])
+                elif m["role"] == "tool":
+                    session.add_message("tool", **self._inline_tool_result(m))
+        session.add_message("assistant", final_content)
+    
+    def _inline_tool_result(self, msg: dict[str, Any]) -> dict[str, Any]:
+        """Build the stored form of a tool result, moving large output out of line."""
+        stored = {"tool_call_id": msg["tool_call_id"], "name": msg["name"], "content": msg["content"]}
+        content = msg["content"]
+        if isinstance(content, str) and len(content) > self.tool_history.inline_max_chars:
+            digest = self.blobs.put(content)
+            preview = content[:self.tool_history.preview_chars]
+            stored["content"] = (
+                f"[{msg['name']} output of {len(content)} chars stored as blob {digest[:12]}; "
+                f"preview:]\n{preview}..."
+            )
+            stored["blob"] = digest
+        return stored
+    
+    def maybe_compact(self, session: Session) -> bool:
+        """
+        Start compacting a session in the background if it is over the threshold.
+        
+        Returns:
+            True if a compaction was started.
+        """
+        if not self.summarizer or not self.compaction.enabled or session.key in self._compactions:
+            return False
+        
+        tail = session.uncompacted()
+        if len(tail) <= self.compaction.keep_recent:
+            return False
+        if _estimate_tokens(tail) < self.compaction.threshold_tokens:
+            return False
+        
+        task = asyncio.create_task(self._compact(session))
+        self._compactions[session.key] = task
+        task.add_done_callback(lambda _: self._compactions.pop(session.key, None))
+        return True
+    
+    async def _compact(self, session: Session) -> None:
+        """Fold all but the most recent messages into the session summary."""
+        summary = session.metadata.get("summary")
+        start = summary["upto"] if summary else 0
+        upto = len(session.messages) - self.compaction.keep_recent
+        # Never split a turn: the kept messages start at a user message
+        while upto > start and session.messages[upto]["role"] != "user":
+            upto -= 1
+        if upto <= start:
+            return
+        older = [{"role": m["role"], "content": m["content"]} for m in session.messages[start:upto]]
+        
+        try:
+            text = await self.summarizer(older, summary["text"] if summary else None)
+        except Exception as e:
+            logger.warning(f"Failed to compact session {session.key}: {e}")
+            return
+        
+        # The session may have been cleared while the summary was computed
+        if len(session.messages) < upto or session.metadata.get("summary") is not summary:
+            return
+        session.metadata["summary"] = {"text": text, "upto": upto}
+        self.save(session)
+        logger.info(f"Compacted {upto - start} messages of session {session.key}")
+    
     def delete(self, key: str) -> bool:
         """
         Delete a session.
@@ -200,3 +408,8 @@ class SessionManager:
                 continue
         
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+
+def _estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough token count of messages."""
+    return sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
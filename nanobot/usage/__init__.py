@@ -0,0 +1,5 @@
+"""Usage accounting for LLM calls."""
+
+from nanobot.usage.tracker import UsageTracker
+
+__all__ = ["UsageTracker"]
@@ -0,0 +1,200 @@
+"""Token, cost and latency accounting for LLM calls."""
+
+import json
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from nanobot.providers.base import LLMResponse
+
+# Dimensions usage is aggregated by
+DIMENSIONS = ("model", "session", "channel", "subagent", "cron")
+
+# Order of the counters stored per key: [calls, prompt, completion, total, cost]
+_CALLS, _PROMPT, _COMPLETION, _TOTAL, _COST = range(5)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class UsageTracker:
+    """
+    Aggregates token usage, cost and latency of LLM calls.
+
+    Usage is bucketed per day and per dimension (model, session, channel,
+    subagent task, cron job) and persisted as a compact rolling JSON store
+    that only keeps the last `retention_days` days. Latency samples are kept
+    per model in a bounded window for percentile reporting.
+    """
+
+    def __init__(
+        self,
+        store_path: Path,
+        retention_days: int = 30,
+        latency_window: int = 1000,
+        flush_interval_s: float = 10.0,
+    ):
+        self.store_path = store_path
+        self.retention_days = retention_days
+        self.latency_window = latency_window
+        self.flush_interval_s = flush_interval_s
+        self._days: dict[str, dict[str, dict[str, list[float]]]] = {}
+        self._latency: dict[str, deque[float]] = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        """Load the rolling store from disk."""
+        if not self.store_path.exists():
+            return
+        try:
+            data = json.loads(self.store_path.read_text())
+            self._days = data.get("days", {})
+            for model, samples in data.get("latency", {}).items():
+                self._latency[model] = deque(samples, maxlen=self.latency_window)
+        except Exception as e:
+            logger.warning(f"Failed to load usage store: {e}")
+
+    def record(
+        self,
+        model: str,
+        response: "LLMResponse",
+        session: str | None = None,
+        channel: str | None = None,
+        subagent: str | None = None,
+        cron: str | None = None,
+    ) -> None:
+        """
+        Record the usage of a single LLM call.
+
+        Args:
+            model: Model the call was made with.
+            response: The provider response carrying usage and latency.
+            session: Session key the call belongs to.
+            channel: Channel the call originated from.
+            subagent: Subagent task ID, if the call was made by a subagent.
+            cron: Cron job ID, if the call was made for a scheduled job.
+        """
+        if cron is None and session and session.startswith("cron:"):
+            cron = session.split(":", 1)[1]
+
+        usage = response.usage or {}
+        day = self._days.setdefault(datetime.now().strftime("%Y-%m-%d"), {})
+        keys = {
+            "model": model,
+            "session": session,
+            "channel": channel,
+            "subagent": subagent,
+            "cron": cron,
+        }
+        for dim, key in keys.items():
+            if not key:
+                continue
+            counters = day.setdefault(dim, {}).setdefault(key, [0, 0, 0, 0, 0.0])
+            counters[_CALLS] += 1
+            counters[_PROMPT] += (usage.get("prompt_tokens") or 0)
+            counters[_COMPLETION] += (usage.get("completion_tokens") or 0)
+            counters[_TOTAL] += (usage.get("total_tokens") or 0)
+            counters[_COST] += response.cost_usd
+
+        if response.latency_ms:
+            samples = self._latency.setdefault(model, deque(maxlen=self.latency_window))
+            samples.append(round(response.latency_ms, 1))
+
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist pending usage to disk, dropping days past retention."""
+        if not self._dirty:
+            return
+
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        self._days = {d: v for d, v in self._days.items() if d > cutoff}
+
+        data = {
+            "version": 1,
+            "days": self._days,
+            "latency": {m: list(s) for m, s in self._latency.items()},
+        }
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            self.store_path.write_text(json.dumps(data, separators=(",", ":")))
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Failed to save usage store: {e}")
+
+    def summary(self, dimension: str = "model", days: int = 7) -> list[dict[str, Any]]:
+        """
+        Aggregate usage over the last N days for one dimension.
+
+        Args:
+            dimension: One of DIMENSIONS.
+            days: Number of days to include (today counts as one).
+
+        Returns:
+            Rows sorted by total tokens (highest first).
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown usage dimension: {dimension}")
+
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        totals: dict[str, list[float]] = {}
+        for day, buckets in self._days.items():
+            if day <= cutoff:
+                continue
+            for key, counters in buckets.get(dimension, {}).items():
+                acc = totals.setdefault(key, [0, 0, 0, 0, 0.0])
+                for i, value in enumerate(counters):
+                    acc[i] += value
+
+        rows = [
+            {
+                "key": key,
+                "calls": int(c[_CALLS]),
+                "prompt_tokens": int(c[_PROMPT]),
+                "completion_tokens": int(c[_COMPLETION]),
+                "total_tokens": int(c[_TOTAL]),
+                "cost_usd": c[_COST],
+            }
+            for key, c in totals.items()
+        ]
+        return sorted(rows, key=lambda r: r["total_tokens"], reverse=True)
+
+    def totals(self, dimension: str, key: str) -> tuple[int, float]:
+        """Get the (total tokens, cost) recorded for one key over all retained days."""
+        tokens, cost = 0, 0.0
+        for buckets in self._days.values():
+            counters = buckets.get(dimension, {}).get(key)
+            if counters:
+                tokens += int(counters[_TOTAL])
+                cost += counters[_COST]
+        return tokens, cost
+
+    def latency_percentiles(self) -> dict[str, dict[str, float]]:
+        """Get p50/p90/p99 latency in ms for each model."""
+        result = {}
+        for model, samples in self._latency.items():
+            values = list(samples)
+            result[model] = {
+                "samples": len(values),
+                "p50": _percentile(values, 50),
+                "p90": _percentile(values, 90),
+                "p99": _percentile(values, 99),
+            }
+        return result
@@ -66,6 +66,11 @@ def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     return s[: max_len - len(suffix)] + suffix
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text (about 4 characters per token)."""
+    return len(text) // 4
+
+
 def safe_filename(name: str) -> str:
     """Convert a string to a safe filename."""
     # Replace unsafe characters
@@ -0,0 +1,60 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class SlowProvider(LLMProvider):
+    """Echoes the message after the delay set for its text."""
+
+    def __init__(self, delays: dict[str, float]) -> None:
+        super().__init__()
+        self.delays = delays
+        self.seen: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        text = messages[-1]["content"]
+        self.seen.append(text)
+        await asyncio.sleep(self.delays.get(text, 0))
+        return LLMResponse(content=f"re: {text}")
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+async def test_queued_turn_timeout_and_abandon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    bus = MessageBus()
+    provider = SlowProvider({"chat": 0.2, "stuck": 1.0})
+    agent = AgentLoop(bus=bus, provider=provider, workspace=tmp_path)
+    runner = asyncio.create_task(agent.run())
+
+    # Time spent queued behind a chat turn does not count toward the timeout
+    await bus.publish_inbound(InboundMessage(channel="cli", sender_id="u", chat_id="c", content="chat"))
+    await asyncio.sleep(0.01)
+    reply = await agent.process_queued("job", session_key="cron:a", history_limit=0, timeout=0.1)
+    assert reply == "re: job"
+
+    # A caller that gives up while queued leaves nothing to answer
+    await bus.publish_inbound(InboundMessage(channel="cli", sender_id="u", chat_id="c", content="chat"))
+    await asyncio.sleep(0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(agent.process_queued("late", session_key="cron:b", history_limit=0), 0.05)
+
+    # A turn that runs too long is cancelled
+    with pytest.raises(asyncio.TimeoutError):
+        await agent.process_queued("stuck", session_key="cron:c", history_limit=0, timeout=0.05)
+
+    agent.stop()
+    await runner
+    assert "late" not in provider.seen
+    replies = []
+    while bus.outbound_size:
+        replies.append((await bus.consume_outbound()).content)
+    assert replies == ["re: chat", "re: chat"]
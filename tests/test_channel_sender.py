@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager, ChannelSender
+from nanobot.config.schema import Config
+
+
+class RecordingChannel(BaseChannel):
+    name = "test"
+
+    def __init__(self, pace_s: float = 0.0) -> None:
+        super().__init__(config=None, bus=None)
+        self.sent: list[tuple[str, str]] = []
+        self.pace_s = pace_s
+        self._next_send: dict[str, float] = {}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def send_delay(self, chat_id: str) -> float:
+        return max(0.0, self._next_send.get(chat_id, 0.0) - time.monotonic())
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if msg.chat_id == "slow":
+            await asyncio.sleep(0.2)
+        self._next_send[msg.chat_id] = time.monotonic() + self.pace_s
+        self.sent.append((msg.chat_id, msg.content))
+
+
+async def test_sender_keeps_chat_order_without_blocking_other_chats() -> None:
+    channel = RecordingChannel()
+    sender = ChannelSender(channel, concurrency=2)
+    sender.start()
+
+    sender.submit(OutboundMessage(channel="test", chat_id="slow", content="s1"))
+    for i in range(3):
+        sender.submit(OutboundMessage(channel="test", chat_id="fast", content=str(i)))
+
+    await asyncio.sleep(0.05)
+    assert channel.sent == [("fast", "0"), ("fast", "1"), ("fast", "2")]
+
+    await sender.join()
+    assert channel.sent[-1] == ("slow", "s1")
+    assert sender.stats()["sent"] == 4
+    await sender.stop()
+
+
+async def test_paced_chat_does_not_hold_a_worker() -> None:
+    channel = RecordingChannel(pace_s=0.2)
+    sender = ChannelSender(channel, concurrency=1)
+    sender.start()
+
+    sender.submit(OutboundMessage(channel="test", chat_id="a", content="a1"))
+    sender.submit(OutboundMessage(channel="test", chat_id="a", content="a2"))
+    sender.submit(OutboundMessage(channel="test", chat_id="b", content="b1"))
+
+    # While chat "a" waits for its next slot, the only worker serves "b"
+    await asyncio.sleep(0.05)
+    assert channel.sent == [("a", "a1"), ("b", "b1")]
+
+    await sender.join()
+    assert channel.sent[-1] == ("a", "a2")
+    await sender.stop()
+
+
+async def test_full_sender_drops_instead_of_waiting() -> None:
+    channel = RecordingChannel()
+    sender = ChannelSender(channel, concurrency=1, max_pending=2, overflow="drop_oldest")
+    sender.start()
+
+    sender.submit(OutboundMessage(channel="test", chat_id="slow", content="s1"))
+    await asyncio.sleep(0.01)  # s1 is in flight
+    sender.submit(OutboundMessage(channel="test", chat_id="slow", content="s2"))
+    assert sender.submit(OutboundMessage(channel="test", chat_id="x", content="x1"))
+    assert sender.stats()["dropped"] == 1  # s2, the oldest waiting message
+
+    sender.overflow = "reject"
+    assert not sender.submit(OutboundMessage(channel="test", chat_id="x", content="x2"))
+
+    await sender.join()
+    assert [content for _, content in channel.sent] == ["s1", "x1"]
+    await sender.stop()
+
+
+async def test_stalled_channel_does_not_delay_others() -> None:
+    stalled = RecordingChannel()
+    stalled.name = "stalled"
+    stalled.send = lambda msg: asyncio.Event().wait()
+    fast = RecordingChannel()
+    fast.name = "fast"
+
+    config = Config()
+    config.channels.send_queue_size = 2
+    bus = MessageBus()
+    manager = ChannelManager(config, bus)
+    manager.channels = {"stalled": stalled, "fast": fast}
+    runner = asyncio.create_task(manager.start_all())
+    await asyncio.sleep(0)
+
+    for i in range(5):
+        await bus.publish_outbound(OutboundMessage(channel="stalled", chat_id=str(i), content="x"))
+    await bus.publish_outbound(OutboundMessage(channel="fast", chat_id="a", content="hi"))
+    await asyncio.sleep(0.05)
+
+    assert fast.sent == [("a", "hi")]
+    assert manager.get_status()["stalled"]["outbound"]["dropped"] == 3
+    await manager.stop_all(drain_timeout_s=0)
+    await runner
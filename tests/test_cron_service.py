@@ -0,0 +1,220 @@
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from nanobot.config.schema import CronConfig
+from nanobot.cron.service import CronService, _compute_next_run, _cron_iter
+from nanobot.cron.types import CronJob, CronSchedule
+
+
+def test_journal_replays_over_snapshot(tmp_path: Path) -> None:
+    store_path = tmp_path / "jobs.json"
+    service = CronService(store_path)
+    a = service.add_job("a", CronSchedule(kind="every", every_ms=60_000), "ping")
+    b = service.add_job("b", CronSchedule(kind="every", every_ms=30_000), "pong")
+    service.enable_job(a.id, enabled=False)
+    service.remove_job(b.id)
+    c = service.add_job("c", CronSchedule(kind="every", every_ms=90_000), "hi")
+
+    # Changes are appended to the journal; no snapshot has been written yet
+    assert not store_path.exists()
+    assert len(service.journal_path.read_text().splitlines()) == 5
+
+    reloaded = CronService(store_path)
+    jobs = {j.id: j for j in reloaded.list_jobs(include_disabled=True)}
+    assert set(jobs) == {a.id, c.id}
+    assert not jobs[a.id].enabled
+    assert reloaded.status()["next_wake_at_ms"] == c.state.next_run_at_ms
+
+    # A snapshot folds the journal in
+    reloaded._save_store()
+    assert not reloaded.journal_path.exists()
+    assert {j.id for j in CronService(store_path).list_jobs(include_disabled=True)} == {a.id, c.id}
+
+
+def test_next_wake_skips_stale_heap_entries(tmp_path: Path) -> None:
+    service = CronService(tmp_path / "jobs.json")
+    soon = service.add_job("soon", CronSchedule(kind="every", every_ms=1_000), "x")
+    later = service.add_job("later", CronSchedule(kind="every", every_ms=60_000), "y")
+
+    assert service.status()["next_wake_at_ms"] == soon.state.next_run_at_ms
+    service.remove_job(soon.id)
+    assert service.status()["next_wake_at_ms"] == later.state.next_run_at_ms
+    service.enable_job(later.id, enabled=False)
+    assert service.status()["next_wake_at_ms"] is None
+
+
+async def test_recurring_job_keeps_one_heap_entry(tmp_path: Path) -> None:
+    runs = 0
+
+    async def on_job(job: CronJob) -> str:
+        nonlocal runs
+        runs += 1
+        return "done"
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job)
+    await service.start()
+    job = service.add_job("tick", CronSchedule(kind="every", every_ms=150), "x")
+    await asyncio.sleep(0.7)
+    service.stop()
+
+    assert runs >= 3
+    assert service._heap == [(job.state.next_run_at_ms, job.id)]
+
+
+@pytest.mark.parametrize("overlap", ["allow", "skip", "queue"])
+async def test_recurring_job_runs_once_per_period(tmp_path: Path, overlap: str) -> None:
+    starts: list[float] = []
+
+    async def on_job(job: CronJob) -> str:
+        starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.03)
+        return "done"
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job, config=CronConfig(overlap=overlap))
+    await service.start()
+    job = service.add_job("tick", CronSchedule(kind="every", every_ms=200), "x")
+    await asyncio.sleep(0.9)
+    service.stop()
+
+    assert 3 <= len(starts) <= 5
+    assert all(b - a > 0.15 for a, b in zip(starts, starts[1:]))
+    assert job.state.last_status == "ok"
+    assert len(service._heap) == 1
+
+
+async def test_due_jobs_run_concurrently_with_timeout_and_overlap(tmp_path: Path) -> None:
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def on_job(job: CronJob) -> str:
+        started.append(job.name)
+        await release.wait()
+        return "done"
+
+    service = CronService(
+        tmp_path / "jobs.json",
+        on_job=on_job,
+        config=CronConfig(max_concurrent=2, timeout_s=0, overlap="skip"),
+    )
+    schedule = CronSchedule(kind="every", every_ms=60_000)
+    a = service.add_job("a", schedule, "x")
+    b = service.add_job("b", schedule, "x")
+    c = service.add_job("c", schedule, "x")
+    slow = service.add_job("slow", schedule, "x", timeout_s=0.05)
+    service._running = True
+
+    for job in (a, b, c):
+        service._dispatch(job)
+    await asyncio.sleep(0.01)
+    assert started == ["a", "b"]  # c waits for a free slot
+
+    # a is still running when it comes due again
+    service._dispatch(a)
+    assert a.state.last_status == "skipped"
+    assert service.status()["running"] == 3
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert started == ["a", "b", "c"]
+    assert all(j.state.last_status == "ok" for j in (a, b, c))
+
+    release.clear()
+    service._dispatch(slow)
+    await asyncio.sleep(0.1)
+    assert slow.state.last_status == "error"
+    assert "timed out" in slow.state.last_error
+    assert service.status()["running"] == 0
+    service.stop()
+
+
+async def test_queued_overlap_runs_again_after_current_run(tmp_path: Path) -> None:
+    release = asyncio.Event()
+    runs = 0
+
+    async def on_job(job: CronJob) -> str:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "done"
+
+    service = CronService(tmp_path / "jobs.json", on_job=on_job, config=CronConfig(overlap="queue"))
+    job = service.add_job("q", CronSchedule(kind="every", every_ms=60_000), "x")
+    service._running = True
+
+    service._dispatch(job)
+    await asyncio.sleep(0)
+    service._dispatch(job)
+    service._dispatch(job)  # At most one run is queued
+    release.set()
+    await asyncio.sleep(0.01)
+    assert runs == 2
+    service.stop()
+
+
+def test_interval_runs_are_anchored_and_jittered() -> None:
+    schedule = CronSchedule(kind="every", every_ms=1000)
+    # Late by 300ms: the next run stays on the grid instead of drifting
+    assert _compute_next_run(schedule, 5_300, anchor_ms=0) == 6_000
+    assert _compute_next_run(schedule, 6_000, anchor_ms=0) == 7_000
+    # Jitter shifts the whole grid
+    assert _compute_next_run(schedule, 5_300, anchor_ms=0, offset_ms=400) == 5_400
+    assert _compute_next_run(schedule, 5_400, anchor_ms=0, offset_ms=400) == 6_400
+
+
+async def test_missed_runs_follow_misfire_policy(tmp_path: Path, monkeypatch) -> None:
+    store_path = tmp_path / "jobs.json"
+    service = CronService(store_path)
+    job = service.add_job("tick", CronSchedule(kind="every", every_ms=60_000), "x")
+    once = service.add_job("once", CronSchedule(kind="at", at_ms=job.created_at_ms + 1_000), "y")
+    service._save_store()
+
+    # Restart ten minutes later
+    later = job.created_at_ms + 10 * 60_000 + 5_000
+    monkeypatch.setattr("nanobot.cron.service._now_ms", lambda: later)
+
+    runs: list[str] = []
+
+    async def on_job(j: CronJob) -> None:
+        runs.append(j.name)
+
+    config = CronConfig(misfire="run_all", max_catchup=3)
+    restarted = CronService(store_path, on_job=on_job, config=config)
+    await restarted.start()
+    await asyncio.sleep(0.01)
+    assert sorted(runs) == ["once", "tick", "tick", "tick"]
+    assert restarted.get_job(job.id).state.next_run_at_ms == job.created_at_ms + 11 * 60_000
+    assert not restarted.get_job(once.id).enabled
+    restarted.stop()
+
+    runs.clear()
+    skipping = CronService(tmp_path / "jobs.json", on_job=on_job, config=CronConfig(misfire="skip"))
+    skipping._load_store()
+    skipping.get_job(job.id).state.next_run_at_ms = job.created_at_ms + 60_000
+    await skipping.start()
+    await asyncio.sleep(0.01)
+    assert runs == []
+    skipping.stop()
+
+
+def test_cron_expressions_honor_timezone_and_preview(tmp_path: Path) -> None:
+    # 2026-01-15 12:00 UTC
+    now = int(datetime(2026, 1, 15, 12, tzinfo=timezone.utc).timestamp() * 1000)
+    tokyo = CronSchedule(kind="cron", expr="0 9 * * *", tz="Asia/Tokyo")
+    utc = CronSchedule(kind="cron", expr="0 9 * * *")
+
+    first = datetime.fromtimestamp(_compute_next_run(tokyo, now) / 1000, timezone.utc)
+    assert first == datetime(2026, 1, 16, 0, tzinfo=timezone.utc)  # 09:00 JST
+    assert _compute_next_run(utc, now) == int(datetime(2026, 1, 16, 9, tzinfo=timezone.utc).timestamp() * 1000)
+    # Parsed once per (expression, timezone)
+    assert _cron_iter("0 9 * * *", "Asia/Tokyo") is _cron_iter("0 9 * * *", "Asia/Tokyo")
+
+    service = CronService(tmp_path / "jobs.json")
+    job = service.add_job("daily", tokyo, "x")
+    runs = service.next_runs(job, 3)
+    assert [b - a for a, b in zip(runs, runs[1:])] == [86_400_000, 86_400_000]
+
+    with pytest.raises(ValueError):
+        service.add_job("bad", CronSchedule(kind="cron", expr="0 9 * * *", tz="Mars/Base"), "x")
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from nanobot.heartbeat.service import HeartbeatService, _parse_scheduled_tasks
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.ms = 1_000_000_000_000
+
+    def __call__(self) -> int:
+        return self.ms
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr("nanobot.heartbeat.service._now_ms", clock)
+    return clock
+
+
+async def test_unchanged_file_skips_after_ok(tmp_path: Path, clock: _Clock) -> None:
+    prompts: list[str] = []
+    reply = "HEARTBEAT_OK"
+
+    async def on_heartbeat(prompt: str) -> str:
+        prompts.append(prompt)
+        return reply
+
+    (tmp_path / "HEARTBEAT.md").write_text("- Water the plants\n")
+    service = HeartbeatService(tmp_path, on_heartbeat, state_path=tmp_path / "state.json")
+
+    await service._tick()
+    await service._tick()
+    assert len(prompts) == 1
+    assert service.state["stats"]["skipped"] == 1
+
+    # Editing the file triggers a check, and so does a non-OK outcome
+    (tmp_path / "HEARTBEAT.md").write_text("- Water the plants\n- Feed the cat\n")
+    reply = "Fed the cat."
+    await service._tick()
+    await service._tick()
+    assert len(prompts) == 3
+
+    # State survives a restart
+    restarted = HeartbeatService(tmp_path, on_heartbeat, state_path=tmp_path / "state.json")
+    reply = "HEARTBEAT_OK"
+    await restarted._tick()
+    await restarted._tick()
+    assert len(prompts) == 4
+
+
+async def test_scheduled_tasks_run_when_due(tmp_path: Path, clock: _Clock) -> None:
+    prompts: list[str] = []
+
+    async def on_heartbeat(prompt: str) -> str:
+        prompts.append(prompt)
+        return "HEARTBEAT_OK"
+
+    (tmp_path / "HEARTBEAT.md").write_text("- Check backups <!-- every: 2h -->\n")
+    service = HeartbeatService(tmp_path, on_heartbeat)
+
+    await service._tick()  # New file: checked once, task not due yet
+    assert "No scheduled tasks" in prompts[-1]
+    clock.ms += 3_600_000
+    await service._tick()
+    assert len(prompts) == 1
+
+    clock.ms += 3_600_000
+    await service._tick()
+    assert len(prompts) == 2
+    assert "Scheduled tasks due now:\n- Check backups\n" in prompts[-1]
+    clock.ms += 60_000
+    await service._tick()
+    assert len(prompts) == 2
+
+
+def test_invalid_schedule_markers_are_ignored() -> None:
+    tasks = _parse_scheduled_tasks(
+        "- Check backups <!-- cron: 0 9 * * 1 -->\n"
+        "- Rotate logs <!-- cron: every monday -->\n"
+        "- Feed the cat <!-- every: soon -->\n"
+    )
+    assert [t.text for t in tasks] == ["Check backups"]
+    assert tasks[0].schedule.expr == "0 9 * * 1"
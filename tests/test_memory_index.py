@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.config.schema import MemoryConfig
+
+
+def test_memory_search_updates_incrementally(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(
+        "# Preferences\n\nUser prefers dark roast coffee.\n\n"
+        "# Projects\n\nWorking on the garden irrigation controller.\n"
+    )
+    (store.memory_dir / "2026-01-02.md").write_text("# 2026-01-02\n\nBought a new coffee grinder.\n")
+
+    results = store.search("coffee grinder")
+    assert [r["file"] for r in results] == ["2026-01-02.md", "MEMORY.md"]
+    assert results[1]["heading"] == "Preferences"
+    assert store.search("irrigation")[0]["line"] == 5
+
+    # Changed and removed files are picked up on the next search
+    store.write_long_term("# Preferences\n\nUser prefers green tea.\n")
+    os.utime(store.memory_file, (1, 1))
+    (store.memory_dir / "2026-01-02.md").unlink()
+    assert store.search("coffee") == []
+    assert store.search("tea")[0]["text"].endswith("green tea.")
+
+
+def test_memory_context_respects_budget(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path, MemoryConfig(budget_tokens=60))
+    filler = "lorem ipsum dolor sit amet " * 4
+    store.write_long_term(
+        "# Identity\n<!-- pin -->\nThe user is called Sam.\n\n"
+        f"# Garden\n\nTomatoes need water daily. {filler}\n\n"
+        f"# Car\n\nThe car is due for service in May. {filler}\n"
+    )
+
+    context = store.get_memory_context("when is the car service")
+    assert "The user is called Sam." in context
+    assert "<!-- pin -->" not in context
+    assert "car is due for service" in context
+    assert "Tomatoes" not in context
+    assert "1 more sections not shown" in context
+
+    # Within budget the whole file is injected as before
+    assert "Tomatoes" in MemoryStore(tmp_path, MemoryConfig(budget_tokens=0)).get_memory_context()
@@ -0,0 +1,66 @@
+import asyncio
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+def _msg(content: str, chat_id: str = "c1", sender_id: str = "u1") -> InboundMessage:
+    return InboundMessage(channel="telegram", sender_id=sender_id, chat_id=chat_id, content=content)
+
+
+async def test_coalesces_queued_messages_from_same_sender() -> None:
+    bus = MessageBus(coalesce=True)
+    for text in ("a", "b", "c"):
+        await bus.publish_inbound(_msg(text))
+    await bus.publish_inbound(_msg("other", sender_id="u2"))
+
+    first = await bus.consume_inbound()
+    assert first.content == "a\nb\nc"
+    assert bus.coalesced_count == 2
+
+    # Once consumed, new messages start a fresh turn
+    await bus.publish_inbound(_msg("d"))
+    assert (await bus.consume_inbound()).content == "other"
+    assert (await bus.consume_inbound()).content == "d"
+
+
+async def test_drop_oldest_and_reject_policies() -> None:
+    bus = MessageBus(inbound_maxsize=1, overflow_policy="drop_oldest", channel_policies={"cli": "reject"})
+    await bus.publish_inbound(_msg("old", chat_id="1"))
+    await bus.publish_inbound(_msg("new", chat_id="2"))
+    assert bus.dropped_count == 1
+    assert (await bus.consume_inbound()).content == "new"
+
+    await bus.publish_inbound(_msg("queued", chat_id="3"))
+    rejected = InboundMessage(channel="cli", sender_id="u", chat_id="x", content="hi")
+    assert await bus.publish_inbound(rejected) is False
+    busy = await bus.consume_outbound()
+    assert busy.chat_id == "x"
+    assert bus.rejected_count == 1
+
+
+async def test_block_policy_waits_for_space() -> None:
+    bus = MessageBus(inbound_maxsize=1)
+    await bus.publish_inbound(_msg("1", chat_id="1"))
+    pending = asyncio.create_task(bus.publish_inbound(_msg("2", chat_id="2")))
+    await asyncio.sleep(0)
+    assert not pending.done()
+    await bus.consume_inbound()
+    await pending
+    assert (await bus.consume_inbound()).content == "2"
+
+
+async def test_priority_lanes_with_starvation_protection() -> None:
+    bus = MessageBus(starvation_s=3600)
+    await bus.publish_inbound(InboundMessage("cli", "u", "1", "beat", lane="heartbeat"))
+    await bus.publish_inbound(InboundMessage("cli", "u", "1", "job", lane="cron"))
+    await bus.publish_inbound(_msg("hello"))
+
+    order = [(await bus.consume_inbound()).content for _ in range(3)]
+    assert order == ["hello", "job", "beat"]
+    assert bus.lane_stats()["cron"]["dequeued"] == 1
+
+    starving = MessageBus(starvation_s=0)
+    await starving.publish_inbound(InboundMessage("cli", "u", "1", "job", lane="cron"))
+    await starving.publish_inbound(_msg("hello"))
+    assert (await starving.consume_inbound()).content == "job"
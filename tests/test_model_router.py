@@ -0,0 +1,21 @@
+from nanobot.agent.router import ModelRouter
+from nanobot.config.schema import ModelRoutingConfig
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+def test_select_falls_back_to_default_model() -> None:
+    router = ModelRouter("strong", ModelRoutingConfig(heartbeat="cheap", continuation="mid"))
+    assert router.select("heartbeat") == "cheap"
+    assert router.select("interactive") == "strong"
+    assert router.select("interactive", continuation=True) == "mid"
+
+
+def test_escalation_on_tool_heavy_response() -> None:
+    router = ModelRouter(
+        "strong",
+        ModelRoutingConfig(cron="cheap", escalate_model="strong", escalate_min_tool_calls=2),
+    )
+    calls = [ToolCallRequest(id=str(i), name="exec", arguments={}) for i in range(2)]
+    assert router.escalation_for("cheap", LLMResponse(content=None, tool_calls=calls)) == "strong"
+    assert router.escalation_for("cheap", LLMResponse(content=None, tool_calls=calls[:1])) is None
+    assert router.escalation_for("strong", LLMResponse(content=None, tool_calls=calls)) is None
@@ -0,0 +1,116 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.config.schema import CompactionConfig, ToolHistoryConfig
+from nanobot.session.manager import SessionManager, history_limit_for
+
+
+@pytest.fixture(autouse=True)
+def _home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+
+async def test_compaction_summarizes_older_turns(tmp_path: Path) -> None:
+    calls: list[tuple[int, str | None]] = []
+
+    async def summarize(messages: list[dict[str, Any]], previous: str | None) -> str:
+        calls.append((len(messages), previous))
+        return f"summary {len(calls)}"
+
+    manager = SessionManager(
+        tmp_path,
+        compaction=CompactionConfig(threshold_tokens=10, keep_recent=2),
+        summarizer=summarize,
+    )
+    session = manager.get_or_create("cli:test")
+    for i in range(3):
+        session.add_message("user", f"question number {i}")
+        session.add_message("assistant", f"answer number {i}")
+
+    assert manager.maybe_compact(session)
+    assert not manager.maybe_compact(session)  # already running
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    history = session.get_history()
+    assert history[0] == {"role": "system", "content": "[Summary of the earlier conversation]\nsummary 1"}
+    assert [m["content"] for m in history[1:]] == ["question number 2", "answer number 2"]
+
+    # The next compaction folds the previous summary in
+    session.add_message("user", "another long question here")
+    session.add_message("assistant", "another long answer here")
+    assert manager.maybe_compact(session)
+    await asyncio.sleep(0)
+    assert calls == [(4, None), (2, "summary 1")]
+
+    reloaded = SessionManager(tmp_path)._load("cli:test")
+    assert reloaded.metadata["summary"] == {"text": "summary 2", "upto": 6}
+    assert len(reloaded.messages) == 8
+
+
+def test_tool_results_persist_with_blobs(tmp_path: Path) -> None:
+    manager = SessionManager(
+        tmp_path,
+        tool_history=ToolHistoryConfig(enabled=True, inline_max_chars=10, expand_turns=1),
+    )
+    session = manager.get_or_create("cli:test")
+    big = "x" * 50
+    for i in range(2):
+        turn = [
+            {"role": "assistant", "content": "", "tool_calls": [{"id": f"c{i}", "type": "function"}]},
+            {"role": "tool", "tool_call_id": f"c{i}", "name": "read_file", "content": big},
+        ]
+        manager.add_turn(session, f"read it {i}", turn, "done")
+
+    stored = session.messages[2]
+    assert stored["content"].startswith("[read_file output of 50 chars")
+    assert manager.blobs.get(stored["blob"]) == big
+
+    # Only the most recent turn is expanded; history never starts mid-turn
+    history = manager.get_history(session)
+    assert history[1]["tool_calls"][0]["id"] == "c0"
+    assert history[2]["content"] != big
+    assert history[6]["content"] == big
+    assert session.get_history(max_messages=6)[0]["content"] == "read it 1"
+
+
+def test_capped_session_trims_at_turn_boundary(tmp_path: Path) -> None:
+    assert history_limit_for("persistent", 10) is None
+    assert history_limit_for("ephemeral", 10) == 0
+    assert history_limit_for("capped", 10) == 10
+
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cron:job")
+    session.metadata["summary"] = {"text": "old", "upto": 2}
+    for i in range(4):
+        manager.add_turn(session, f"run {i}", [], f"done {i}")
+
+    session.trim(3)
+    assert [m["content"] for m in session.messages] == ["run 3", "done 3"]
+    assert "summary" not in session.metadata
+
+
+def test_trim_keeps_latest_turn_longer_than_cap(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, tool_history=ToolHistoryConfig(enabled=True))
+    session = manager.get_or_create("heartbeat")
+    manager.add_turn(session, "earlier", [], "ok")
+
+    turn = []
+    for i in range(3):
+        call = {"id": f"c{i}", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+        turn.append({"role": "assistant", "content": "", "tool_calls": [call]})
+        turn.append({"role": "tool", "tool_call_id": f"c{i}", "name": "read_file", "content": "data"})
+    manager.add_turn(session, "check", turn, "HEARTBEAT_OK")
+    assert len(session.messages) == 10
+
+    session.trim(6)
+    assert len(session.messages) == 8
+    assert session.messages[0]["content"] == "check"
+    assert session.messages[-1]["content"] == "HEARTBEAT_OK"
+
+    history = session.get_history(max_messages=6)
+    assert history[0]["content"] == "check"
+    assert len(history) == 8
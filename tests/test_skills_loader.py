@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+from nanobot.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, description: str) -> Path:
+    path = root / "skills" / name / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n")
+    return path
+
+
+def test_skill_index_rereads_only_changed_files(tmp_path: Path, monkeypatch) -> None:
+    manifest_path = tmp_path / "cache" / "skills.json"
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", manifest_path=manifest_path)
+    path = _write_skill(tmp_path, "weather", "Get the weather")
+
+    reads = []
+    original = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or original(self, *a, **k))
+
+    assert "Get the weather" in loader.build_skills_summary()
+    assert "Get the weather" in loader.build_skills_summary()
+    assert reads == [path]
+
+    path.write_text("---\nname: weather\ndescription: Forecasts\n---\n")
+    os.utime(path, ns=(1, 1))
+    assert "Forecasts" in loader.build_skills_summary()
+    assert len(reads) == 2
+
+    _write_skill(tmp_path, "notes", "Take notes")
+    assert {s["name"] for s in loader.list_skills()} == {"weather", "notes"}
+    assert len(reads) == 3
+
+    # A new loader compiles nothing: everything comes from the manifest cache
+    fresh = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", manifest_path=manifest_path)
+    assert "Take notes" in fresh.build_skills_summary()
+    assert len(reads) == 4  # only the manifest file
+
+
+def test_frontmatter_yaml_and_nested_metadata(tmp_path: Path) -> None:
+    path = tmp_path / "skills" / "gh" / "SKILL.md"
+    path.parent.mkdir(parents=True)
+    path.write_text(
+        "---\n"
+        "name: gh\n"
+        "description: \"Use `gh`: issues, PRs\"\n"
+        'metadata: {"nanobot":{"always":true,"requires":{"env":["GH_TOKEN"]}}}\n'
+        "---\n\n# GitHub\n\nBody text.\n"
+    )
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", manifest_path=tmp_path / "m.json")
+
+    manifest = loader.get_manifest("gh")
+    assert manifest.description == "Use `gh`: issues, PRs"
+    assert manifest.always and manifest.requires_env == ["GH_TOKEN"]
+    assert manifest.tokens > 0
+    assert loader.load_skills_for_context(["gh"]).endswith("# GitHub\n\nBody text.")
+
+
+def test_summary_lists_only_relevant_skills(tmp_path: Path) -> None:
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", manifest_path=tmp_path / "m.json")
+    _write_skill(tmp_path, "weather", "Get current weather and forecasts")
+    _write_skill(tmp_path, "github", "Work with GitHub issues and pull requests")
+    _write_skill(tmp_path, "tmux", "Remote-control tmux sessions")
+
+    summary = loader.build_skills_summary("what's the weather forecast tomorrow?", top_k=1)
+    assert "<name>weather</name>" in summary
+    assert "github" not in summary
+    assert "2 more skills are installed" in summary
+
+    assert [s["name"] for s in loader.search_skills("open a pull request")] == ["github"]
+    assert "<name>tmux</name>" in loader.build_skills_summary("hello")
+
+
+def test_skill_added_to_existing_directory_is_found(tmp_path: Path) -> None:
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none", manifest_path=tmp_path / "skills.json")
+    skill_dir = tmp_path / "skills" / "foo"
+    skill_dir.mkdir(parents=True)
+    os.utime(skill_dir, ns=(1, 1))
+    assert loader.list_skills() == []
+
+    # Only the skill directory's mtime changes, not the skills directory's
+    _write_skill(tmp_path, "foo", "Do foo")
+    os.utime(skill_dir, ns=(2, 2))
+    assert [s["name"] for s in loader.list_skills()] == ["foo"]
+
+    (skill_dir / "SKILL.md").unlink()
+    os.utime(skill_dir, ns=(3, 3))
+    assert loader.list_skills() == []
@@ -0,0 +1,220 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.subagent import SubagentManager, SubagentTask
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import Config, SubagentsConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.usage.tracker import UsageTracker
+
+
+class BlockingProvider(LLMProvider):
+    """Answers every call once `release` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        await self.release.wait()
+        return LLMResponse(content="done", usage={"total_tokens": 7})
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+class ToolThenBlockProvider(BlockingProvider):
+    """Asks for one directory listing, then blocks until released."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        if not any(m["role"] == "tool" for m in messages):
+            return LLMResponse(
+                content=None,
+                tool_calls=[ToolCallRequest(id="1", name="list_dir", arguments={"path": "."})],
+                usage={"total_tokens": 5},
+            )
+        return await super().chat(messages, **kwargs)
+
+
+class WorkerProvider(LLMProvider):
+    """Used inside worker processes: the "sleep" task hangs, others answer at once."""
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        if messages[-1]["content"] == "sleep":
+            (Path.home() / "worker-started").touch()
+            await asyncio.sleep(60)
+        return LLMResponse(content="worker done", usage={"total_tokens": 5}, latency_ms=1.0)
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+def worker_provider(config: Config) -> LLMProvider:
+    return WorkerProvider()
+
+
+async def test_pool_limits_queueing_and_cancel(tmp_path: Path) -> None:
+    provider = BlockingProvider()
+    bus = MessageBus()
+    manager = SubagentManager(
+        provider=provider,
+        workspace=tmp_path,
+        bus=bus,
+        config=SubagentsConfig(max_concurrent=2, max_per_chat=1, max_pending=2),
+        status_path=tmp_path / "subagents.json",
+    )
+
+    assert "started" in await manager.spawn("a1", origin_channel="cli", origin_chat_id="a")
+    assert "queued" in await manager.spawn("a2", origin_channel="cli", origin_chat_id="a")
+    assert "started" in await manager.spawn("b1", origin_channel="cli", origin_chat_id="b")
+    assert "queued" in await manager.spawn("c1", origin_channel="cli", origin_chat_id="c")
+    assert "Error" in await manager.spawn("c2", origin_channel="cli", origin_chat_id="c")
+    assert manager.get_running_count() == 2
+
+    # Cancelling a running task frees its slot for the next pending one
+    running_a = manager.list_tasks(origin_key="cli:a")[0]
+    assert manager.cancel(running_a.id)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert running_a.status == "cancelled"
+    statuses = {t.task: t.status for t in manager.list_tasks()}
+    assert statuses == {"a2": "running", "b1": "running", "c1": "pending"}
+
+    provider.release.set()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    finished = {t.task: t for t in manager.list_tasks(include_finished=True)}
+    assert all(t.status == "ok" for name, t in finished.items() if name != "a1")
+    assert finished["c1"].tokens == 7
+    assert bus.inbound_size == 3
+    assert (tmp_path / "subagents.json").exists()
+
+
+async def test_direct_delivery_skips_summary_call(tmp_path: Path) -> None:
+    provider = BlockingProvider()
+    provider.release.set()
+    bus = MessageBus()
+    manager = SubagentManager(
+        provider=provider,
+        workspace=tmp_path,
+        bus=bus,
+        config=SubagentsConfig(delivery="direct"),
+    )
+
+    await manager.spawn("job", origin_channel="telegram", origin_chat_id="42")
+    msg = await asyncio.wait_for(bus.consume_inbound(), timeout=1)
+
+    assert msg.channel == "system"
+    assert msg.chat_id == "telegram:42"
+    assert msg.metadata["deliver"].endswith("done")
+
+
+async def test_delivered_result_skips_provider(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    provider = BlockingProvider()  # Never released: any LLM call would hang
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+
+    msg = InboundMessage(
+        channel="system",
+        sender_id="subagent",
+        chat_id="telegram:42",
+        content="[Subagent 'job' completed successfully]",
+        metadata={"deliver": "Background task 'job' completed successfully:\n\ndone"},
+    )
+    reply = await asyncio.wait_for(loop._process_system_message(msg), timeout=1)
+
+    assert (reply.channel, reply.chat_id) == ("telegram", "42")
+    assert reply.content.endswith("done")
+    history = loop.sessions.get_or_create("telegram:42").messages
+    assert [m["role"] for m in history] == ["user", "assistant"]
+
+
+async def test_progress_is_throttled_but_keeps_tool_outcomes(tmp_path: Path) -> None:
+    bus = MessageBus()
+    manager = SubagentManager(
+        provider=BlockingProvider(),
+        workspace=tmp_path,
+        bus=bus,
+        config=SubagentsConfig(progress=True, progress_interval_s=60),
+    )
+    record = SubagentTask(id="t1", label="job", task="job", origin={"channel": "cli", "chat_id": "a"})
+
+    await manager._report_progress(record, "running web_search")
+    await manager._report_progress(record, "web_search done", final=True)
+    await manager._report_progress(record, "running read_file")
+    assert bus.outbound_size == 1
+
+    # Once the interval has passed, the held-back outcome goes out with the next update
+    record.last_progress_at -= 61
+    await manager._report_progress(record, "running exec")
+    assert bus.outbound_size == 2
+    await bus.consume_outbound()
+    update = await bus.consume_outbound()
+    assert update.content == "[job] web_search done; running exec"
+
+
+async def test_status_file_tracks_running_task(tmp_path: Path) -> None:
+    provider = ToolThenBlockProvider()
+    status_path = tmp_path / "subagents.json"
+    manager = SubagentManager(
+        provider=provider,
+        workspace=tmp_path,
+        bus=MessageBus(),
+        status_path=status_path,
+    )
+    manager.STATUS_INTERVAL_S = 0.05
+
+    await manager.spawn("look around", origin_channel="cli", origin_chat_id="a")
+    await asyncio.sleep(0.2)  # Past the interval, so the trailing snapshot is written
+
+    [task] = json.loads(status_path.read_text())["tasks"]
+    assert task["status"] == "running"
+    assert task["iteration"] == 2
+    assert task["tokens"] == 5
+
+    provider.release.set()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    [task] = json.loads(status_path.read_text())["tasks"]
+    assert (task["status"], task["tokens"]) == ("ok", 12)
+
+
+async def test_process_workers_run_cancel_and_replay_usage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    usage = UsageTracker(tmp_path / "usage.json")
+    bus = MessageBus()
+    manager = SubagentManager(
+        provider=BlockingProvider(),
+        workspace=tmp_path,
+        bus=bus,
+        usage_tracker=usage,
+        config=SubagentsConfig(execution="process", max_concurrent=4, process_workers=1),
+        provider_factory=worker_provider,
+    )
+    try:
+        assert "started" in await manager.spawn("sleep", origin_channel="cli", origin_chat_id="a")
+        # Only one worker, so the second task waits as pending rather than "running"
+        assert "queued" in await manager.spawn("hello", origin_channel="cli", origin_chat_id="b")
+
+        for _ in range(300):
+            if (tmp_path / "worker-started").exists():
+                break
+            await asyncio.sleep(0.1)
+        sleeper = manager.list_tasks(origin_key="cli:a")[0]
+        assert manager.cancel(sleeper.id)
+
+        # The cancelled worker stops, freeing the only worker well before its 60s sleep
+        msg = await asyncio.wait_for(bus.consume_inbound(), timeout=30)
+        assert "worker done" in msg.content
+        tasks = {t.task: t for t in manager.list_tasks(include_finished=True)}
+        assert tasks["sleep"].status == "cancelled"
+        assert (tasks["hello"].status, tasks["hello"].tokens) == ("ok", 5)
+        assert usage.totals("subagent", tasks["hello"].id)[0] == 5
+    finally:
+        manager.shutdown()
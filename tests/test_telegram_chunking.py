@@ -0,0 +1,88 @@
+from html.parser import HTMLParser
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import BadRequest, RetryAfter
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.channels.telegram import TelegramChannel, _split_markdown
+from nanobot.config.schema import TelegramConfig
+
+
+class _TagChecker(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.stack: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self.stack.append(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        assert self.stack and self.stack.pop() == tag
+
+
+def _assert_valid(html: str) -> None:
+    checker = _TagChecker()
+    checker.feed(html)
+    checker.close()
+    assert checker.stack == []
+
+
+def test_long_reply_splits_into_valid_html_chunks() -> None:
+    paragraphs = [f"**Point {i}**: " + "x < y & " * 40 for i in range(30)]
+    code = "```python\n" + "\n".join(f"print({i} < {i + 1})" for i in range(400)) + "\n```"
+    text = "\n\n".join(paragraphs[:15] + [code] + paragraphs[15:])
+
+    chunks = _split_markdown(text, limit=1000)
+    assert len(chunks) > 5
+    for md, html in chunks:
+        assert len(html) <= 1000
+        _assert_valid(html)
+    joined = "".join(html for _, html in chunks)
+    assert joined.count("<b>Point") == 30
+    assert joined.count("print(") == 400
+
+    # A single huge word still gets cut
+    assert all(len(html) <= 100 for _, html in _split_markdown("&" * 500, limit=100))
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_send_retries_after_flood_control() -> None:
+    sent: list[str] = []
+    failures = [RetryAfter(0)]
+
+    async def send_message(chat_id: int, text: str, parse_mode: str | None = None) -> None:
+        if failures:
+            raise failures.pop()
+        sent.append(text)
+
+    channel = TelegramChannel(TelegramConfig(min_send_interval_s=0), bus=None)
+    channel._app = SimpleNamespace(bot=SimpleNamespace(send_message=send_message))
+
+    await channel.send(OutboundMessage(channel="telegram", chat_id="42", content="a\n\n" + "b" * 5000))
+    assert sent[0] == "a"
+    assert "".join(sent[1:]) == "b" * 5000
+    assert all(len(text) <= 4096 for text in sent)
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+async def test_send_falls_back_to_plain_text_only_on_bad_request() -> None:
+    calls: list[str | None] = []
+    error: Exception = BadRequest("Can't parse entities")
+
+    async def send_message(chat_id: int, text: str, parse_mode: str | None = None) -> None:
+        calls.append(parse_mode)
+        if parse_mode or isinstance(error, RetryAfter):
+            raise error
+
+    channel = TelegramChannel(TelegramConfig(min_send_interval_s=0), bus=None)
+    channel._app = SimpleNamespace(bot=SimpleNamespace(send_message=send_message))
+
+    await channel.send(OutboundMessage(channel="telegram", chat_id="42", content="*hi*"))
+    assert calls == ["HTML", None]
+
+    # Persistent flood control gives up without a plain-text retry
+    calls.clear()
+    error = RetryAfter(0)
+    await channel.send(OutboundMessage(channel="telegram", chat_id="42", content="*hi*"))
+    assert calls == ["HTML"] * TelegramChannel.MAX_SEND_ATTEMPTS
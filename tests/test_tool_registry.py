@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.tools.filesystem import EditFileTool
+from nanobot.agent.tools.registry import ToolRegistry, ToolSet
+from nanobot.agent.tools.toolset import workspace_toolset
+
+
+def test_toolset_is_shared_and_immutable(tmp_path: Path) -> None:
+    tools = workspace_toolset(tmp_path, None, 60, False)
+    assert workspace_toolset(tmp_path, None, 60, False) is tools
+    assert tools.get_definitions() is tools.get_definitions()
+    assert any(d["function"]["name"] == "exec" for d in tools.get_definitions())
+    with pytest.raises(TypeError):
+        tools.register(EditFileTool())
+
+
+def test_registry_definitions_cache_invalidates() -> None:
+    registry = ToolRegistry()
+    registry.register(EditFileTool())
+    first = registry.get_definitions()
+    assert registry.get_definitions() is first
+
+    registry.unregister("edit_file")
+    assert registry.get_definitions() == []
+    assert isinstance(registry.snapshot(), ToolSet)
@@ -86,3 +86,19 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_validator_is_compiled_once() -> None:
+    class CountingTool(SampleTool):
+        reads = 0
+
+        @property
+        def parameters(self) -> dict[str, Any]:
+            CountingTool.reads += 1
+            return super().parameters
+
+    tool = CountingTool()
+    ToolRegistry().register(tool)
+    for _ in range(3):
+        assert tool.validate_params({"query": "hi", "count": 2}) == []
+    assert CountingTool.reads == 1
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from nanobot.providers.base import LLMResponse
+from nanobot.usage.tracker import UsageTracker
+
+
+def _response(total: int, latency_ms: float) -> LLMResponse:
+    return LLMResponse(
+        content="ok",
+        usage={"prompt_tokens": total - 1, "completion_tokens": 1, "total_tokens": total},
+        latency_ms=latency_ms,
+        cost_usd=0.01,
+    )
+
+
+def test_usage_aggregated_per_dimension(tmp_path: Path) -> None:
+    tracker = UsageTracker(tmp_path / "usage.json")
+    tracker.record("m1", _response(10, 100), session="telegram:1", channel="telegram")
+    tracker.record("m1", _response(20, 200), session="cron:abc", channel="telegram")
+    tracker.record("m2", _response(5, 50), session="telegram:1", subagent="t1")
+
+    by_model = {r["key"]: r for r in tracker.summary("model")}
+    assert by_model["m1"]["calls"] == 2
+    assert by_model["m1"]["total_tokens"] == 30
+    assert by_model["m2"]["completion_tokens"] == 1
+
+    by_session = {r["key"]: r for r in tracker.summary("session")}
+    assert by_session["telegram:1"]["total_tokens"] == 15
+
+    assert [r["key"] for r in tracker.summary("cron")] == ["abc"]
+    assert [r["key"] for r in tracker.summary("subagent")] == ["t1"]
+    assert tracker.summary("channel")[0]["total_tokens"] == 30
+
+
+def test_usage_persisted_with_latency_percentiles(tmp_path: Path) -> None:
+    path = tmp_path / "usage.json"
+    tracker = UsageTracker(path)
+    for ms in range(1, 101):
+        tracker.record("m1", _response(1, ms))
+    tracker.flush()
+
+    reloaded = UsageTracker(path)
+    lat = reloaded.latency_percentiles()["m1"]
+    assert lat["samples"] == 100
+    assert lat["p50"] == 50
+    assert lat["p99"] == 99
+    assert reloaded.summary("model")[0]["calls"] == 100